@@ -0,0 +1,126 @@
+"""Benchmark penggabungan cue pendek (coalesce) pada generate_tts
+
+Edge TTS diganti pengganti lokal (benchmarks/fakes.py) yang mengirim frame
+MP3 dan event WordBoundary dengan latency tiruan per request ditambah per
+karakter. Setiap SRT di-generate dua kali dengan cache kosong, tanpa dan
+dengan coalesce; dilaporkan jumlah request, waktu end-to-end, dan apakah
+timing segment tetap sama dengan cue asli. Tanpa ``--srt`` dipakai SRT
+sintetis ala Udemy (satu kalimat dipecah menjadi 1-5 cue pendek).
+    python -m benchmarks.bench_coalesce --srt kursus/*.srt --latency-ms 150
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import fakes
+
+WORDS = ("so", "now", "we", "are", "going", "to", "look", "at", "how", "the", "function",
+         "returns", "a", "value", "and", "then", "call", "it", "from", "our", "main", "loop")
+
+def write_srt(path: str, sentences: int, seed: int = 0):
+    """SRT sintetis: setiap kalimat dipecah ke 1-5 cue pendek dengan jeda kecil"""
+    from benchmarks.bench_subtitle_parse import format_time
+
+    rng = random.Random(seed)
+    index, time_ms = 1, 0
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(sentences):
+            parts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 7)))
+                     for _ in range(rng.randint(1, 5))]
+            parts[-1] += "."
+            for text in parts:
+                duration = len(text) * fakes.MS_PER_CHAR
+                f.write(f"{index}\n{format_time(time_ms)} --> {format_time(time_ms + duration)}\n"
+                        f"{text}\n\n")
+                index += 1
+                time_ms += duration + rng.randint(0, 200)
+            time_ms += rng.randint(300, 1500)
+
+async def generate(srt_path: str, workdir: str, coalesce: bool, workers: int) -> dict:
+    from video_player.mvc.models.tts_model import TTSModel
+    from video_player.mvc.models.tts_cache import TTSCache
+    from video_player.mvc.models.translation_memory import TranslationMemory
+    from video_player.mvc.models.cue_coalesce import mp3_frames, plan_groups
+
+    model = TTSModel()
+    model.cache = TTSCache(os.path.join(workdir, "cache"))
+    model.translation.memory = TranslationMemory(os.path.join(workdir, "tm.jsonl"))
+    model.set_language('id', 'id')
+    model.set_fit_to_cue(False)  # Fitting butuh ffmpeg
+    model.set_coalesce_cues(coalesce)
+
+    requests = fakes.Communicate.requests
+    start = time.perf_counter()
+    segments = await model.generate_tts(srt_path, os.path.join(workdir, "tts"), workers)
+    elapsed = time.perf_counter() - start
+
+    invalid = 0
+    for segment in segments:
+        with open(segment.file_path, "rb") as f:
+            invalid += mp3_frames(f.read()) is None
+    return {
+        "seconds": elapsed,
+        "requests": fakes.Communicate.requests - requests,
+        "groups": len(plan_groups(segments)) if coalesce else 0,
+        "timing": [(s.start_time, s.end_time) for s in segments],
+        "invalid_audio": invalid,
+    }
+
+async def run_async(srt_paths, sentences: int, workers: int) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if not srt_paths:
+            srt_paths = [os.path.join(tmp, "lecture.srt")]
+            write_srt(srt_paths[0], sentences)
+        for n, srt_path in enumerate(srt_paths):
+            plain = await generate(srt_path, os.path.join(tmp, f"plain{n}"), False, workers)
+            merged = await generate(srt_path, os.path.join(tmp, f"merged{n}"), True, workers)
+            results.append({
+                "srt": os.path.basename(srt_path),
+                "cues": len(plain["timing"]),
+                "requests_plain": plain["requests"],
+                "requests_coalesced": merged["requests"],
+                "groups": merged["groups"],
+                "plain_s": plain["seconds"],
+                "coalesced_s": merged["seconds"],
+                "speedup": plain["seconds"] / merged["seconds"],
+                "timing_unchanged": plain["timing"] == merged["timing"],
+                "invalid_audio": merged["invalid_audio"],
+            })
+    return {"files": results}
+
+def run(srt_paths=(), sentences: int = 300, latency_ms: float = 150,
+        latency_per_char_ms: float = 0.5, workers: int = 4) -> dict:
+    fakes.install(tts_latency_ms=latency_ms)
+    fakes.TTS_LATENCY_PER_CHAR = latency_per_char_ms / 1000
+    return asyncio.run(run_async(list(srt_paths), sentences, workers))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--srt", nargs="*", default=[], help="file SRT kursus (default: SRT sintetis)")
+    parser.add_argument("--sentences", type=int, default=300,
+                        help="jumlah kalimat SRT sintetis")
+    parser.add_argument("--latency-ms", type=float, default=150,
+                        help="latency tiruan per request TTS")
+    parser.add_argument("--latency-per-char-ms", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    r = run(args.srt, args.sentences, args.latency_ms, args.latency_per_char_ms, args.workers)
+    print(f"latency {args.latency_ms} ms/request + {args.latency_per_char_ms} ms/karakter, "
+          f"{args.workers} worker")
+    for m in r["files"]:
+        reduction = 1 - m["requests_coalesced"] / m["requests_plain"] if m["requests_plain"] else 0.0
+        print(f"{m['srt']}: {m['cues']} cue, {m['groups']} grup")
+        print(f"  request  {m['requests_plain']:6d} -> {m['requests_coalesced']:6d}  "
+              f"(-{reduction:.0%})")
+        print(f"  waktu    {m['plain_s']:6.2f} s -> {m['coalesced_s']:6.2f} s  "
+              f"(speedup {m['speedup']:.2f}x)")
+        print(f"  timing cue tidak berubah: {m['timing_unchanged']}, "
+              f"audio tidak valid: {m['invalid_audio']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark load/save library: playlist.json vs LibraryStore (SQLite)
+
+    python -m benchmarks.bench_library --entries 10000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from video_player.mvc.models.video_model import VideoModel
+from video_player.mvc.models.library_store import LibraryStore
+
+def make_playlist(entries: int) -> dict:
+    return {
+        'videos': [
+            {
+                'video_path': f"/courses/course_{i // 100}/{i % 100}. Lecture {i}.mp4",
+                'srt_path': f"/courses/course_{i // 100}/{i % 100}. Lecture {i}.srt",
+                'tts_dir': f"tts_output/video_{i}" if i % 2 else None,
+                'voice_type': "pria",
+                'is_tts_ready': bool(i % 2)
+            }
+            for i in range(entries)
+        ],
+        'current_index': 0
+    }
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def run(entries: int = 10000) -> dict:
+    data = make_playlist(entries)
+    results = {"entries": entries}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "playlist.json")
+        db_path = os.path.join(tmp, "library.db")
+
+        # Cara lama: seluruh playlist ditulis/dibaca ulang
+        model = VideoModel()
+        model.load_from_dict(data)
+        def save_json():
+            with open(json_path, 'w') as f:
+                json.dump(model.to_dict(), f)
+        def load_json():
+            with open(json_path, 'r') as f:
+                VideoModel().load_from_dict(json.load(f))
+        results["json_save_s"] = timed(save_json)
+        results["json_load_s"] = timed(load_json)
+
+        # Import satu kali lalu buka library
+        store = LibraryStore(db_path)
+        results["sqlite_import_s"] = timed(lambda: store.import_playlist_json(json_path))
+        store.close()
+
+        store = LibraryStore(db_path)
+        loaded = VideoModel()
+        results["sqlite_load_s"] = timed(lambda: store.attach(loaded))
+
+        # Satu perubahan: JSON menulis ulang semuanya, SQLite satu baris
+        results["json_update_s"] = timed(save_json)
+        results["sqlite_update_s"] = timed(lambda: loaded.set_tts_ready(entries // 2, "tts_output/x"))
+        results["sqlite_insert_s"] = timed(lambda: loaded.add_video("new.mp4", "new.srt"))
+        results["sqlite_remove_s"] = timed(lambda: loaded.remove_video(0))
+        store.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    r = run(args.entries)
+    print(f"{r['entries']} entri")
+    for key, value in r.items():
+        if key.endswith("_s"):
+            print(f"  {key[:-2]:16s} {value * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
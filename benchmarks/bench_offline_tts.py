@@ -0,0 +1,69 @@
+"""Benchmark throughput backend offline (pool proses pyttsx3) vs ukuran pool
+
+Butuh pyttsx3 dan espeak-ng (Linux), tidak butuh jaringan.
+    python -m benchmarks.bench_offline_tts --cues 64 --pools 1,2,4,8
+"""
+import argparse
+import os
+import tempfile
+import time
+import wave
+
+from video_player.mvc.models.offline_tts import OfflineSynthesizer
+
+def make_texts(count: int):
+    return [f"Ini adalah kalimat nomor {i} dari materi kursus yang sedang diputar."
+            for i in range(count)]
+
+def audio_seconds(path: str) -> float:
+    try:
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / f.getframerate()
+    except (wave.Error, EOFError):
+        return 0.0
+
+def measure(pool_size: int, texts, workdir: str) -> dict:
+    synthesizer = OfflineSynthesizer(pool_size)
+    output_dir = os.path.join(workdir, f"pool_{pool_size}")
+    os.makedirs(output_dir)
+    try:
+        # Pool dipanaskan dulu (spawn proses + init engine), tidak ikut diukur
+        synthesizer.synthesize_many([(texts[0], os.path.join(output_dir, "warmup.wav"), "+0%")])
+        jobs = [(text, os.path.join(output_dir, f"segment_{i + 1}.wav"), "+0%")
+                for i, text in enumerate(texts)]
+        start = time.perf_counter()
+        synthesizer.synthesize_many(jobs)
+        elapsed = time.perf_counter() - start
+    finally:
+        synthesizer.shutdown()
+    audio = sum(audio_seconds(path) for _, path, _ in jobs)
+    return {"pool_size": pool_size, "seconds": elapsed, "cues_per_s": len(texts) / elapsed,
+            "realtime_factor": audio / elapsed}
+
+def run(cue_count: int = 64, pools=(1, 2, 4)) -> dict:
+    texts = make_texts(cue_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [measure(pool_size, texts, tmp) for pool_size in pools]
+    return {"cues": cue_count, "cpu_count": os.cpu_count(), "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=64)
+    parser.add_argument("--pools", default=f"1,2,4,{os.cpu_count() or 1}",
+                        help="daftar ukuran pool, dipisah koma")
+    args = parser.parse_args()
+    pools = sorted({int(p) for p in args.pools.split(",") if p.strip()})
+
+    try:
+        r = run(args.cues, pools)
+    except Exception as e:
+        print(f"Backend offline tidak bisa dijalankan (pyttsx3/espeak-ng terpasang?): {e}")
+        return
+    print(f"{r['cues']} cue, {r['cpu_count']} CPU")
+    base = r["results"][0]["cues_per_s"]
+    for m in r["results"]:
+        print(f"pool {m['pool_size']:3d}  {m['seconds']:7.2f} s  {m['cues_per_s']:7.1f} cue/s  "
+              f"{m['cues_per_s'] / base:5.2f}x  audio {m['realtime_factor']:6.1f}x realtime")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Benchmark trim hening + normalisasi loudness segment TTS (audio_post)
+
+Segment sintetis 24 kHz (hening awal/akhir dengan noise rendah, bagian
+"ucapan" dengan level acak -35..-10 dBFS) diproses dengan:
+- process_samples (NumPy) di satu proses, dibanding loop per sampel;
+- pool proses spawn dengan ``--workers`` worker (tanpa decode);
+- end-to-end lewat TTSModel: decode/encode di pool + cache (butuh
+  pydub dan ffmpeg, dilewati jika tidak ada), lalu putaran kedua dari cache.
+Dilaporkan throughput (segment/s), hening yang dibuang, dan sebaran
+loudness sebelum/sesudah.
+    python -m benchmarks.bench_post_process --segments 2000 --workers 4
+"""
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+
+SAMPLE_RATE = 24000
+
+def make_segments(count: int, seed: int = 0):
+    """PCM float32: hening 100-400 ms, ucapan 1-3 s (level acak), hening 200-600 ms"""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for _ in range(count):
+        lead, speech, tail = (int(SAMPLE_RATE * rng.uniform(*r))
+                              for r in ((0.1, 0.4), (1.0, 3.0), (0.2, 0.6)))
+        t = np.arange(speech) / SAMPLE_RATE
+        # Nada + noise, dimodulasi envelope suku kata ~4 Hz
+        voice = (np.sin(2 * np.pi * rng.uniform(110, 220) * t) + 0.3 * rng.standard_normal(speech))
+        voice *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 4 * t))
+        voice *= 10 ** (rng.uniform(-35, -10) / 20) / np.sqrt(np.mean(voice ** 2))
+        noise = lambda n: 10 ** (-60 / 20) * rng.standard_normal(n)
+        segments.append(np.concatenate([noise(lead), voice, noise(tail)]).astype(np.float32))
+    return segments
+
+def voiced_loudness_db(samples: np.ndarray) -> float:
+    from video_player.mvc.models.audio_post import frame_levels_db, SILENCE_THRESHOLD_DB
+
+    levels = frame_levels_db(samples, SAMPLE_RATE // 100)
+    voiced = levels[levels > SILENCE_THRESHOLD_DB]
+    return float(10 * np.log10(np.mean(10 ** (voiced / 10)))) if len(voiced) else -120.0
+
+def process_loop(samples: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """Implementasi per sampel (Python murni) sebagai pembanding"""
+    from video_player.mvc.models.audio_post import (
+        ANALYSIS_FRAME_MS, KEEP_SILENCE_MS, MAX_GAIN_DB, PEAK_CEILING_DB,
+        SILENCE_THRESHOLD_DB, TARGET_LOUDNESS_DB,
+    )
+
+    data = samples.tolist()
+    frame = int(sample_rate * ANALYSIS_FRAME_MS / 1000)
+    levels = []
+    for start in range(0, len(data), frame):
+        chunk = data[start:start + frame]
+        power = sum(x * x for x in chunk) / frame
+        levels.append(10 * math.log10(max(power, 1e-12)))
+    voiced = [i for i, level in enumerate(levels) if level > SILENCE_THRESHOLD_DB]
+    if not voiced:
+        return samples
+    keep = int(sample_rate * KEEP_SILENCE_MS / 1000)
+    start = max(voiced[0] * frame - keep, 0)
+    end = min((voiced[-1] + 1) * frame + keep, len(data))
+    loudness = 10 * math.log10(sum(10 ** (levels[i] / 10) for i in voiced) / len(voiced))
+    gain_db = min(max(TARGET_LOUDNESS_DB - loudness, -MAX_GAIN_DB), MAX_GAIN_DB)
+    peak = max(abs(x) for x in data[start:end])
+    if peak > 0:
+        gain_db = min(gain_db, PEAK_CEILING_DB - 20 * math.log10(peak))
+    gain = 10 ** (gain_db / 20)
+    return [x * gain for x in data[start:end]]
+
+def _process_batch(batch):
+    from video_player.mvc.models.audio_post import process_samples
+
+    return [process_samples(samples, SAMPLE_RATE)[1] for samples in batch]
+
+def bench_core(segments) -> dict:
+    from video_player.mvc.models.audio_post import process_samples
+
+    start = time.perf_counter()
+    results = [process_samples(samples, SAMPLE_RATE) for samples in segments]
+    elapsed = time.perf_counter() - start
+
+    sample = segments[:max(len(segments) // 50, 5)]
+    start = time.perf_counter()
+    for samples in sample:
+        process_loop(samples)
+    loop_per_segment = (time.perf_counter() - start) / len(sample)
+
+    before = [voiced_loudness_db(s) for s in segments]
+    after = [voiced_loudness_db(out) for out, _ in results]
+    return {
+        "segments_per_s": len(segments) / elapsed,
+        "loop_segments_per_s": 1 / loop_per_segment,
+        "trimmed_ms_mean": statistics.fmean(info["trimmed_ms"] for _, info in results),
+        "loudness_spread_before_db": statistics.pstdev(before),
+        "loudness_spread_after_db": statistics.pstdev(after),
+    }
+
+def bench_pool(segments, workers: int, batch: int = 50) -> dict:
+    batches = [segments[i:i + batch] for i in range(0, len(segments), batch)]
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(_process_batch, batches[:workers]))  # Pemanasan: start proses + import
+        start = time.perf_counter()
+        list(pool.map(_process_batch, batches))
+        elapsed = time.perf_counter() - start
+    return {"workers": workers, "segments_per_s": len(segments) / elapsed}
+
+def bench_end_to_end(segments, workers: int) -> dict:
+    """Decode/encode nyata lewat TTSModel._post_process (pydub + ffmpeg)"""
+    import wave
+    from video_player.mvc.models.tts_model import TTSModel
+    from video_player.mvc.models.tts_cache import TTSCache
+
+    async def run_pass(model, keys):
+        start = time.perf_counter()
+        await asyncio.gather(*(model._post_process(key, path) for key, path in keys))
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = TTSModel()
+        model.cache = TTSCache(os.path.join(tmp, "cache"))
+        model.set_post_process(True, workers)
+        keys = []
+        for i, samples in enumerate(segments):
+            key = model.cache.key_for(f"segment {i}", "bench", "+0%")
+            path = os.path.join(tmp, f"segment_{i}.wav")
+            with wave.open(path, "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(SAMPLE_RATE)
+                f.writeframes((np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes())
+            keys.append((key, path))
+        try:
+            cold = asyncio.run(run_pass(model, keys))
+            cached = asyncio.run(run_pass(model, keys))
+        finally:
+            model.set_post_process(False)
+    return {"segments_per_s": len(segments) / cold, "cached_segments_per_s": len(segments) / cached}
+
+def run(count: int = 2000, workers: int = None, end_to_end: int = 200) -> dict:
+    workers = workers or os.cpu_count() or 1
+    segments = make_segments(count)
+    results = {"segments": count, "core": bench_core(segments), "pool": bench_pool(segments, workers)}
+    try:
+        import pydub  # noqa: F401
+        results["end_to_end"] = bench_end_to_end(segments[:end_to_end], workers)
+    except Exception as e:
+        results["end_to_end"] = {"skipped": f"{type(e).__name__}: {e}"}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--workers", type=int, help="default: jumlah CPU")
+    parser.add_argument("--end-to-end", type=int, default=200,
+                        help="jumlah segment untuk pengukuran decode/encode nyata")
+    args = parser.parse_args()
+
+    r = run(args.segments, args.workers, args.end_to_end)
+    core, pool, e2e = r["core"], r["pool"], r["end_to_end"]
+    print(f"{r['segments']} segment sintetis, {SAMPLE_RATE} Hz")
+    print(f"NumPy 1 proses     {core['segments_per_s']:9.0f} segment/s "
+          f"(loop per sampel {core['loop_segments_per_s']:.1f} segment/s, "
+          f"{core['segments_per_s'] / core['loop_segments_per_s']:.0f}x)")
+    print(f"pool {pool['workers']} proses     {pool['segments_per_s']:9.0f} segment/s")
+    if "skipped" in e2e:
+        print(f"end-to-end         dilewati: {e2e['skipped']}")
+    else:
+        print(f"end-to-end         {e2e['segments_per_s']:9.1f} segment/s "
+              f"(dari cache {e2e['cached_segments_per_s']:.0f} segment/s)")
+    print(f"hening dibuang rata-rata {core['trimmed_ms_mean']:.0f} ms/segment, sebaran loudness "
+          f"{core['loudness_spread_before_db']:.1f} -> {core['loudness_spread_after_db']:.1f} dB")
+
+if __name__ == "__main__":
+    main()
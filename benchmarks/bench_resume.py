@@ -0,0 +1,145 @@
+"""Benchmark resume generate TTS dari checkpoint
+
+Job 1000 cue dihentikan di tengah jalan (setengah segment selesai, ditambah
+file setengah jadi dan file .part sisa crash), lalu dilanjutkan dengan
+TTSModel baru dan cache kosong. TTS diganti sintesis lokal dengan latency
+tiruan, fitting dimatikan (tidak butuh ffmpeg).
+    python -m benchmarks.bench_resume --cues 1000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from video_player.mvc.models.tts_model import TTSModel
+from video_player.mvc.models.tts_cache import TTSCache
+from video_player.mvc.models.translation_memory import TranslationMemory
+
+AUDIO_BYTES = 6000
+
+def write_srt(path: str, cues: int):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(cues):
+            start = i * 3000
+            f.write(f"{i + 1}\n{start // 3600000:02d}:{start // 60000 % 60:02d}:"
+                    f"{start // 1000 % 60:02d},000 --> {start // 3600000:02d}:"
+                    f"{start // 60000 % 60:02d}:{start // 1000 % 60:02d},900\n"
+                    f"Sentence number {i} of the lecture\n\n")
+
+def make_model(workdir: str, latency: float, calls: list) -> TTSModel:
+    model = TTSModel()
+    model.cache = TTSCache(os.path.join(workdir, "cache"))
+    model.translation.memory = TranslationMemory(os.path.join(workdir, "tm.jsonl"))
+    model.set_language('id', 'id')
+    model.set_fit_to_cue(False)
+
+    async def text_to_speech(text, output_file, rate, voice=None):
+        calls.append(time.perf_counter())
+        await asyncio.sleep(latency)
+        with open(output_file, "wb") as f:
+            f.write(text.encode("utf-8").ljust(AUDIO_BYTES, b"\0"))
+
+    model.text_to_speech = text_to_speech
+    return model
+
+async def interrupted_run(srt_path: str, tts_dir: str, workdir: str, latency: float, stop_after: int):
+    """Generate sampai ``stop_after`` segment selesai lalu batalkan (seperti aplikasi ditutup)"""
+    calls = []
+    model = make_model(workdir, latency, calls)
+    done = asyncio.Event()
+
+    class Observer:
+        completed = 0
+
+        def on_tts_update(self, event_type, data=None):
+            if event_type == "progress":
+                Observer.completed += 1
+                if Observer.completed >= stop_after:
+                    done.set()
+
+    model.add_observer(Observer())
+    task = asyncio.ensure_future(model.generate_tts(srt_path, tts_dir))
+    await done.wait()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return Observer.completed
+
+def simulate_crash_leftovers(tts_dir: str, cues: int):
+    """File segment terpotong (tanpa checkpoint) dan file .part yang tertinggal"""
+    names = set(os.listdir(tts_dir))
+    missing = [i for i in range(1, cues + 1) if f"segment_{i}.mp3" not in names]
+    with open(os.path.join(tts_dir, f"segment_{missing[0]}.mp3"), "wb") as f:
+        f.write(b"\0" * (AUDIO_BYTES // 3))
+    with open(os.path.join(tts_dir, f"segment_{missing[1]}.mp3.deadbeef.part"), "wb") as f:
+        f.write(b"\0" * 100)
+    return missing[0]
+
+async def timed_generate(srt_path: str, tts_dir: str, workdir: str, latency: float) -> dict:
+    calls = []
+    model = make_model(workdir, latency, calls)
+    start = time.perf_counter()
+    segments = await model.generate_tts(srt_path, tts_dir)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "synthesized": len(calls),
+        "startup_ms": ((calls[0] - start) if calls else elapsed) * 1000,
+        "segments": segments,
+    }
+
+async def run_async(cue_count: int, latency_ms: float) -> dict:
+    latency = latency_ms / 1000
+    results = {"cues": cue_count}
+    with tempfile.TemporaryDirectory() as tmp:
+        srt_path = os.path.join(tmp, "lecture.srt")
+        write_srt(srt_path, cue_count)
+
+        cold = await timed_generate(srt_path, os.path.join(tmp, "cold"), os.path.join(tmp, "w1"), latency)
+        results["cold_s"] = cold["seconds"]
+
+        tts_dir = os.path.join(tmp, "resume")
+        results["completed_before_stop"] = await interrupted_run(
+            srt_path, tts_dir, os.path.join(tmp, "w2"), latency, cue_count // 2
+        )
+        torn = simulate_crash_leftovers(tts_dir, cue_count)
+
+        # Lanjutkan dengan cache kosong: hanya checkpoint yang mencegah sintesis ulang
+        resumed = await timed_generate(srt_path, tts_dir, os.path.join(tmp, "w3"), latency)
+        results["resume_s"] = resumed["seconds"]
+        results["resume_verify_ms"] = resumed["startup_ms"]
+        results["resume_synthesized"] = resumed["synthesized"]
+        results["torn_segment_repaired"] = os.path.getsize(
+            os.path.join(tts_dir, f"segment_{torn}.mp3")) == AUDIO_BYTES
+        results["part_files_left"] = sum(name.endswith(".part") for name in os.listdir(tts_dir))
+
+        again = await timed_generate(srt_path, tts_dir, os.path.join(tmp, "w4"), latency)
+        results["complete_rerun_s"] = again["seconds"]
+        results["complete_rerun_synthesized"] = again["synthesized"]
+    return results
+
+def run(cue_count: int = 1000, latency_ms: float = 20) -> dict:
+    return asyncio.run(run_async(cue_count, latency_ms))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    r = run(args.cues, args.latency_ms)
+    print(f"{r['cues']} cue, latency {args.latency_ms} ms/request")
+    print(f"generate penuh        {r['cold_s']:7.2f} s")
+    print(f"dihentikan setelah    {r['completed_before_stop']} segment")
+    print(f"resume                {r['resume_s']:7.2f} s  ({r['resume_synthesized']} segment disintesis, "
+          f"verifikasi checkpoint {r['resume_verify_ms']:.1f} ms)")
+    print(f"segment terpotong diperbaiki: {r['torn_segment_repaired']}, "
+          f"file .part tersisa: {r['part_files_left']}")
+    print(f"jalankan ulang (selesai) {r['complete_rerun_s']:7.2f} s  "
+          f"({r['complete_rerun_synthesized']} segment disintesis)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark resync TTS setelah seek dan koreksi drift dengan clock player tiruan
+
+Video dan dua audio player VLC diganti player tiruan (benchmarks/fakes.py)
+yang maju mengikuti clock simulasi: membuka file butuh ``--open-delay-ms``
+dan clock audio berjalan ``--skew`` lebih cepat dari video. Diukur:
+- latency resync setelah seek acak (sampai audio berjalan di offset yang
+  benar, toleransi ``--tolerance-ms``) dan kesalahan posisi tepat setelah
+  audio mulai;
+- drift audio vs video selama pemutaran normal.
+Setiap skenario dijalankan dengan koreksi drift aktif dan nonaktif (batas 0,
+sama dengan perilaku lama: cue selalu diputar dari awal).
+    python -m benchmarks.bench_seek_sync --cues 200 --seeks 200
+"""
+import argparse
+import random
+import statistics
+
+from benchmarks import fakes
+
+TICK_MS = 50          # Interval timer UI (PlayerView.TICK_INTERVAL_MS)
+CUE_GAP_MS = 3000
+CUE_MS = 2500
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+def make_player(cues: int, threshold_ms: int, open_delay_ms: int, skew: float):
+    from video_player.mvc.models.tts_model import TTSSegment
+    from video_player.mvc.models.player_model import PlayerModel
+
+    fakes.Instance.media_lengths = {f"segment_{i + 1}.mp3": CUE_MS for i in range(cues)}
+    fakes.Instance.player_options = {"open_delay_ms": open_delay_ms, "clock_rate": skew}
+    segments = [
+        TTSSegment(file_path=f"segment_{i + 1}.mp3", start_time=i * CUE_GAP_MS,
+                   end_time=i * CUE_GAP_MS + CUE_MS, text="", rate="+0%")
+        for i in range(cues)
+    ]
+    model = PlayerModel()
+    model.set_drift_threshold(threshold_ms)
+    model.load_tts_segments(segments)
+    video = model._video_player
+    video.clock_rate = 1.0
+    video.open_delay_ms = 0
+    video.set_media(fakes.Media("video.mp4", cues * CUE_GAP_MS))
+    model.toggle_tts(True)
+    model.play()
+    return model, segments
+
+def audio_error(model, segments):
+    """Selisih posisi audio aktif terhadap posisi seharusnya (ms), None jika tidak ada cue/audio"""
+    video_time = model._video_player.get_time()
+    i = model._timeline.find(video_time)
+    player = model._audio_player
+    if i < 0 or not player.is_playing():
+        return None
+    return player.get_time() - (video_time - segments[i].start_time)
+
+def tick(model, ms: int = TICK_MS):
+    model._instance.advance(ms)
+    model.update()
+
+def run_seeks(cues: int, seeks: int, threshold_ms: int, open_delay_ms: int, skew: float,
+              tolerance_ms: int, seed: int = 0) -> dict:
+    model, segments = make_player(cues, threshold_ms, open_delay_ms, skew)
+    rng = random.Random(seed)
+    latencies, first_errors, unsynced = [], [], 0
+    end = cues * CUE_GAP_MS
+    for _ in range(seeks):
+        # Seek ke tengah cue (bukan ke jeda) agar setiap seek butuh resync
+        cue = rng.randrange(cues - 1)
+        target = segments[cue].start_time + rng.randint(300, CUE_MS - 1000)
+        model.seek(target / end)
+        elapsed, first = 0, None
+        while elapsed <= 1500:
+            tick(model)
+            elapsed += TICK_MS
+            error = audio_error(model, segments)
+            if error is None:
+                continue
+            if first is None:
+                first = error
+            if abs(error) <= tolerance_ms:
+                latencies.append(elapsed)
+                break
+        else:
+            unsynced += 1
+        if first is not None:
+            first_errors.append(abs(first))
+    return {
+        "seeks": seeks,
+        "resync_p50_ms": percentile(latencies, 0.5),
+        "resync_p95_ms": percentile(latencies, 0.95),
+        "first_error_mean_ms": statistics.fmean(first_errors) if first_errors else 0.0,
+        "unsynced": unsynced,
+    }
+
+def run_playback(cues: int, threshold_ms: int, open_delay_ms: int, skew: float) -> dict:
+    model, segments = make_player(cues, threshold_ms, open_delay_ms, skew)
+    errors = []
+    for _ in range(cues * CUE_GAP_MS // TICK_MS):
+        tick(model)
+        error = audio_error(model, segments)
+        if error is not None:
+            errors.append(abs(error))
+    return {
+        "drift_mean_ms": statistics.fmean(errors) if errors else 0.0,
+        "drift_p95_ms": percentile(errors, 0.95),
+        "drift_max_ms": max(errors, default=0),
+        "corrections": model.drift_stats["corrections"],
+    }
+
+def run(cues: int = 200, seeks: int = 200, open_delay_ms: int = 80, skew: float = 1.10,
+        tolerance_ms: int = 250, threshold_ms: int = None) -> dict:
+    from video_player.mvc.models.player_model import DRIFT_THRESHOLD_MS
+
+    fakes.install()
+    threshold_ms = DRIFT_THRESHOLD_MS if threshold_ms is None else threshold_ms
+    results = {"cues": cues, "threshold_ms": threshold_ms}
+    for name, threshold in (("corrected", threshold_ms), ("uncorrected", 0)):
+        results[name] = {
+            **run_seeks(cues, seeks, threshold, open_delay_ms, skew, tolerance_ms),
+            **run_playback(cues, threshold, open_delay_ms, skew),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=200)
+    parser.add_argument("--seeks", type=int, default=200)
+    parser.add_argument("--open-delay-ms", type=int, default=80)
+    parser.add_argument("--skew", type=float, default=1.10,
+                        help="kecepatan clock audio relatif terhadap video")
+    parser.add_argument("--tolerance-ms", type=int, default=250,
+                        help="selisih posisi yang dianggap sudah sinkron")
+    parser.add_argument("--threshold-ms", type=int, help="batas koreksi drift (default PlayerModel)")
+    args = parser.parse_args()
+
+    r = run(args.cues, args.seeks, args.open_delay_ms, args.skew, args.tolerance_ms,
+            args.threshold_ms)
+    print(f"{r['cues']} cue, tick {TICK_MS} ms, open delay {args.open_delay_ms} ms, "
+          f"skew {args.skew}, batas koreksi {r['threshold_ms']} ms")
+    for name in ("corrected", "uncorrected"):
+        m = r[name]
+        print(f"{name:12s} resync p50 {m['resync_p50_ms']:6.0f} ms  p95 {m['resync_p95_ms']:6.0f} ms  "
+              f"error awal {m['first_error_mean_ms']:7.1f} ms  tidak sinkron {m['unsynced']}/{m['seeks']}")
+        print(f"{'':12s} drift mean {m['drift_mean_ms']:6.1f} ms  p95 {m['drift_p95_ms']:6.1f} ms  "
+              f"max {m['drift_max_ms']:6.1f} ms  koreksi {m['corrections']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Microbenchmark pencarian segment TTS aktif: linear scan vs SegmentTimeline
+
+Skenario "overlap": satu cue panjang menutupi semua cue pendek dan playhead
+berada di jeda setelah cue pendek selesai (kasus terburuk cue aktif lama).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_segment_lookup --cues 5000
+"""
+import argparse
+import random
+import time
+from bisect import bisect_right
+
+from video_player.mvc.models.tts_model import TTSSegment
+from video_player.mvc.models.segment_timeline import SegmentTimeline
+
+TICK_MS = 50
+
+def make_segments(cue_count: int, seed: int = 0):
+    """Membuat cue sintetis mirip SRT, termasuk cue overlap dan durasi nol"""
+    rng = random.Random(seed)
+    segments = []
+    t = 0
+    for i in range(cue_count):
+        t += rng.randint(200, 2500)
+        duration = rng.choice([0, 800, 1500, 2500, 4000])
+        segments.append(TTSSegment(
+            file_path=f"segment_{i+1}.mp3",
+            start_time=t,
+            end_time=t + duration,
+            text="",
+            rate="+0%"
+        ))
+    return segments
+
+def make_overlap_segments(cue_count: int):
+    """Satu cue sepanjang video + cue pendek 500 ms dengan jeda 500 ms"""
+    segments = [TTSSegment("segment_1.mp3", 0, cue_count * 1000 + 1000, "", "+0%")]
+    for i in range(1, cue_count):
+        start = i * 1000
+        segments.append(TTSSegment(f"segment_{i+1}.mp3", start, start + 500, "", "+0%"))
+    return segments
+
+def linear_scan(segments, current_time: int) -> int:
+    """Pencarian lama di PlayerModel._sync_tts_with_video"""
+    for i, segment in enumerate(segments):
+        if segment.start_time <= current_time < segment.end_time:
+            return i
+    return -1
+
+def bisect_walk_back(starts, ends, current_time: int) -> int:
+    """Versi SegmentTimeline sebelumnya: bisect lalu mundur sampai cue yang aktif"""
+    pos = bisect_right(starts, current_time) - 1
+    while pos >= 0 and ends[pos] <= current_time:
+        pos -= 1
+    return pos
+
+def run(cue_count: int = 5000, seeks: int = 200) -> dict:
+    segments = make_segments(cue_count)
+    end = segments[-1].end_time
+    playback = list(range(0, end, TICK_MS))
+    rng = random.Random(1)
+    seek_times = [rng.randint(0, end) for _ in range(seeks)]
+
+    overlap = make_overlap_segments(cue_count)
+    # Di jeda setelah cue pendek: hanya cue panjang pertama yang aktif
+    overlap_times = [rng.randrange(1, cue_count) * 1000 + 750 for _ in range(seeks)]
+
+    results = {"cues": cue_count, "ticks": len(playback)}
+    for name, cues, times in (("playback", segments, playback), ("seek", segments, seek_times),
+                              ("overlap", overlap, overlap_times)):
+        if name == "overlap":
+            # Linear scan langsung berhenti di cue panjang; pembanding kasus ini
+            # adalah pencarian mundur versi sebelumnya
+            starts = [s.start_time for s in cues]
+            ends = [s.end_time for s in cues]
+            start = time.perf_counter()
+            for t in times:
+                bisect_walk_back(starts, ends, t)
+        else:
+            start = time.perf_counter()
+            for t in times:
+                linear_scan(cues, t)
+        linear = time.perf_counter() - start
+
+        timeline = SegmentTimeline(cues)
+        start = time.perf_counter()
+        for t in times:
+            timeline.find(t)
+        indexed = time.perf_counter() - start
+
+        results[f"{name}_linear_us"] = linear / len(times) * 1e6
+        results[f"{name}_timeline_us"] = indexed / len(times) * 1e6
+        results[f"{name}_speedup"] = linear / indexed if indexed else float("inf")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=5000)
+    parser.add_argument("--seeks", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run(args.cues, args.seeks)
+    print(f"{results['cues']} cue, {results['ticks']} tick playback")
+    for name in ("playback", "seek", "overlap"):
+        baseline = "mundur" if name == "overlap" else "linear"
+        print(f"{name:9s} {baseline} {results[f'{name}_linear_us']:9.2f} us/lookup  "
+              f"timeline {results[f'{name}_timeline_us']:7.2f} us/lookup  "
+              f"({results[f'{name}_speedup']:.0f}x)")
+
+if __name__ == "__main__":
+    main()
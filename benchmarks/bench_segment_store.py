@@ -0,0 +1,161 @@
+"""Benchmark pack segment per video dibanding satu file per segment
+
+Untuk ``--segments`` segment (frame MP3 tiruan ~``--segment-ms`` ms) diukur
+jalur kode aplikasi pada kedua layout:
+- tulis: TTSCache.materialize per file vs SegmentStore.put_file ke pack;
+- verifikasi: TTSCheckpoint.is_done semua segment (resume generate);
+- buka: baca semua segment dari store yang baru dibuka (seperti player
+  setelah aplikasi dijalankan ulang), plus media VLC tiruan per segment;
+- salin: shutil.copytree direktori output (backup / pindah disk);
+- hapus: VideoModel.remove_video.
+    python -m benchmarks.bench_segment_store --segments 5000 --repeat 3
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks import fakes
+
+def count_files(directory: str) -> int:
+    return len(os.listdir(directory))
+
+def disk_usage(directory: str) -> int:
+    """Byte yang benar-benar dipakai di disk (blok), bukan ukuran logis"""
+    total = 0
+    for name in os.listdir(directory):
+        stat = os.stat(os.path.join(directory, name))
+        total += getattr(stat, "st_blocks", 0) * 512 or stat.st_size
+    return total
+
+def make_sources(workdir: str, segments: int, segment_ms: int):
+    """File cache TTS tiruan (MP3) yang akan disalin ke direktori output"""
+    from video_player.mvc.models.tts_cache import TTSCache
+
+    cache = TTSCache(os.path.join(workdir, "cache"))
+    chars = max(segment_ms // fakes.MS_PER_CHAR, 1)
+    sources = []
+    for i in range(segments):
+        text = f"segment {i} " + "x" * chars
+        key = cache.key_for(text, "voice", "+0%")
+        temp_file = cache.temp_path(key)
+        with open(temp_file, "wb") as f:
+            f.write(fakes.fake_audio(text[:chars], "voice", str(i)))
+        sources.append((text, cache.commit(key, temp_file)))
+    return cache, sources
+
+def run_layout(packed: bool, workdir: str, cache, sources) -> dict:
+    from video_player.mvc.models.player_model import PlayerModel
+    from video_player.mvc.models.segment_store import close_store, store_for
+    from video_player.mvc.models.tts_checkpoint import TTSCheckpoint
+    from video_player.mvc.models.video_model import VideoModel
+
+    tts_dir = os.path.join(workdir, "packed" if packed else "files")
+    os.makedirs(tts_dir)
+    paths = [os.path.join(tts_dir, f"segment_{i + 1}.mp3") for i in range(len(sources))]
+    settings = {"bench": True}
+
+    start = time.perf_counter()
+    store = store_for(tts_dir, create=True) if packed else None
+    for path, (_, cached_file) in zip(paths, sources):
+        if store is not None:
+            store.put_file(os.path.basename(path), cached_file)
+        else:
+            cache.materialize(cached_file, path)
+    write_s = time.perf_counter() - start
+    # Checkpoint (biayanya sama untuk kedua layout) tidak ikut diukur
+    checkpoint = TTSCheckpoint(tts_dir, settings, store=store, save_every=len(paths) + 1)
+    for path, (text, _) in zip(paths, sources):
+        checkpoint.mark_done(path, text, "+0%")
+    checkpoint.save()
+    close_store(tts_dir)
+
+    # Buka ulang seperti setelah aplikasi dijalankan lagi
+    start = time.perf_counter()
+    store = store_for(tts_dir)
+    checkpoint = TTSCheckpoint(tts_dir, settings, store=store)
+    verified = sum(checkpoint.is_done(path, text, "+0%") for path, (text, _) in zip(paths, sources))
+    verify_s = time.perf_counter() - start
+
+    close_store(tts_dir)
+    start = time.perf_counter()
+    store = store_for(tts_dir)
+    read_bytes = 0
+    for path in paths:
+        if store is not None:
+            read_bytes += len(store.get(os.path.basename(path)))
+        else:
+            with open(path, "rb") as f:
+                read_bytes += len(f.read())
+    open_s = time.perf_counter() - start
+
+    player = PlayerModel()
+    start = time.perf_counter()
+    for path in paths:
+        player._segment_media(path)
+    media_s = time.perf_counter() - start
+
+    files = count_files(tts_dir)
+    usage = disk_usage(tts_dir)
+    start = time.perf_counter()
+    shutil.copytree(tts_dir, tts_dir + "_copy")
+    copy_s = time.perf_counter() - start
+    shutil.rmtree(tts_dir + "_copy")
+    videos = VideoModel()
+    videos.add_video("video.mp4", "video.srt")
+    videos.set_tts_ready(0, tts_dir)
+    start = time.perf_counter()
+    videos.remove_video(0)
+    delete_s = time.perf_counter() - start
+
+    return {"write_s": write_s, "verify_s": verify_s, "open_s": open_s, "media_s": media_s,
+            "copy_s": copy_s, "delete_s": delete_s, "files": files, "disk_bytes": usage,
+            "verified": verified, "read_bytes": read_bytes,
+            "deleted": not os.path.exists(tts_dir)}
+
+def run(segments: int = 5000, segment_ms: int = 2500, repeat: int = 3,
+        workdir: str = None) -> dict:
+    fakes.install()
+    results = {"segments": segments}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        cache, sources = make_sources(tmp, segments, segment_ms)
+        for name, packed in (("files", False), ("packed", True)):
+            runs = []
+            for n in range(repeat):
+                workdir = os.path.join(tmp, f"{name}{n}")
+                runs.append(run_layout(packed, workdir, cache, sources))
+                shutil.rmtree(workdir, ignore_errors=True)
+            # Ambil run tercepat per metrik waktu
+            best = dict(runs[-1])
+            for key in ("write_s", "verify_s", "open_s", "media_s", "copy_s", "delete_s"):
+                best[key] = min(r[key] for r in runs)
+            results[name] = best
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=5000)
+    parser.add_argument("--segment-ms", type=int, default=2500,
+                        help="durasi audio per segment (menentukan ukuran file)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", help="direktori kerja (default: temp sistem, bisa tmpfs)")
+    args = parser.parse_args()
+
+    r = run(args.segments, args.segment_ms, args.repeat, args.workdir)
+    print(f"{r['segments']} segment, ~{args.segment_ms} ms audio per segment")
+    print(f"{'':8s} {'tulis':>9s} {'verifikasi':>11s} {'buka+baca':>10s} {'media':>9s} "
+          f"{'salin':>9s} {'hapus':>9s} {'file':>6s} {'disk':>9s}")
+    for name in ("files", "packed"):
+        m = r[name]
+        print(f"{name:8s} {m['write_s'] * 1000:7.1f}ms {m['verify_s'] * 1000:9.1f}ms "
+              f"{m['open_s'] * 1000:8.1f}ms {m['media_s'] * 1000:7.1f}ms "
+              f"{m['copy_s'] * 1000:7.1f}ms {m['delete_s'] * 1000:7.1f}ms {m['files']:6d} {m['disk_bytes'] / 1048576:7.1f}MB")
+    for name in ("files", "packed"):
+        m = r[name]
+        if m["verified"] != r["segments"] or not m["deleted"]:
+            print(f"PERINGATAN {name}: {m['verified']} segment terverifikasi, "
+                  f"dihapus: {m['deleted']}")
+
+if __name__ == "__main__":
+    main()
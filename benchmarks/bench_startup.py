@@ -0,0 +1,90 @@
+"""Benchmark startup: waktu sampai window tampil + import time per modul
+
+Menjalankan video_player/main.py dengan ``-X importtime`` dan mode probe
+(aplikasi keluar setelah window tampil), lalu mengukur biaya import backend
+yang sekarang ditunda sampai dipakai.
+    python -m benchmarks.bench_startup --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "video_player")
+PROBE_ENV = "VIDEO_PLAYER_STARTUP_PROBE"
+BACKEND_MODULES = ("vlc", "edge_tts", "pysrt", "pyttsx3", "googletrans",
+                   "speech_recognition", "pydub", "numpy")
+
+def parse_importtime(stderr: str) -> dict:
+    """Baris ``import time: self | cumulative | nama`` -> {modul top-level: cumulative us}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue  # Import bertingkat, sudah termasuk di cumulative induknya
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+def run_app(timeout: float = 60) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    env[PROBE_ENV] = "1"
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "main.py"], cwd=APP_DIR,
+                          env=env, capture_output=True, text=True, timeout=timeout)
+    wall = (time.perf_counter() - start) * 1000
+    in_process = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("time_to_window_ms="):
+            in_process = float(line.split("=", 1)[1])
+    if in_process is None:
+        raise RuntimeError(f"aplikasi tidak menampilkan window:\n{proc.stderr[-2000:]}")
+    return {"wall_ms": wall, "time_to_window_ms": in_process,
+            "imports": parse_importtime(proc.stderr)}
+
+def backend_import_cost(module: str) -> int:
+    """Cumulative import time (us) satu backend di interpreter baru, -1 jika tidak terpasang"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return -1
+    return parse_importtime(proc.stderr).get(module, -1)
+
+def run(runs: int = 5) -> dict:
+    samples = [run_app() for _ in range(runs)]
+    imports = samples[-1]["imports"]
+    loaded = set(imports)
+    return {
+        "runs": runs,
+        "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+        "time_to_window_ms": statistics.median(s["time_to_window_ms"] for s in samples),
+        "import_total_ms": sum(imports.values()) / 1000,
+        "imports_us": imports,
+        "deferred_us": {m: backend_import_cost(m) for m in BACKEND_MODULES if m not in loaded},
+        "loaded_backends": sorted(m for m in BACKEND_MODULES if m in loaded),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="jumlah modul terberat yang ditampilkan")
+    args = parser.parse_args()
+
+    r = run(args.runs)
+    print(f"time-to-window (median {r['runs']}x): {r['time_to_window_ms']:.1f} ms in-process, "
+          f"{r['wall_ms']:.1f} ms wall")
+    print(f"import top-level total: {r['import_total_ms']:.1f} ms")
+    for name, us in sorted(r["imports_us"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:40s} {us / 1000:8.1f} ms")
+    if r["loaded_backends"]:
+        print(f"backend yang masih dimuat saat startup: {', '.join(r['loaded_backends'])}")
+    print("backend yang ditunda (biaya import jika dimuat):")
+    for name, us in r["deferred_us"].items():
+        cost = "tidak terpasang" if us < 0 else f"{us / 1000:8.1f} ms"
+        print(f"  {name:40s} {cost}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark parse subtitle: pysrt vs subtitle_parser (waktu + memori)
+
+Membuat file SRT sintetis besar lalu mengukur waktu parse dan memori
+(puncak dan yang tersisa setelah parse, via tracemalloc) untuk:
+pysrt.open + konversi waktu ke ms, dan parse_subtitle_file.
+    python -m benchmarks.bench_subtitle_parse --cues 200000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from video_player.mvc.models.subtitle_parser import parse_subtitle_file
+
+def format_time(ms: int) -> str:
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+def write_srt(path: str, cues: int, bom: bool = False):
+    with open(path, "w", encoding="utf-8-sig" if bom else "utf-8", newline="\r\n") as f:
+        for i in range(cues):
+            start = i * 2500
+            f.write(f"{i + 1}\n{format_time(start)} --> {format_time(start + 2000)}\n"
+                    f"In this lecture number {i} we will look at\nthe next part of the course\n\n")
+
+def parse_pysrt(path: str):
+    import pysrt
+
+    subs = pysrt.open(path)
+    return [(sub.start.ordinal, sub.end.ordinal, sub.text) for sub in subs], subs
+
+def parse_compact(path: str):
+    cues = parse_subtitle_file(path, strip_tags=False)
+    return cues, None
+
+def measure(parse, path: str) -> dict:
+    gc.collect()
+    start = time.perf_counter()
+    parse(path)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = parse(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": elapsed, "peak_bytes": peak, "retained_bytes": retained}
+
+def run(cue_count: int = 200000) -> dict:
+    results = {"cues": cue_count}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.srt")
+        write_srt(path, cue_count, bom=True)
+        results["file_bytes"] = os.path.getsize(path)
+        results["compact"] = measure(parse_compact, path)
+        try:
+            import pysrt  # noqa: F401
+        except ImportError:
+            results["pysrt"] = None
+        else:
+            results["pysrt"] = measure(parse_pysrt, path)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=200000)
+    args = parser.parse_args()
+
+    r = run(args.cues)
+    print(f"{r['cues']} cue, {r['file_bytes'] / 1e6:.1f} MB")
+    for name in ("pysrt", "compact"):
+        m = r[name]
+        if m is None:
+            print(f"{name:8s} tidak terpasang")
+            continue
+        print(f"{name:8s} {m['seconds']:7.2f} s  {r['cues'] / m['seconds']:10.0f} cue/s  "
+              f"peak {m['peak_bytes'] / 1e6:8.1f} MB  retained {m['retained_bytes'] / 1e6:8.1f} MB")
+    if r["pysrt"]:
+        print(f"speedup {r['pysrt']['seconds'] / r['compact']['seconds']:.1f}x, "
+              f"memori tersisa {r['pysrt']['retained_bytes'] / r['compact']['retained_bytes']:.1f}x lebih kecil")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Benchmark responsivitas thread UI selama konversi subtitle penuh
+
+Event loop (pengganti loop Qt/qasync) menjalankan heartbeat tiap 10 ms
+sambil mengkonversi satu kuliah. Dibandingkan: konversi langsung di thread
+UI (perilaku lama tombol play) vs job background PlayerController. Sintesis
+offline diganti sintesis lokal yang memblokir dengan latency tiruan.
+Keluar dengan status 1 jika lag maksimum job background melewati batas.
+    python -m benchmarks.bench_ui_responsiveness --cues 300 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import CancelledError
+
+from video_player.mvc.models.video_model import VideoModel
+from video_player.mvc.models.tts_model import TTSModel
+from video_player.mvc.models.player_model import PlayerModel
+from video_player.mvc.controllers.player_controller import PlayerController
+from video_player.mvc.controllers.jobs import JOB_DONE, JOB_CANCELLED
+
+HEARTBEAT_S = 0.010
+
+class BlockingSynthesizer:
+    """Pengganti OfflineSynthesizer: tiap cue memblokir thread pemanggil"""
+
+    voice = "bench"
+    pool_size = 1
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def synthesize_many(self, jobs, on_done=None, should_stop=None):
+        sizes = []
+        for index, (text, output_file, rate) in enumerate(jobs):
+            time.sleep(self.latency)
+            with open(output_file, "wb") as f:
+                f.write(text.encode("utf-8"))
+            sizes.append(len(text))
+            if on_done:
+                on_done(index)
+            if should_stop and should_stop():
+                raise CancelledError()
+        return sizes
+
+    def shutdown(self):
+        pass
+
+def write_srt(path: str, cues: int):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(cues):
+            start = i * 3000
+            f.write(f"{i + 1}\n{start // 3600000:02d}:{start // 60000 % 60:02d}:"
+                    f"{start // 1000 % 60:02d},000 --> {start // 3600000:02d}:"
+                    f"{start // 60000 % 60:02d}:{start // 1000 % 60:02d},900\n"
+                    f"Sentence number {i} of the lecture\n\n")
+
+class Heartbeat:
+    """Catat keterlambatan tick berkala; lag besar = UI membeku"""
+
+    def __init__(self):
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + HEARTBEAT_S
+            await asyncio.sleep(HEARTBEAT_S)
+            self.lags.append(max(time.perf_counter() - expected, 0.0) * 1000)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        lags = sorted(self.lags) or [0.0]
+        return {"ticks": len(self.lags), "max_lag_ms": lags[-1],
+                "p99_lag_ms": lags[min(int(len(lags) * 0.99), len(lags) - 1)]}
+
+def make_controller(srt_path: str, latency: float) -> PlayerController:
+    tts_model = TTSModel()
+    tts_model.set_language('en', 'en')
+    tts_model._offline = BlockingSynthesizer(latency)
+    video_model = VideoModel()
+    video_model.add_video(srt_path.replace(".srt", ".mp4"), srt_path)
+    video_model.set_current(0)
+    return PlayerController(video_model, tts_model, PlayerModel())
+
+async def run_on_ui_thread(srt_path: str, latency: float) -> dict:
+    """Perilaku lama: konversi memblokir loop sampai selesai"""
+    controller = make_controller(srt_path, latency)
+    heartbeat = Heartbeat()
+    heartbeat.start()
+    await asyncio.sleep(HEARTBEAT_S * 3)
+    start = time.perf_counter()
+    ok = controller.tts_model.convert_srt_to_audio(srt_path, "tts_output/blocking")
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(HEARTBEAT_S * 3)
+    result = await heartbeat.stop()
+    result.update(seconds=elapsed, ok=ok)
+    return result
+
+async def run_as_job(srt_path: str, latency: float) -> dict:
+    controller = make_controller(srt_path, latency)
+    updates = []
+    heartbeat = Heartbeat()
+    heartbeat.start()
+    start = time.perf_counter()
+    job = controller.start_conversion(controller.video_model.current_video)
+    job.on_progress(lambda job, value: updates.append(value))
+    try:
+        await job.wait()
+    except Exception:
+        pass
+    elapsed = time.perf_counter() - start
+    result = await heartbeat.stop()
+    video = controller.video_model.current_video
+    result.update(seconds=elapsed, ok=job.status == JOB_DONE and video.is_tts_ready,
+                  progress_updates=len(updates))
+    controller.jobs.shutdown()
+    return result
+
+async def run_cancel(srt_path: str, latency: float) -> dict:
+    """Batalkan di tengah jalan, ukur waktu sampai job benar-benar berhenti"""
+    controller = make_controller(srt_path, latency)
+    job = controller.start_conversion(controller.video_model.current_video)
+    halfway = asyncio.Event()
+    job.on_progress(lambda job, value: value >= 50 and halfway.set())
+    await halfway.wait()
+    start = time.perf_counter()
+    controller.cancel_conversion()
+    try:
+        await job.wait()
+    except BaseException:
+        pass
+    video = controller.video_model.current_video
+    controller.jobs.shutdown()
+    return {"cancel_ms": (time.perf_counter() - start) * 1000,
+            "cancelled": job.status == JOB_CANCELLED and not video.is_tts_ready}
+
+async def run_async(cue_count: int, latency_ms: float) -> dict:
+    latency = latency_ms / 1000
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # tts_output/ dibuat di direktori sementara
+        try:
+            srt_path = os.path.join(tmp, "lecture.srt")
+            write_srt(srt_path, cue_count)
+            return {
+                "cues": cue_count,
+                "ui_thread": await run_on_ui_thread(srt_path, latency),
+                "job": await run_as_job(srt_path, latency),
+                "cancel": await run_cancel(srt_path, latency),
+            }
+        finally:
+            os.chdir(cwd)
+
+def run(cue_count: int = 300, latency_ms: float = 5) -> dict:
+    return asyncio.run(run_async(cue_count, latency_ms))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--max-lag-ms", type=float, default=100,
+                        help="batas lag heartbeat untuk job background")
+    args = parser.parse_args()
+
+    r = run(args.cues, args.latency_ms)
+    print(f"{r['cues']} cue, sintesis {args.latency_ms} ms/cue, heartbeat {HEARTBEAT_S * 1000:.0f} ms")
+    for name, label in (("ui_thread", "di thread UI"), ("job", "job background")):
+        m = r[name]
+        print(f"{label:16s} {m['seconds']:6.2f} s  lag maks {m['max_lag_ms']:8.1f} ms  "
+              f"p99 {m['p99_lag_ms']:6.1f} ms  ({m['ticks']} tick, ok={m['ok']})")
+    print(f"update progress ke UI: {r['job']['progress_updates']}")
+    print(f"pembatalan: {r['cancel']['cancel_ms']:.1f} ms, status dibatalkan={r['cancel']['cancelled']}")
+
+    if not r["job"]["ok"] or not r["cancel"]["cancelled"] or \
+            r["job"]["max_lag_ms"] > args.max_lag_ms:
+        print(f"GAGAL: UI tidak responsif atau job tidak selesai (batas {args.max_lag_ms} ms)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
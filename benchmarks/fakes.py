@@ -0,0 +1,319 @@
+"""Pengganti lokal deterministik untuk edge_tts, googletrans dan python-vlc
+
+Dipakai benchmark agar hot path bisa diukur tanpa jaringan dan tanpa libvlc.
+``install()`` memasang modul palsu di ``sys.modules`` sebelum modul
+aplikasi meng-import backend-nya (semua backend diimport lazy).
+"""
+import asyncio
+import enum
+import sys
+import time
+import types
+
+# Latency tiruan (detik); diubah lewat install()
+TTS_LATENCY = 0.02
+TTS_LATENCY_PER_CHAR = 0.0
+TRANSLATE_LATENCY = 0.0
+MS_PER_CHAR = 60            # Kira-kira kecepatan ucapan Edge TTS
+# Frame MP3 seperti output Edge TTS: MPEG-2 Layer III, 24 kHz, 48 kbps, mono
+MP3_FRAME_HEADER = b"\xff\xf3\x64\xc0"
+MP3_FRAME_BYTES = 144
+MP3_FRAME_MS = 24
+
+def fake_audio(text: str, voice: str = "", rate: str = "") -> bytes:
+    """Frame MP3 deterministik: isi bergantung pada teks, voice dan rate"""
+    seed = f"{voice}|{rate}|{text}".encode("utf-8")
+    payload = (seed * (MP3_FRAME_BYTES // len(seed) + 1))[:MP3_FRAME_BYTES - len(MP3_FRAME_HEADER)]
+    frames = -(-max(len(text), 1) * MS_PER_CHAR // MP3_FRAME_MS)
+    return (MP3_FRAME_HEADER + payload) * frames
+
+def fake_word_boundaries(text: str):
+    """Event WordBoundary (offset/durasi dalam 100 ns) sesuai posisi karakter kata"""
+    position = 0
+    for word in text.split():
+        position = text.index(word, position)
+        yield {"type": "WordBoundary", "offset": position * MS_PER_CHAR * 10000,
+               "duration": len(word) * MS_PER_CHAR * 10000, "text": word}
+        position += len(word)
+
+# --- edge_tts ---------------------------------------------------------------
+
+class Communicate:
+    """Pengganti edge_tts.Communicate"""
+
+    requests = 0  # Total request (semua instance)
+
+    def __init__(self, text: str, voice: str = "", rate: str = "+0%",
+                 boundary: str = "SentenceBoundary", **kwargs):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        self.boundary = boundary
+
+    async def stream(self):
+        Communicate.requests += 1
+        await asyncio.sleep(TTS_LATENCY + TTS_LATENCY_PER_CHAR * len(self.text))
+        if self.boundary == "WordBoundary":
+            for message in fake_word_boundaries(self.text):
+                yield message
+        audio = fake_audio(self.text, self.voice, self.rate)
+        chunk = 4096
+        for offset in range(0, len(audio), chunk):
+            yield {"type": "audio", "data": audio[offset:offset + chunk]}
+
+    async def save(self, audio_fname: str, metadata_fname: str = None):
+        with open(audio_fname, "wb") as f:
+            async for message in self.stream():
+                if message["type"] == "audio":
+                    f.write(message["data"])
+
+# --- googletrans ------------------------------------------------------------
+
+class Translated:
+    def __init__(self, src: str, dest: str, origin: str, text: str):
+        self.src = src
+        self.dest = dest
+        self.origin = origin
+        self.text = text
+
+class Translator:
+    """Pengganti googletrans.Translator (menerima str atau list)"""
+
+    requests = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def translate(self, text, dest="en", src="auto"):
+        Translator.requests += 1
+        if TRANSLATE_LATENCY:
+            time.sleep(TRANSLATE_LATENCY)
+        texts = text if isinstance(text, list) else [text]
+        results = [Translated(src, dest, t, f"[{dest}] {t}") for t in texts]
+        return results if isinstance(text, list) else results[0]
+
+# --- vlc --------------------------------------------------------------------
+
+class State(enum.IntEnum):
+    NothingSpecial = 0
+    Opening = 1
+    Buffering = 2
+    Playing = 3
+    Paused = 4
+    Stopped = 5
+    Ended = 6
+    Error = 7
+
+class EventType(enum.IntEnum):
+    MediaPlayerPlaying = 260
+
+class MediaParseFlag(enum.IntEnum):
+    local = 0
+    network = 1
+
+class Media:
+    def __init__(self, mrl: str, length: int = 0):
+        self.mrl = mrl
+        self.length = length
+        self.options = []
+
+    def add_option(self, option: str):
+        self.options.append(option)
+
+    def start_time(self) -> int:
+        """Nilai opsi ``:start-time=`` (ms), 0 jika tidak ada"""
+        for option in self.options:
+            if option.startswith(":start-time="):
+                return int(float(option.split("=", 1)[1]) * 1000)
+        return 0
+
+    def parse_with_options(self, flags, timeout):
+        return 0
+
+class CallbackDecorators:
+    """Dekorator callback ctypes; fungsi Python dipakai langsung"""
+    MediaOpenCb = MediaReadCb = MediaSeekCb = MediaCloseCb = staticmethod(lambda f: f)
+
+class EventManager:
+    def __init__(self):
+        self._callbacks = {}
+
+    def event_attach(self, event_type, callback, *args):
+        self._callbacks.setdefault(event_type, []).append((callback, args))
+
+    def fire(self, event_type):
+        for callback, args in self._callbacks.get(event_type, ()):
+            callback(types.SimpleNamespace(type=event_type), *args)
+
+class MediaPlayer:
+    """Pengganti vlc.MediaPlayer dengan clock tiruan
+
+    Waktu diatur lewat set_time atau maju lewat ``advance(ms)`` (dikalikan
+    ``clock_rate`` untuk mensimulasikan drift). Dengan ``open_delay_ms`` > 0,
+    play() melewati state Opening dulu seperti VLC yang sedang membuka file.
+    """
+
+    def __init__(self, length: int = 0, open_delay_ms: int = 0, clock_rate: float = 1.0):
+        self._media = None
+        self._state = State.NothingSpecial
+        self._time = 0
+        self._length = length
+        self._volume = 100
+        self._events = EventManager()
+        self._opening_left = 0.0
+        self._position = 0.0  # Waktu presisi (float) untuk clock_rate != 1
+        self.open_delay_ms = open_delay_ms
+        self.clock_rate = clock_rate
+        self.calls = 0  # Jumlah perintah yang mengubah pemutaran
+
+    def event_manager(self):
+        return self._events
+
+    def set_media(self, media):
+        self._media = media
+        self._state = State.NothingSpecial
+        self._time = 0
+        self._position = 0.0
+        self._length = getattr(media, "length", 0)
+
+    def get_media(self):
+        return self._media
+
+    def set_hwnd(self, hwnd):
+        pass
+
+    def play(self):
+        self.calls += 1
+        if self._media is None:
+            return -1
+        if self._state in (State.NothingSpecial, State.Stopped, State.Ended):
+            self.set_time(self._media.start_time())
+        if ":start-paused" in self._media.options:
+            self._state = State.Paused
+        elif self.open_delay_ms > 0 and self._state != State.Paused:
+            self._state = State.Opening
+            self._opening_left = self.open_delay_ms
+        else:
+            self._state = State.Playing
+            self._events.fire(EventType.MediaPlayerPlaying)
+        return 0
+
+    def advance(self, ms: float):
+        """Majukan clock tiruan ``ms`` milidetik"""
+        if self._state == State.Opening:
+            self._opening_left -= ms
+            if self._opening_left > 0:
+                return
+            ms = -self._opening_left
+            self._state = State.Playing
+            self._events.fire(EventType.MediaPlayerPlaying)
+        if self._state != State.Playing:
+            return
+        self._position += ms * self.clock_rate
+        self._time = int(self._position)
+        if self._length and self._time >= self._length:
+            self._time = self._length
+            self._state = State.Ended
+
+    def set_pause(self, do_pause: int):
+        self.calls += 1
+        self._state = State.Paused if do_pause else State.Playing
+        if not do_pause:
+            self._events.fire(EventType.MediaPlayerPlaying)
+
+    def pause(self):
+        self.set_pause(self._state == State.Playing)
+
+    def stop(self):
+        self.calls += 1
+        self._state = State.Stopped
+
+    def is_playing(self) -> int:
+        return int(self._state == State.Playing)
+
+    def get_state(self):
+        return self._state
+
+    def get_time(self) -> int:
+        return self._time
+
+    def set_time(self, ms: int):
+        self._time = int(ms)
+        self._position = float(self._time)
+
+    def get_length(self) -> int:
+        return self._length
+
+    def set_length(self, ms: int):
+        self._length = int(ms)
+
+    def set_position(self, position: float):
+        self.set_time(position * self._length)
+
+    def get_position(self) -> float:
+        return self._time / self._length if self._length else 0.0
+
+    def audio_set_volume(self, volume: int):
+        self._volume = volume
+        return 0
+
+    def audio_get_volume(self) -> int:
+        return self._volume
+
+class Instance:
+    """Pengganti vlc.Instance
+
+    Atribut kelas ``media_lengths`` (mrl -> durasi ms) dan ``player_options``
+    (kwargs MediaPlayer) dipakai benchmark yang butuh clock tiruan.
+    """
+
+    media_lengths = {}
+    player_options = {}
+
+    def __init__(self, *args):
+        self.players = []
+
+    def media_new(self, mrl: str, *options):
+        media = Media(mrl, self.media_lengths.get(mrl, 0))
+        for option in options:
+            media.add_option(option)
+        return media
+
+    def media_new_callbacks(self, open_cb, read_cb, seek_cb, close_cb, opaque):
+        media = Media("imem://", 0)
+        media.callbacks = (open_cb, read_cb, seek_cb, close_cb)
+        return media
+
+    def media_player_new(self, uri: str = None):
+        player = MediaPlayer(**self.player_options)
+        self.players.append(player)
+        return player
+
+    def advance(self, ms: float):
+        for player in self.players:
+            player.advance(ms)
+
+# --- pemasangan -------------------------------------------------------------
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    module.__fake__ = True
+    return module
+
+def install(tts_latency_ms: float = 20, translate_latency_ms: float = 0):
+    """Pasang edge_tts, googletrans dan vlc palsu di sys.modules"""
+    global TTS_LATENCY, TRANSLATE_LATENCY
+    TTS_LATENCY = tts_latency_ms / 1000
+    TRANSLATE_LATENCY = translate_latency_ms / 1000
+    sys.modules["edge_tts"] = _module("edge_tts", Communicate=Communicate)
+    sys.modules["googletrans"] = _module("googletrans", Translator=Translator)
+    sys.modules["vlc"] = _module(
+        "vlc", Instance=Instance, MediaPlayer=MediaPlayer, Media=Media, State=State,
+        EventType=EventType, MediaParseFlag=MediaParseFlag,
+        CallbackDecorators=CallbackDecorators
+    )
+    # PlayerModel menyimpan modul vlc setelah import pertama
+    player_model = sys.modules.get("video_player.mvc.models.player_model")
+    if player_model is not None:
+        player_model.vlc = None
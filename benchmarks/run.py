@@ -0,0 +1,280 @@
+"""Suite benchmark hot path TTS dan playback dengan pengganti lokal (fakes.py)
+
+Mengukur throughput generate_tts, biaya per tick _sync_tts_with_video, parse
+SRT, load/save playlist dan startup. Hasil ditulis sebagai JSON; dengan
+``--baseline`` hasil dibandingkan dengan run sebelumnya dan metrik yang lebih
+buruk dari toleransi ditandai sebagai regresi (exit status 1).
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import fakes
+
+# Metrik yang dibandingkan dengan baseline: "lower" atau "higher" lebih baik
+METRICS = {
+    "generate_tts": {"cold_s": "lower", "segments_per_s": "higher",
+                     "first_audio_ms": "lower", "warm_s": "lower"},
+    "sync_tick": {"tick_mean_us": "lower", "tick_p99_us": "lower", "seek_mean_us": "lower"},
+    "srt_parse": {"parse_s": "lower", "cues_per_s": "higher"},
+    "playlist": {"json_save_s": "lower", "json_load_s": "lower",
+                 "sqlite_load_s": "lower"},
+    "startup": {"time_to_window_ms": "lower"},
+}
+
+# Benchmark yang didominasi latency tiruan, tidak dinormalisasi dengan kalibrasi
+LATENCY_BOUND = {"generate_tts"}
+
+def calibrate(rounds: int = 5) -> float:
+    """Waktu (detik) beban Python tetap; dipakai menormalkan metrik CPU antar run/mesin"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        data = [(i * 7919) % 10007 for i in range(200000)]
+        data.sort()
+        {str(x): x for x in data[::4]}
+        samples.append(time.perf_counter() - start)
+    return min(samples)
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+def write_srt(path: str, cues: int, gap_ms: int = 3000, duration_ms: int = 2500):
+    from benchmarks.bench_subtitle_parse import format_time
+
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(cues):
+            start = i * gap_ms
+            f.write(f"{i + 1}\n{format_time(start)} --> {format_time(start + duration_ms)}\n"
+                    f"In this lecture number {i} we will look at the next part\n\n")
+
+def bench_generate_tts(cues: int) -> dict:
+    from video_player.mvc.models.tts_model import TTSModel
+    from video_player.mvc.models.tts_cache import TTSCache
+    from video_player.mvc.models.translation_memory import TranslationMemory
+
+    def make_model(workdir: str) -> TTSModel:
+        model = TTSModel()
+        model.cache = TTSCache(os.path.join(workdir, "cache"))
+        model.translation.memory = TranslationMemory(os.path.join(workdir, "tm.jsonl"))
+        model.set_language('en', 'id')
+        model.set_fit_to_cue(False)  # Fitting butuh ffmpeg
+        return model
+
+    async def generate(srt_path: str, tts_dir: str, workdir: str) -> float:
+        model = make_model(workdir)
+        start = time.perf_counter()
+        await model.generate_tts(srt_path, tts_dir)
+        return time.perf_counter() - start
+
+    async def first_audio(srt_path: str, tts_dir: str, workdir: str) -> int:
+        model = make_model(workdir)
+        await model.start_tts_stream(srt_path, tts_dir)
+        model.cancel_tts_stream()
+        await model.wait_tts_stream()
+        return model.time_to_first_audio
+
+    with tempfile.TemporaryDirectory() as tmp:
+        srt_path = os.path.join(tmp, "lecture.srt")
+        write_srt(srt_path, cues)
+        requests = fakes.Communicate.requests
+        cold = asyncio.run(generate(srt_path, os.path.join(tmp, "a"), os.path.join(tmp, "w1")))
+        synthesized = fakes.Communicate.requests - requests
+        # Direktori output baru, cache dan memori terjemahan sudah terisi
+        warm = asyncio.run(generate(srt_path, os.path.join(tmp, "b"), os.path.join(tmp, "w1")))
+        first = asyncio.run(first_audio(srt_path, os.path.join(tmp, "c"), os.path.join(tmp, "w2")))
+    return {"cues": cues, "cold_s": cold, "segments_per_s": cues / cold,
+            "first_audio_ms": first, "warm_s": warm, "synthesized": synthesized}
+
+def bench_sync_tick(cues: int, tick_ms: int = 50, seeks: int = 500) -> dict:
+    import random
+    from video_player.mvc.models.tts_model import TTSSegment
+    from video_player.mvc.models.player_model import PlayerModel
+
+    segments = [
+        TTSSegment(file_path=f"segment_{i + 1}.mp3", start_time=i * 3000,
+                   end_time=i * 3000 + 2500, text="", rate="+0%")
+        for i in range(cues)
+    ]
+    end = segments[-1].end_time
+    model = PlayerModel()
+    model.load_tts_segments(segments)
+    model.toggle_tts(True)
+    model.play()
+    video = model._video_player
+    video.set_length(end)
+
+    ticks = []
+    for t in range(0, end, tick_ms):
+        video.set_time(t)
+        start = time.perf_counter()
+        model.update()
+        ticks.append((time.perf_counter() - start) * 1e6)
+
+    rng = random.Random(0)
+    seek_costs = []
+    for _ in range(seeks):
+        start = time.perf_counter()
+        model.seek(rng.random())
+        seek_costs.append((time.perf_counter() - start) * 1e6)
+    return {"cues": cues, "ticks": len(ticks), "tick_mean_us": statistics.fmean(ticks),
+            "tick_p99_us": percentile(ticks, 0.99), "seek_mean_us": statistics.fmean(seek_costs),
+            "cue_switches": model.cue_switch_stats["count"]}
+
+def bench_srt_parse(cues: int) -> dict:
+    from benchmarks.bench_subtitle_parse import write_srt as write_large_srt
+    from video_player.mvc.models.subtitle_parser import parse_subtitle_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.srt")
+        write_large_srt(path, cues, bom=True)
+        start = time.perf_counter()
+        parse_subtitle_file(path)
+        elapsed = time.perf_counter() - start
+    return {"cues": cues, "parse_s": elapsed, "cues_per_s": cues / elapsed}
+
+def bench_playlist(entries: int) -> dict:
+    from benchmarks.bench_library import run
+
+    return run(entries)
+
+def bench_startup(runs: int) -> dict:
+    from benchmarks.bench_startup import run
+
+    r = run(runs)
+    return {"runs": runs, "time_to_window_ms": r["time_to_window_ms"], "wall_ms": r["wall_ms"],
+            "import_total_ms": r["import_total_ms"]}
+
+def suite(quick: bool):
+    """(nama, fungsi, argumen); --quick memperkecil ukuran input"""
+    scale = 10 if quick else 1
+    return [
+        ("generate_tts", bench_generate_tts, (400 // scale,)),
+        ("sync_tick", bench_sync_tick, (5000 // scale,)),
+        ("srt_parse", bench_srt_parse, (100000 // scale,)),
+        ("playlist", bench_playlist, (10000 // scale,)),
+        ("startup", bench_startup, (5 if not quick else 1,)),
+    ]
+
+def best_of(samples: list, name: str) -> dict:
+    """Gabungkan beberapa putaran: nilai terbaik per metrik (noise scheduler hanya memperburuk)"""
+    result = dict(samples[0])
+    for metric, better in METRICS[name].items():
+        values = [sample[metric] for sample in samples if metric in sample]
+        if values:
+            result[metric] = min(values) if better == "lower" else max(values)
+    return result
+
+def run(only=None, quick: bool = False, tts_latency_ms: float = 20, repeat: int = 3) -> dict:
+    fakes.install(tts_latency_ms=tts_latency_ms)
+    calibration = [calibrate()]
+    results = {}
+    for name, func, args in suite(quick):
+        if only and name not in only:
+            continue
+        try:
+            # Startup sudah mengambil median beberapa proses
+            rounds = 1 if name == "startup" else max(repeat, 1)
+            results[name] = best_of([func(*args) for _ in range(rounds)], name)
+        except Exception as e:
+            # Mis. startup tanpa PyQt6: dicatat, tidak menggagalkan suite
+            message = str(e).strip().splitlines()[-1:] or [""]
+            results[name] = {"error": f"{type(e).__name__}: {message[0]}"}
+    calibration.append(calibrate())
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "tts_latency_ms": tts_latency_ms,
+            "repeat": repeat,
+            "calibration_s": statistics.fmean(calibration),
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, tolerance: float, normalize: bool = True) -> list:
+    """Bandingkan metrik dengan baseline: list (bench, metrik, baseline, sekarang, perubahan, regresi)
+
+    Dengan ``normalize``, metrik CPU diskalakan dengan rasio kalibrasi kedua
+    run sehingga mesin yang sedang sibuk/lebih lambat tidak dianggap regresi.
+    """
+    speed = 1.0
+    base_cal = baseline.get("meta", {}).get("calibration_s")
+    now_cal = current["meta"].get("calibration_s")
+    if normalize and base_cal and now_cal:
+        speed = base_cal / now_cal
+    rows = []
+    for name, metrics in METRICS.items():
+        now = current["results"].get(name, {})
+        before = baseline.get("results", {}).get(name, {})
+        scale = 1.0 if name in LATENCY_BOUND else speed
+        for metric, better in metrics.items():
+            if metric not in now or metric not in before or not before[metric]:
+                continue
+            value = now[metric] * scale if better == "lower" else now[metric] / scale
+            change = (value - before[metric]) / before[metric]
+            worse = change if better == "lower" else -change
+            rows.append((name, metric, before[metric], value, change, worse > tolerance))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json", help="file JSON hasil")
+    parser.add_argument("--baseline", help="file JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="perubahan relatif yang masih diterima (0.25 = 25%%)")
+    parser.add_argument("--only", help="daftar benchmark dipisah koma: " +
+                        ",".join(METRICS))
+    parser.add_argument("--quick", action="store_true", help="ukuran input 1/10")
+    parser.add_argument("--tts-latency-ms", type=float, default=20)
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="bandingkan nilai mentah tanpa normalisasi kalibrasi CPU")
+    parser.add_argument("--repeat", type=int, default=3, help="putaran per benchmark, diambil yang terbaik")
+    args = parser.parse_args()
+    only = {name.strip() for name in args.only.split(",")} if args.only else None
+
+    current = run(only, args.quick, args.tts_latency_ms, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+
+    for name, values in current["results"].items():
+        if "error" in values:
+            print(f"{name:14s} dilewati: {values['error']}")
+            continue
+        shown = ", ".join(f"{metric}={values[metric]:.4g}" for metric in METRICS[name]
+                          if metric in values)
+        print(f"{name:14s} {shown}")
+    print(f"hasil ditulis ke {args.output}")
+
+    if not args.baseline:
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("quick") != args.quick:
+        print("peringatan: baseline dijalankan dengan ukuran input berbeda (--quick)")
+    rows = compare(current, baseline, args.tolerance, not args.no_normalize)
+    regressions = [row for row in rows if row[5]]
+    speed = baseline.get("meta", {}).get("calibration_s", 0) / current["meta"]["calibration_s"]
+    print(f"\nperbandingan dengan {args.baseline} (toleransi {args.tolerance:.0%}, "
+          f"kecepatan CPU relatif {speed:.2f}x{', tidak dinormalisasi' if args.no_normalize else ''}):")
+    for name, metric, before, now, change, regressed in rows:
+        flag = "REGRESI" if regressed else ""
+        print(f"  {name:14s} {metric:16s} {before:12.4g} -> {now:12.4g}  {change:+7.1%}  {flag}")
+    if regressions:
+        print(f"{len(regressions)} metrik regresi")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
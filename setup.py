@@ -10,6 +10,7 @@ setup(
         'edge-tts',
         'pysrt',
         'pydub',
-        'qasync'
+        'qasync',
+        'numpy'
     ],
 )
@@ -1,15 +1,30 @@
+import argparse
 import asyncio
 import edge_tts
-import pysrt
+import glob
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import time
 from pydub import AudioSegment
+from video_player.mvc.models.tts_cache import TTSCache, DEFAULT_CACHE_DIR
+from video_player.mvc.models.audio_fit import fit_segment, fit_segment_data, FitReport
+from video_player.mvc.models.audio_render import render_timeline
+from video_player.mvc.models.audio_post import PostProcessor, POST_PROCESS_TAG
+from video_player.mvc.models.subtitle_parser import parse_subtitle_file
+from video_player.mvc.models.tts_checkpoint import TTSCheckpoint
+from video_player.mvc.models.segment_store import CODEC_COPY, PACK_CODECS, store_for
+from video_player.mvc.models import metrics
+from collections import namedtuple
 
 VOICE_LIST = {
     "pria": "id-ID-ArdiNeural",
+    "wanita": "id-ID-GadisNeural"
 }
 
+CueAudio = namedtuple("CueAudio", ["file_path", "start_time", "end_time"])
+
+
 async def text_to_speech(text, output_file, voice_type="pria", rate="+0%", volume="+0%"):
     """Mengkonversi teks ke audio menggunakan Edge TTS"""
     communicate = edge_tts.Communicate(text, VOICE_LIST[voice_type], rate=rate, volume=volume)
@@ -34,58 +49,291 @@ def calculate_speech_rate(text_length, duration_ms, global_speed=1):
     rate_change = min(max(rate_change, -30), 150)  # Batasi antara -30% sampai +150%
     return f"{rate_change:+d}%"
 
-async def convert_srt_to_audio(srt_file, output_dir="output", voice_type="pria", global_speed=1):
-    """Mengkonversi file SRT ke audio menggunakan TTS"""
+def base_speech_rate(global_speed=1):
+    """Rate tetap dari kecepatan global, durasi disesuaikan oleh fitting"""
+    return f"{int(round((global_speed - 1) * 100)):+d}%"
+
+async def convert_srt_to_audio(srt_file, output_dir="output", voice_type="pria", global_speed=1,
+                               cache=None, fit=True, concurrency=4, verbose=True, pack=None,
+                               pack_bitrate=None, post=False, post_workers=None):
+    """Mengkonversi file SRT ke audio menggunakan TTS
+
+    Cue diproses paralel (maksimal ``concurrency`` request sekaligus) dan
+    dicatat di checkpoint, jadi konversi yang terputus bisa dilanjutkan.
+    Dengan ``pack`` (nama codec, lihat segment_store) segment disimpan di
+    satu pack per direktori output, bukan file terpisah. Dengan ``post``
+    hening di awal/akhir segment dibuang dan loudness dinormalisasi di pool
+    proses (``post_workers`` proses, default jumlah CPU).
+    Mengembalikan statistik konversi.
+    """
+    started = time.perf_counter()
+    if cache is None:
+        cache = TTSCache(DEFAULT_CACHE_DIR)
+    fit_report = FitReport()
+    loop = asyncio.get_event_loop()
+    log = print if verbose else (lambda *args, **kwargs: None)
     
     # Buat direktori output jika belum ada
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
     # Baca file SRT
-    subs = pysrt.open(srt_file)
-    
-    print("Memulai konversi teks ke audio...")
+    cues = parse_subtitle_file(srt_file)
+
+    settings = {
+        "srt": os.path.abspath(srt_file),
+        "srt_mtime": os.path.getmtime(srt_file),
+        "voice": VOICE_LIST[voice_type],
+        "global_speed": global_speed,
+        "fit": fit
+    }
+    store = store_for(output_dir, create=bool(pack), codec=pack or CODEC_COPY,
+                      bitrate=pack_bitrate)
+    if store is not None and not pack:
+        store.delete()  # Pack lama tidak boleh menutupi file segment baru
+        store = None
+    if pack:
+        settings["packed"] = [pack, pack_bitrate]
+    if post:
+        settings["post"] = POST_PROCESS_TAG
+    checkpoint = TTSCheckpoint(output_dir, settings, store=store)
+    checkpoint.remove_partial_files()
+    post_processor = PostProcessor(post_workers) if post else None
+    stats = {"file": srt_file, "cues": len(cues), "synthesized": 0, "resumed": 0,
+             "bytes": 0, "failed": 0}
     
-    # Proses setiap subtitle
-    for i, sub in enumerate(subs):
+    log("Memulai konversi teks ke audio...")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(i, cue):
         output_file = os.path.join(output_dir, f"segment_{i+1}.mp3")
-        duration = (sub.end.seconds - sub.start.seconds) * 1000  # Konversi ke milidetik
+        duration = cue.duration  # Durasi cue dalam milidetik
         
-        print(f"Memproses segment {i+1}: {sub.text}")
-        
-        # Hitung rate berdasarkan panjang teks dan durasi dengan faktor kecepatan global
-        rate = calculate_speech_rate(len(sub.text), duration, global_speed)
+        # Dengan fitting, rate tetap dan durasi disesuaikan setelah sintesis
+        if fit:
+            rate = base_speech_rate(global_speed)
+        else:
+            rate = calculate_speech_rate(len(cue.text), duration, global_speed)
+
+        if checkpoint.is_done(output_file, cue.text, rate):
+            stats["resumed"] += 1
+            return
         
-        # Konversi teks ke audio dengan penyesuaian kecepatan
-        await text_to_speech(sub.text, output_file, voice_type, rate=rate)
-        print(f"Durasi target: {duration}ms, Rate: {rate}")
+        async with semaphore:
+            log(f"Memproses segment {i+1}: {cue.text}")
+            try:
+                # Konversi teks ke audio dengan penyesuaian kecepatan (pakai cache jika ada)
+                key = cache.key_for(cue.text, VOICE_LIST[voice_type], rate)
+                cached_file = cache.lookup(key)
+                metrics.CACHE_LOOKUPS.inc(1, "miss" if cached_file is None else "hit")
+                if cached_file is None:
+                    temp_file = cache.temp_path(key)
+                    synth_started = time.perf_counter()
+                    try:
+                        await text_to_speech(cue.text, temp_file, voice_type, rate=rate)
+                    except BaseException:
+                        if os.path.exists(temp_file):
+                            os.remove(temp_file)
+                        raise
+                    metrics.SYNTHESIS_SECONDS.observe(time.perf_counter() - synth_started)
+                    cached_file = cache.commit(key, temp_file)
+                if post_processor is not None:
+                    # Hasil post-processing disimpan di cache dengan key turunan
+                    post_key = cache.derived_key(key, POST_PROCESS_TAG)
+                    processed = cache.path_for(post_key)
+                    if not (os.path.exists(processed) and os.path.getsize(processed) > 0):
+                        temp_file = cache.temp_path(post_key)
+                        post_started = time.perf_counter()
+                        try:
+                            await post_processor.process(cached_file, temp_file)
+                        except BaseException:
+                            if os.path.exists(temp_file):
+                                os.remove(temp_file)
+                            raise
+                        metrics.POST_PROCESS_SECONDS.observe(time.perf_counter() - post_started)
+                        processed = cache.commit(post_key, temp_file)
+                    cached_file = processed
+                if store is not None:
+                    with open(cached_file, "rb") as f:
+                        data = f.read()
+                    if fit:
+                        data, before, after = await loop.run_in_executor(
+                            None, fit_segment_data, data, duration
+                        )
+                    await loop.run_in_executor(None, store.put, os.path.basename(output_file), data)
+                else:
+                    cache.materialize(cached_file, output_file)
+                    if fit:
+                        before, after = await loop.run_in_executor(None, fit_segment, output_file, duration)
+                if fit:
+                    fit_report.add(duration, before, after)
+                    log(f"Durasi target: {duration}ms, Rate: {rate}, Durasi audio: {before}ms -> {after}ms")
+                else:
+                    log(f"Durasi target: {duration}ms, Rate: {rate}")
+            except Exception as e:
+                stats["failed"] += 1
+                log(f"Gagal memproses segment {i+1}: {e}")
+                return
+
+        size = checkpoint.mark_done(output_file, cue.text, rate)
+        stats["synthesized"] += 1
+        stats["bytes"] += size
+        metrics.BYTES_WRITTEN.inc(size)
+
+    try:
+        await asyncio.gather(*(process(i, cue) for i, cue in enumerate(cues)))
+    finally:
+        checkpoint.save()
+        if post_processor is not None:
+            post_processor.shutdown()
+    if store is not None:
+        store.compact_if_needed()
 
     # Buat file tunggal
-    print("\nMembuat file audio tunggal...")
     combined_file = os.path.join(output_dir, "combined_output.mp3")
-    
-    # Gabungkan semua teks dengan timing yang sesuai
-    combined_text = " ".join([sub.text for sub in subs])
-    await text_to_speech(combined_text, combined_file, voice_type)
-    print(f"File audio tunggal telah dibuat: {combined_file}")
+    if stats["failed"]:
+        log("\nAda segment yang gagal, file audio tunggal tidak dibuat")
+    elif not (checkpoint.complete and os.path.exists(combined_file)):
+        log("\nMembuat file audio tunggal...")
+        
+        # Susun segment yang sudah ada sesuai timing cue, tanpa sintesis ulang
+        cues = [
+            CueAudio(os.path.join(output_dir, f"segment_{i+1}.mp3"),
+                     cues.starts[i], cues.ends[i])
+            for i in range(len(cues))
+        ]
+        await loop.run_in_executor(None, render_timeline, cues, combined_file)
+        stats["bytes"] += os.path.getsize(combined_file)
+        checkpoint.complete = True
+        log(f"File audio tunggal telah dibuat: {combined_file}")
 
-if __name__ == "__main__":
-    # Konversi SRT ke audio dengan pilihan suara dan kecepatan global
-    output_dirs = {
-        "pria": "output_pria_faster",
+    if fit:
+        log(fit_report.format())
+
+    cache_stats = cache.stats()
+    stats["cache_hits"] = cache_stats["hits"]
+    stats["cache_misses"] = cache_stats["misses"]
+    log(f"Cache TTS: {cache_stats['hits']} hit, {cache_stats['misses']} miss "
+        f"({cache_stats['hit_rate']:.0%} hit rate)")
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+def find_srt_files(inputs):
+    """Mencari file SRT/WebVTT dari daftar direktori, pola glob, atau file"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            srt_files = {p.with_suffix("") for p in Path(item).rglob("*.srt")}
+            # .vtt hanya dipakai jika tidak ada .srt dengan nama yang sama
+            files += sorted(
+                [str(p) for p in Path(item).rglob("*.srt")] +
+                [str(p) for p in Path(item).rglob("*.vtt") if p.with_suffix("") not in srt_files]
+            )
+        elif glob.has_magic(item):
+            files += sorted(glob.glob(item, recursive=True))
+        else:
+            files.append(item)
+    # Hilangkan duplikat, urutan tetap
+    return list(dict.fromkeys(os.path.normpath(f) for f in files))
+
+def output_dir_for(srt_file, root, output_root):
+    """Direktori output per file SRT, mengikuti struktur folder kursus"""
+    relative = os.path.relpath(srt_file, root)
+    return os.path.join(output_root, os.path.splitext(relative)[0])
+
+def _convert_file(job):
+    """Worker process: konversi satu file SRT dengan event loop sendiri
+
+    Jika metrik aktif, snapshot metrik proses ini ikut dikembalikan agar bisa
+    digabung di proses utama.
+    """
+    srt_file, output_dir, options, collect_metrics = job
+    metrics.enable(collect_metrics)
+    metrics.reset()
+    try:
+        result = asyncio.run(convert_srt_to_audio(srt_file, output_dir=output_dir, **options))
+    except Exception as e:
+        result = {"file": srt_file, "cues": 0, "synthesized": 0, "resumed": 0,
+                  "bytes": 0, "failed": 1, "error": str(e)}
+    if collect_metrics:
+        result["metrics"] = metrics.snapshot()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Konversi file SRT (satu file, direktori kursus, atau glob) ke audio TTS"
+    )
+    parser.add_argument("inputs", nargs="+", help="File SRT, direktori, atau pola glob")
+    parser.add_argument("-o", "--output", default="output", help="Direktori output utama")
+    parser.add_argument("--voice", choices=sorted(VOICE_LIST), default="pria")
+    parser.add_argument("--speed", type=float, default=1, help="Kecepatan global")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Jumlah proses paralel")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Request TTS paralel per proses")
+    parser.add_argument("--no-fit", action="store_true",
+                        help="Pakai estimasi rate lama, tanpa time-stretch fitting")
+    parser.add_argument("--pack", nargs="?", const=CODEC_COPY, choices=sorted(PACK_CODECS),
+                        help="Simpan segment di satu pack per file SRT (opsional: codec ringkas)")
+    parser.add_argument("--pack-bitrate", help="Bitrate codec pack, mis. 16k (default per codec)")
+    parser.add_argument("--post", action="store_true",
+                        help="Buang hening awal/akhir dan normalisasi loudness setiap segment")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Tulis metrik sintesis ke FILE (.json atau teks Prometheus)")
+    args = parser.parse_args(argv)
+
+    files = find_srt_files(args.inputs)
+    if not files:
+        parser.error("Tidak ada file SRT yang ditemukan")
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    options = {
+        "voice_type": args.voice,
+        "global_speed": args.speed,
+        "fit": not args.no_fit,
+        "concurrency": args.concurrency,
+        "pack": args.pack,
+        "pack_bitrate": args.pack_bitrate,
+        "post": args.post,
+        # Pool post-processing per proses, total tetap sebanyak CPU
+        "post_workers": max(1, (os.cpu_count() or 1) // max(1, args.workers)),
+        "verbose": args.workers <= 1 and len(files) == 1
     }
-    
-    # Gunakan kecepatan global 1.2x untuk mempercepat output
-    global_speed = 1  # Sedikit lebih lambat untuk hasil yang lebih natural
-    
-    # Buat konversi dengan dua jenis suara
-    for voice_type, output_dir in output_dirs.items():
-        print(f"\nMemulai konversi dengan suara {voice_type} (kecepatan {global_speed}x)...")
-        asyncio.run(convert_srt_to_audio(
-            "1. Introduction.srt",
-            output_dir=output_dir,
-            voice_type=voice_type,
-            global_speed=global_speed
-        ))
-        
-    print("\nKonversi selesai! Cek folder output_pria_faster dan output_wanita_faster untuk hasil konversi.")
+    jobs = [(f, output_dir_for(os.path.abspath(f), root, args.output), options, bool(args.metrics))
+            for f in files]
+    metrics.enable(bool(args.metrics))
+
+    print(f"Mengkonversi {len(files)} file SRT dengan {args.workers} proses "
+          f"x {args.concurrency} request...")
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(_convert_file, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if "metrics" in result:
+                metrics.merge(result.pop("metrics"))
+            results.append(result)
+            status = "GAGAL" if result["failed"] else "OK"
+            print(f"[{len(results)}/{len(jobs)}] {status} {result['file']} "
+                  f"({result['synthesized']} baru, {result['resumed']} dilanjutkan)")
+    elapsed = time.perf_counter() - started
+
+    cues = sum(r["cues"] for r in results)
+    written = sum(r["bytes"] for r in results)
+    failures = [r for r in results if r["failed"]]
+    print("\nRingkasan:")
+    print(f"  File      : {len(results)} ({len(failures)} gagal)")
+    print(f"  Cue       : {cues} dalam {elapsed:.1f} s ({cues / elapsed if elapsed else 0:.1f} cue/s)")
+    print(f"  Disintesis: {sum(r['synthesized'] for r in results)}, "
+          f"dilanjutkan: {sum(r['resumed'] for r in results)}")
+    print(f"  Ditulis   : {written / (1024 * 1024):.1f} MB")
+    for r in failures:
+        print(f"  Gagal     : {r['file']} - {r.get('error', str(r['failed']) + ' segment gagal')}")
+    if args.metrics:
+        metrics.write(args.metrics)
+        print(f"  Metrik    : {args.metrics}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
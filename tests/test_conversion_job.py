@@ -0,0 +1,124 @@
+"""Konversi subtitle dari PlayerController berjalan sebagai job background
+
+Sintesis offline diganti sintesis yang memblokir thread pemanggil per cue,
+jadi konversi yang (keliru) berjalan di thread UI langsung terlihat sebagai
+heartbeat event loop yang terlambat.
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+
+from video_player.mvc.models.video_model import VideoModel, TTS_NONE
+from video_player.mvc.models.tts_model import TTSModel
+from video_player.mvc.models.player_model import PlayerModel
+from video_player.mvc.controllers.player_controller import PlayerController
+from video_player.mvc.controllers.jobs import JOB_DONE, JOB_CANCELLED
+
+CUES = 200
+SYNTH_LATENCY_S = 0.005     # Satu kuliah penuh memblokir ~1 detik
+HEARTBEAT_S = 0.010
+MAX_LAG_S = 0.100           # Lag heartbeat di atas ini = UI membeku
+
+class BlockingSynthesizer:
+    """Pengganti OfflineSynthesizer: tiap cue memblokir thread pemanggil"""
+
+    voice = "test"
+    pool_size = 1
+
+    def __init__(self):
+        self.threads = set()
+
+    def synthesize_many(self, jobs, on_done=None, should_stop=None):
+        self.threads.add(threading.get_ident())
+        for index, (text, output_file, rate) in enumerate(jobs):
+            time.sleep(SYNTH_LATENCY_S)
+            with open(output_file, "wb") as f:
+                f.write(text.encode("utf-8"))
+            if on_done:
+                on_done(index)
+            if should_stop and should_stop():
+                raise CancelledError()
+        return [len(text) for text, _, _ in jobs]
+
+    def shutdown(self):
+        pass
+
+def write_srt(path: str, cues: int):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(cues):
+            start = i * 3
+            f.write(f"{i + 1}\n00:{start // 60:02d}:{start % 60:02d},000 --> "
+                    f"00:{start // 60:02d}:{start % 60:02d},900\n"
+                    f"Sentence number {i} of the lecture\n\n")
+
+class ConversionJobTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)  # tts_output/ dibuat di direktori sementara
+        srt_path = os.path.join(self._tmp.name, "lecture.srt")
+        write_srt(srt_path, CUES)
+
+        tts_model = TTSModel()
+        tts_model.set_language('en', 'en')
+        self.synth = tts_model._offline = BlockingSynthesizer()
+        video_model = VideoModel()
+        video_model.add_video(srt_path.replace(".srt", ".mp4"), srt_path)
+        video_model.set_current(0)
+        self.controller = PlayerController(video_model, tts_model, PlayerModel())
+        self.video = video_model.current_video
+
+    async def asyncTearDown(self):
+        self.controller.jobs.shutdown()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    async def _heartbeat(self, lags: list):
+        while True:
+            expected = time.perf_counter() + HEARTBEAT_S
+            await asyncio.sleep(HEARTBEAT_S)
+            lags.append(max(time.perf_counter() - expected, 0.0))
+
+    async def test_ui_loop_stays_responsive_during_full_conversion(self):
+        ui_thread = threading.get_ident()
+        lags, progress_threads, progress = [], set(), []
+        heartbeat = asyncio.ensure_future(self._heartbeat(lags))
+
+        job = self.controller.start_conversion(self.video)
+        job.on_progress(lambda job, value: (progress.append(value),
+                                            progress_threads.add(threading.get_ident())))
+        await job.wait()
+        heartbeat.cancel()
+
+        self.assertEqual(job.status, JOB_DONE)
+        self.assertTrue(self.video.is_tts_ready)
+        self.assertEqual(len(job.result[0]), CUES)
+        # Sintesis di thread worker, progress dan hasil kembali ke thread UI
+        self.assertNotIn(ui_thread, self.synth.threads)
+        self.assertEqual(progress_threads, {ui_thread})
+        self.assertEqual(progress[-1], 100)
+        # Konversi ~1 s: loop tetap berdetak sepanjang waktu tanpa jeda panjang
+        self.assertGreater(len(lags), CUES * SYNTH_LATENCY_S / HEARTBEAT_S / 2)
+        self.assertLess(max(lags), MAX_LAG_S)
+
+    async def test_cancel_conversion_stops_job_and_resets_status(self):
+        job = self.controller.start_conversion(self.video)
+        halfway = asyncio.Event()
+        job.on_progress(lambda job, value: value >= 50 and halfway.set())
+        await halfway.wait()
+
+        self.assertTrue(self.controller.cancel_conversion())
+        with self.assertRaises(BaseException):
+            await job.wait()
+        self.assertEqual(job.status, JOB_CANCELLED)
+        self.assertFalse(self.video.is_tts_ready)
+        self.assertEqual(self.video.tts_status, TTS_NONE)
+
+if __name__ == "__main__":
+    unittest.main()
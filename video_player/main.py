@@ -1,20 +1,32 @@
+import time
+STARTED = time.perf_counter()
+
+import os
 import sys
 import asyncio
 import qasync
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from mvc.models.video_model import VideoModel
 from mvc.models.tts_model import TTSModel
 from mvc.models.player_model import PlayerModel
 from mvc.controllers.player_controller import PlayerController
 from mvc.views.player_view import PlayerView
-import json
+from mvc.models.library_store import LibraryStore
+from mvc.models import metrics
+
+# Jika diset, aplikasi mencetak waktu sampai window tampil lalu keluar
+# (dipakai benchmarks/bench_startup.py)
+STARTUP_PROBE_ENV = "VIDEO_PLAYER_STARTUP_PROBE"
 
 class VideoPlayerApp:
     def __init__(self):
-        # Inisialisasi models
+        # Inisialisasi models (VLC, pyttsx3, googletrans, edge_tts baru dimuat
+        # saat pertama kali dipakai)
         self.video_model = VideoModel()
         self.tts_model = TTSModel()
         self.player_model = PlayerModel()
+        self.library = LibraryStore()
 
         # Inisialisasi controller
         self.controller = PlayerController(
@@ -27,30 +39,40 @@ class VideoPlayerApp:
         self.view = PlayerView(self.controller)
         self.controller.setup_view(self.view)
 
-        # Load saved playlist
-        self.load_playlist()
-
     def load_playlist(self):
-        """Load saved playlist from file"""
+        """Load playlist dari library (import playlist.json lama sekali saja)"""
         try:
-            with open('playlist.json', 'r') as f:
-                data = json.load(f)
-                self.controller.load_playlist(data)
-        except:
-            print("No saved playlist found")
+            if self.library.import_playlist_json('playlist.json'):
+                print("playlist.json diimport ke library")
+            self.library.attach(self.video_model)
+        except Exception as e:
+            print(f"Error loading library: {e}")
 
     def save_playlist(self):
-        """Save playlist to file"""
+        """Simpan posisi playback terakhir dan tutup library
+
+        Perubahan playlist lain sudah tersimpan saat terjadi.
+        """
         try:
-            data = self.controller.save_playlist()
-            with open('playlist.json', 'w') as f:
-                json.dump(data, f)
+            self.controller.save_playback_position()
+            self.controller.jobs.shutdown()
+            self.library.close()
         except Exception as e:
             print(f"Error saving playlist: {e}")
 
     def run(self):
-        """Run the application"""
+        """Run the application
+
+        Window ditampilkan dulu, playlist di-load setelah event loop berjalan.
+        """
         self.view.show()
+        QTimer.singleShot(0, self.load_playlist)
+
+def report_startup(app):
+    """Cetak waktu sampai window tampil (mode probe) lalu keluar"""
+    elapsed = (time.perf_counter() - STARTED) * 1000
+    print(f"time_to_window_ms={elapsed:.1f}", flush=True)
+    app.quit()
 
 async def main():
     def close_future(future, loop):
@@ -61,6 +83,9 @@ async def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
+    # Metrik nonaktif kecuali VIDEO_PLAYER_METRICS diset
+    metrics.configure_from_env()
+
     # Setup asyncio loop
     loop = asyncio.get_event_loop()
     future = asyncio.Future()
@@ -68,6 +93,8 @@ async def main():
     # Create and run video player
     player = VideoPlayerApp()
     player.run()
+    if os.environ.get(STARTUP_PROBE_ENV):
+        QTimer.singleShot(0, lambda: report_startup(app))
     
     # Setup cleanup
     app.aboutToQuit.connect(
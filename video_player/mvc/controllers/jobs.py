@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+class JobCancelled(Exception):
+    """Dilempar di thread worker saat job dibatalkan"""
+
+class Job:
+    """Handle job background: progress, pembatalan dan hasil
+
+    Fungsi job berjalan di thread worker. Semua callback (progress, selesai)
+    dikirim ke event loop UI lewat ``loop.call_soon_threadsafe``, jadi aman
+    menyentuh widget di dalamnya.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop):
+        self.id = next(self._ids)
+        self.name = name
+        self.status = JOB_PENDING
+        self.progress = 0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._loop = loop
+        self._cancel_event = threading.Event()
+        self._future: asyncio.Future = loop.create_future()
+        self._progress_callbacks: List[Callable[["Job", int], None]] = []
+        self._done_callbacks: List[Callable[["Job"], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+    def cancel(self):
+        """Minta job berhenti; fungsi job memeriksa ``cancelled`` / ``check_cancelled``"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Dipanggil dari thread worker di titik yang aman untuk berhenti"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def on_progress(self, callback: Callable[["Job", int], None]) -> "Job":
+        self._progress_callbacks.append(callback)
+        return self
+
+    def on_done(self, callback: Callable[["Job"], None]) -> "Job":
+        """``callback(job)`` dipanggil di thread UI setelah job selesai/gagal/dibatalkan"""
+        if self.done:
+            self._loop.call_soon(callback, self)
+        else:
+            self._done_callbacks.append(callback)
+        return self
+
+    def report_progress(self, value: int):
+        """Laporkan progress (0-100) dari thread worker"""
+        self._loop.call_soon_threadsafe(self._set_progress, int(value))
+
+    async def wait(self) -> Any:
+        """Tunggu job selesai dan kembalikan hasilnya (raise jika gagal/dibatalkan)"""
+        return await asyncio.shield(self._future)
+
+    def _set_progress(self, value: int):
+        if self.done or value == self.progress:
+            return
+        self.progress = value
+        for callback in self._progress_callbacks:
+            callback(self, value)
+
+    def _finish(self, status: str, result: Any = None, error: Optional[BaseException] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        if status == JOB_DONE:
+            self._future.set_result(result)
+        else:
+            self._future.set_exception(error or asyncio.CancelledError())
+            self._future.exception()  # Ditandai sudah dibaca, hasil tetap lewat on_done
+        for callback in self._done_callbacks:
+            callback(self)
+        self._done_callbacks.clear()
+
+class JobRunner:
+    """Menjalankan fungsi blocking sebagai Job di thread pool"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, max_workers: int = 2):
+        self._loop = loop
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: List[Job] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        return self._loop
+
+    @property
+    def active_jobs(self) -> List[Job]:
+        return [job for job in self._jobs if not job.done]
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        """Jalankan ``func(job, *args, **kwargs)`` di thread worker"""
+        job = Job(name, self.loop)
+        self._jobs = [j for j in self._jobs if not j.done] + [job]
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job: Job, func, args, kwargs):
+        post = self.loop.call_soon_threadsafe
+        if job.cancelled:
+            post(job._finish, JOB_CANCELLED)
+            return
+        job.status = JOB_RUNNING
+        try:
+            result = func(job, *args, **kwargs)
+            if job.cancelled:
+                post(job._finish, JOB_CANCELLED)
+            else:
+                post(job._finish, JOB_DONE, result)
+        except Exception as e:
+            # Error apa pun setelah cancel() (mis. CancelledError dari pool) = dibatalkan
+            if isinstance(e, JobCancelled) or job.cancelled:
+                post(job._finish, JOB_CANCELLED)
+            else:
+                post(job._finish, JOB_FAILED, None, e)
+
+    def cancel_all(self):
+        for job in self.active_jobs:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,11 @@
 import asyncio
+from functools import partial
 from typing import Optional
-from ..models.video_model import VideoModel
-from ..models.tts_model import TTSModel
+from ..models.video_model import VideoModel, TTS_NONE, TTS_GENERATING, TTS_FAILED
+from ..models.tts_model import TTSModel, TIMELINE_TRACK_NAME
 from ..models.player_model import PlayerModel
+from .pregen_scheduler import PregenScheduler
+from .jobs import Job, JobRunner, JOB_DONE, JOB_CANCELLED
 from PyQt5.QtCore import QObject, pyqtSignal
 import os
 
@@ -15,6 +18,15 @@ class PlayerController(QObject):
         self.tts_model = tts_model
         self.player_model = player_model
         self._preparing_tts = False
+        self._streaming_tts = True  # Mulai video sebelum semua segment TTS selesai
+        self._render_tts_track = False  # Render segment menjadi satu track audio
+        self._playing_video = None      # VideoData yang sedang dimuat di player
+        self._stream_video = None       # VideoData yang TTS-nya sedang di-stream
+        # Generate TTS video berikutnya di background selama video aktif diputar
+        self.pregen = PregenScheduler(video_model, tts_model)
+        # Konversi offline (terjemahan + sintesis + merge) berjalan di thread worker
+        self.jobs = JobRunner()
+        self._conversion_job: Optional[Job] = None
         self.view = None
         self.loop = asyncio.get_event_loop()
 
@@ -54,19 +66,102 @@ class PlayerController(QObject):
         self._preparing_tts = True
         try:
             # Generate TTS if not ready
+            self.tts_model.cancel_tts_stream()
+            self._reset_stream_status()
+            if video_data.is_tts_ready and \
+                    not self.video_model.get_segments(self.video_model.current_index):
+                # Tanpa manifest (mis. import playlist.json) segment video sebelumnya
+                # tidak boleh terpakai: generate ulang, checkpoint melewati file yang ada
+                self.player_model.load_tts_segments([])
+                self.video_model.clear_tts_ready(self.video_model.current_index)
             if not video_data.is_tts_ready:
-                tts_dir = f"tts_output/video_{self.video_model.current_index}"
+                # Job background untuk video ini harus berhenti dulu: verifikasi
+                # checkpoint menghapus file .part di direktori output yang sama
+                await self.pregen.wait_stopped(video_data)
+                index = self.video_model.current_index
+                tts_dir = self.video_model.default_tts_dir(index)
                 self.tts_model.set_voice_type(video_data.voice_type)
-                segments = await self.tts_model.generate_tts(video_data.srt_path, tts_dir)
-                self.video_model.set_tts_ready(self.video_model.current_index, tts_dir)
+                self.video_model.set_tts_status(index, TTS_GENERATING)
+                if self._streaming_tts:
+                    self._stream_video = video_data
+                    segments = await self.tts_model.start_tts_stream(video_data.srt_path, tts_dir)
+                    self.player_model.load_tts_segments(segments)
+                    self.conversion_status.emit(
+                        f"Audio pertama siap dalam {self.tts_model.time_to_first_audio} ms"
+                    )
+                    asyncio.ensure_future(self._finish_tts_stream(tts_dir, video_data))
+                else:
+                    segments = await self.tts_model.generate_tts(video_data.srt_path, tts_dir)
+                    # Playlist bisa berubah selama generate: cari ulang posisi video
+                    index = self.video_model.index_of(video_data)
+                    if index < 0:
+                        return False
+                    self.video_model.set_tts_ready(index, tts_dir, segments)
+                    self.player_model.load_tts_segments(segments)
+                    await self._load_tts_track(video_data, segments, tts_dir)
+            else:
+                # TTS sudah ada: pakai manifest segment dari library
+                segments = self.video_model.get_segments(self.video_model.current_index)
                 self.player_model.load_tts_segments(segments)
+                if self._render_tts_track and video_data.tts_dir:
+                    track = os.path.join(video_data.tts_dir, TIMELINE_TRACK_NAME)
+                    if os.path.exists(track):
+                        self.player_model.load_tts_track(track)
             return True
         except Exception as e:
             print(f"Error preparing TTS: {str(e)}")
+            self._stream_video = None
+            self.video_model.set_tts_status(self.video_model.index_of(video_data), TTS_FAILED)
             return False
         finally:
             self._preparing_tts = False
 
+    async def _finish_tts_stream(self, tts_dir: str, video_data):
+        """Tandai TTS siap setelah streaming di background selesai"""
+        completed = await self.tts_model.wait_tts_stream()
+        # Index dicari ulang: playlist bisa berubah selama streaming
+        index = self.video_model.index_of(video_data)
+        if not completed:
+            # Stream yang dibatalkan karena pindah video sudah direset di prepare_tts
+            if self._stream_video is video_data:
+                self._stream_video = None
+                self.video_model.set_tts_status(index, TTS_FAILED)
+            return
+        if self._stream_video is video_data:
+            self._stream_video = None
+        if index < 0:
+            return
+        segments = self.tts_model.current_segments
+        self.video_model.set_tts_ready(index, tts_dir, segments)
+        await self._load_tts_track(video_data, segments, tts_dir)
+
+    def _reset_stream_status(self):
+        """Status video yang streaming-nya dibatalkan kembali ke belum siap"""
+        video = self._stream_video
+        self._stream_video = None
+        if video is not None and not video.is_tts_ready:
+            self.video_model.set_tts_status(self.video_model.index_of(video), TTS_NONE)
+
+    async def _load_tts_track(self, video_data, segments, tts_dir: str):
+        """Render track TTS tunggal (jika aktif) dan pakai untuk pemutaran"""
+        if not self._render_tts_track:
+            return
+        try:
+            track = await self.tts_model.render_timeline(segments, tts_dir)
+        except Exception as e:
+            print(f"Error rendering TTS track: {str(e)}")
+            return
+        if self.video_model.current_video is video_data:
+            self.player_model.load_tts_track(track)
+
+    def set_render_tts_track(self, enabled: bool):
+        """Aktifkan/nonaktifkan render track TTS tunggal setelah generate"""
+        self._render_tts_track = enabled
+
+    def set_streaming_tts(self, enabled: bool):
+        """Aktifkan/nonaktifkan mode streaming TTS"""
+        self._streaming_tts = enabled
+
     async def play_video(self, hwnd) -> bool:
         """Play video with TTS preparation"""
         video = self.video_model.current_video
@@ -77,26 +172,41 @@ class PlayerController(QObject):
         if not await self.prepare_tts(video):
             return False
 
-        # Load and play video
-        if self.player_model.load_video(video.video_path, hwnd):
+        # Load and play video, lanjut dari posisi terakhir
+        self.save_playback_position()
+        if self.player_model.load_video(video.video_path, hwnd, video.playback_position):
+            self._playing_video = video
             self.player_model.play()
+            self.pregen.start()
             return True
         return False
 
+    def save_playback_position(self):
+        """Simpan posisi playback video yang sedang dimuat ke library"""
+        video = self._playing_video
+        if video is None:
+            return
+        index = self.video_model.index_of(video)
+        if index >= 0:
+            self.video_model.set_playback_position(index, self.player_model.state.current_time)
+
     def toggle_playback(self):
         """Toggle play/pause"""
         if self.player_model.state.is_playing:
             self.player_model.pause()
+            self.save_playback_position()
         else:
             self.player_model.play()
 
     def stop_playback(self):
         """Stop playback"""
         self.player_model.stop()
+        self.save_playback_position()
 
     def seek_video(self, position: float):
         """Seek to position (0-1)"""
         self.player_model.seek(position)
+        self.tts_model.set_playback_position(self.player_model.state.current_time)
 
     def set_volume(self, volume: int):
         """Set volume (0-100)"""
@@ -141,59 +251,119 @@ class PlayerController(QObject):
         return self.video_model.to_dict()
 
     def _handle_play(self):
-        """Menangani klik tombol play dengan proses konversi"""
-        if not self.player_model.state.is_playing:
-            current_video = self.video_model.current_video
-            if current_video and os.path.exists(current_video.video_path):
-                srt_path = current_video.srt_path
-                if os.path.exists(srt_path):
-                    # Mulai proses konversi
-                    self.conversion_status.emit("Memulai konversi subtitle...")
-                    self.view.show_loading(True)
-                    
-                    # Generate TTS jika belum siap
-                    if not current_video.is_tts_ready:
-                        tts_dir = f"tts_output/video_{self.video_model.current_index}"
-                        self.tts_model.set_voice_type(current_video.voice_type)
-                        success = self.tts_model.convert_srt_to_audio(srt_path, tts_dir)
-                        
-                        if success:
-                            self.video_model.set_tts_ready(self.video_model.current_index, tts_dir)
-                            self.conversion_status.emit("Konversi selesai, memulai pemutaran...")
-                            self.player_model.play()
-                        else:
-                            self.conversion_status.emit("Gagal melakukan konversi")
-                            self.view.show_loading(False)
-                    else:
-                        # TTS sudah siap, langsung putar
-                        self.player_model.play()
-                else:
-                    # Jika tidak ada SRT, langsung putar video
-                    self.player_model.play()
-        else:
+        """Menangani klik tombol play; konversi TTS berjalan sebagai job background"""
+        if self.player_model.state.is_playing:
             self.player_model.pause()
-    
+            return
+        if self._conversion_job is not None:
+            # Klik play saat konversi berjalan membatalkan konversi
+            self.cancel_conversion()
+            return
+        current_video = self.video_model.current_video
+        if not current_video or not os.path.exists(current_video.video_path):
+            return
+        if os.path.exists(current_video.srt_path) and not current_video.is_tts_ready:
+            self.start_conversion(current_video).on_done(
+                partial(self._play_after_conversion, current_video))
+        else:
+            # TTS sudah siap atau tidak ada SRT, langsung putar
+            self.player_model.play()
+
+    def start_conversion(self, video, merge: bool = False) -> Job:
+        """Jalankan konversi SRT -> audio (dan merge video jika ``merge``) di background
+
+        Progress, hasil dan error dikirim ke thread UI lewat job handle;
+        UI tetap responsif selama terjemahan dan sintesis berjalan.
+        """
+        self.cancel_conversion()
+        index = self.video_model.index_of(video)
+        tts_dir = self.video_model.default_tts_dir(index)
+        self.tts_model.set_voice_type(video.voice_type)
+        self.video_model.set_tts_status(index, TTS_GENERATING)
+        self.conversion_status.emit("Memulai konversi subtitle...")
+        if self.view:
+            self.view.update_progress(0)
+            self.view.show_loading(True)
+
+        job = self.jobs.submit("convert", self._convert_job, video, tts_dir, merge)
+        job.on_progress(partial(self._on_job_progress, video))
+        job.on_done(partial(self._on_job_done, video, tts_dir))
+        self._conversion_job = job
+        return job
+
+    def cancel_conversion(self) -> bool:
+        """Batalkan job konversi yang sedang berjalan"""
+        job = self._conversion_job
+        if job is None or job.done:
+            return False
+        job.cancel()
+        self.conversion_status.emit("Membatalkan konversi...")
+        return True
+
+    def _convert_job(self, job: Job, video, tts_dir: str, merge: bool):
+        """Isi job konversi (thread worker): tidak boleh menyentuh widget"""
+        segments = self.tts_model.synthesize_offline(
+            video.srt_path, tts_dir,
+            on_progress=lambda value: job.report_progress(value * 0.9 if merge else value),
+            should_stop=lambda: job.cancelled
+        )
+        output_path = None
+        if merge:
+            from ..models.audio_render import render_timeline
+
+            job.check_cancelled()
+            track = render_timeline(segments, os.path.join(tts_dir, TIMELINE_TRACK_NAME))
+            job.report_progress(95)
+            job.check_cancelled()
+            output_path = os.path.splitext(video.video_path)[0] + '_with_tts.mp4'
+            if not self.tts_model.merge_video_and_audio(video.video_path, track, output_path):
+                raise RuntimeError("Gagal menggabungkan video dan audio")
+            job.report_progress(100)
+        return segments, output_path
+
+    def _on_job_progress(self, video, job: Job, value: int):
+        index = self.video_model.index_of(video)
+        self.video_model.set_tts_status(index, TTS_GENERATING, value)
+        if self.view:
+            self.view.update_progress(value)
+
+    def _on_job_done(self, video, tts_dir: str, job: Job):
+        """Terima hasil job konversi di thread UI"""
+        if self._conversion_job is job:
+            self._conversion_job = None
+        if self.view:
+            self.view.show_loading(False)
+        index = self.video_model.index_of(video)
+        if job.status == JOB_DONE:
+            segments, output_path = job.result
+            self.video_model.set_tts_ready(index, tts_dir, segments)
+            if output_path:
+                # Video hasil merge masuk playlist sebagai entri baru
+                self.video_model.add_video(output_path, video.srt_path, video.voice_type)
+                self.conversion_status.emit("Konversi video berhasil!")
+            else:
+                self.conversion_status.emit("Konversi selesai, memulai pemutaran...")
+        elif job.status == JOB_CANCELLED:
+            self.video_model.set_tts_status(index, TTS_NONE)
+            self.conversion_status.emit("Konversi dibatalkan")
+        else:
+            print(f"Error dalam konversi: {str(job.error)}")
+            self.video_model.set_tts_status(index, TTS_FAILED)
+            self.conversion_status.emit("Gagal melakukan konversi")
+
+    def _play_after_conversion(self, video, job: Job):
+        """Putar video setelah konversi dari tombol play, jika masih video aktif"""
+        if job.status == JOB_DONE and self.video_model.current_video is video and self.view:
+            asyncio.ensure_future(self.play_video(self.view.video_frame.winId()))
+
     def _handle_conversion(self):
-        """Menangani proses konversi video dengan TTS"""
-        current_video = self.player_model.get_current_video()
-        if current_video and os.path.exists(current_video):
-            srt_path = current_video.replace('.mp4', '.srt')
-            if os.path.exists(srt_path):
-                # Generate audio TTS
-                audio_path = current_video.replace('.mp4', '_tts.mp3')
-                success = self.tts_model.convert_srt_to_audio(srt_path, audio_path)
-                
-                if success:
-                    # Merge video dengan audio baru
-                    output_path = current_video.replace('.mp4', '_with_tts.mp4')
-                    if self.tts_model.merge_video_and_audio(current_video, audio_path, output_path):
-                        self.conversion_status.emit("Konversi video berhasil!")
-                        # Update playlist dengan video yang baru
-                        self.player_model.update_current_video(output_path)
-                    else:
-                        self.conversion_status.emit("Gagal menggabungkan video dan audio")
-                else:
-                    self.conversion_status.emit("Gagal mengkonversi subtitle ke audio")
+        """Menangani proses konversi video dengan TTS (berjalan di background)"""
+        current_video = self.video_model.current_video
+        if current_video and os.path.exists(current_video.video_path):
+            if os.path.exists(current_video.srt_path):
+                return self.start_conversion(current_video, merge=True)
+            self.conversion_status.emit("File subtitle tidak ditemukan")
+        return None
     
     def _update_source_language(self, index):
         """Update bahasa sumber"""
@@ -0,0 +1,214 @@
+import asyncio
+import os
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from ..models.video_model import (VideoModel, VideoData, TTS_NONE, TTS_QUEUED,
+                                  TTS_GENERATING, TTS_FAILED)
+from ..models.tts_model import TTSModel
+
+DEFAULT_LOOKAHEAD = 2      # Jumlah video berikutnya yang disiapkan
+DEFAULT_MAX_WORKERS = 2    # Request TTS (dan fitting) background yang berjalan bersamaan
+
+def _contains(videos: List[VideoData], video: VideoData) -> bool:
+    return any(item is video for item in videos)
+
+class PregenScheduler:
+    """Generate TTS di background untuk video berikutnya di playlist
+
+    Video aktif selalu didahulukan: selama TTSModel sedang generate untuk
+    video aktif, worker background berhenti sebelum segment berikutnya.
+    Job untuk video yang tidak lagi termasuk N video berikutnya (misalnya
+    user lompat ke video lain) dihentikan: segment yang sedang dikerjakan
+    diselesaikan dulu, lalu job berhenti (lihat ``wait_stopped``).
+    """
+
+    def __init__(self, video_model: VideoModel, tts_model: TTSModel,
+                 lookahead: int = DEFAULT_LOOKAHEAD, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.video_model = video_model
+        self.tts_model = tts_model
+        self.lookahead = lookahead
+        self.max_workers = max_workers
+        self._enabled = True
+        self._started = False  # Baru aktif setelah video pertama diputar
+        self._runner: Optional[asyncio.Task] = None
+        self._active: Optional[VideoData] = None   # Video yang sedang digenerate
+        self._pending: List[VideoData] = []        # Antrian sesuai prioritas
+        # Job pregenerate_tts yang berjalan (video, future, event stop)
+        self._job: Optional[Tuple[VideoData, asyncio.Future, asyncio.Event]] = None
+        # Job yang sudah diminta berhenti tapi masih menyelesaikan segment terakhir
+        self._stopping: List[Tuple[VideoData, asyncio.Future]] = []
+        self._foreground_idle = asyncio.Event()
+        self._foreground_idle.set()
+        video_model.add_observer(self)
+        tts_model.add_observer(self)
+
+    def start(self):
+        """Mulai pre-generation (dipanggil saat video aktif mulai diputar)"""
+        self._started = True
+        self.schedule()
+
+    def set_enabled(self, enabled: bool):
+        self._enabled = enabled
+        if enabled:
+            self.schedule()
+        else:
+            self.cancel()
+
+    def set_lookahead(self, lookahead: int):
+        self.lookahead = max(0, int(lookahead))
+        self.schedule()
+
+    def set_max_workers(self, max_workers: int):
+        """Budget background: jumlah segment yang disintesis/di-fit bersamaan"""
+        self.max_workers = max(1, int(max_workers))
+
+    def targets(self) -> List[VideoData]:
+        """N video setelah video aktif yang TTS-nya belum siap"""
+        model = self.video_model
+        start = model.current_index + 1
+        result = []
+        for video in model.videos[start:start + self.lookahead]:
+            if not video.is_tts_ready and os.path.exists(video.srt_path):
+                result.append(video)
+        return result
+
+    def schedule(self):
+        """Hitung ulang antrian; batalkan job yang tidak lagi dibutuhkan"""
+        if not (self._enabled and self._started):
+            return
+        targets = self.targets()
+        for video in self._pending:
+            if not _contains(targets, video):
+                self._set_status(video, TTS_NONE)
+        if self._active is not None and not _contains(targets, self._active):
+            self._cancel_runner()
+        self._pending = [v for v in targets if v is not self._active]
+        for video in self._pending:
+            self._set_status(video, TTS_QUEUED)
+        if self._pending and (self._runner is None or self._runner.done()):
+            self._runner = asyncio.ensure_future(self._run())
+
+    def cancel(self):
+        """Batalkan semua pre-generation"""
+        for video in self._pending:
+            self._set_status(video, TTS_NONE)
+        self._pending = []
+        self._cancel_runner()
+
+    async def wait_stopped(self, video: VideoData):
+        """Hentikan job background untuk ``video`` dan tunggu sampai benar-benar selesai
+
+        Dipanggil sebelum generate foreground untuk video yang sama, supaya
+        verifikasi checkpoint (yang menghapus file ``.part``) tidak bersamaan
+        dengan tulisan job background di direktori output yang sama.
+        """
+        if self._active is video:
+            self._cancel_runner()
+        for item, job in list(self._stopping):
+            if item is video:
+                await asyncio.wait([job])
+
+    def _cancel_runner(self):
+        if self._job is not None:
+            video, job, stop = self._job
+            self._job = None
+            stop.set()
+            if not job.done():
+                self._stopping.append((video, job))
+                job.add_done_callback(self._job_stopped)
+        if self._active is not None:
+            self._set_status(self._active, TTS_NONE)
+            self._active = None
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+        self._runner = None
+
+    def _job_stopped(self, job: asyncio.Future):
+        self._stopping = [(video, item) for video, item in self._stopping if item is not job]
+        if not job.cancelled():
+            job.exception()  # Hasil job yang dihentikan tidak dipakai
+
+    async def _wait_turn(self, stop: asyncio.Event):
+        """Tunggu video aktif selesai digenerate, atau sampai job diminta berhenti"""
+        if self._foreground_idle.is_set() or stop.is_set():
+            return
+        waiters = [asyncio.ensure_future(self._foreground_idle.wait()),
+                   asyncio.ensure_future(stop.wait())]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _run(self):
+        while self._pending:
+            video = self._pending.pop(0)
+            self._active = video
+            try:
+                await self._generate(video)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error pre-generating TTS for {video.video_path}: {str(e)}")
+                self._set_status(video, TTS_FAILED)
+            finally:
+                if self._active is video:
+                    self._active = None
+
+    async def _generate(self, video: VideoData):
+        index = self.video_model.index_of(video)
+        if index < 0:
+            return
+        tts_dir = self.video_model.default_tts_dir(index)
+        self._set_status(video, TTS_GENERATING)
+
+        last_percent = 0
+        stop = asyncio.Event()
+
+        def on_progress(done: int, total: int):
+            nonlocal last_percent
+            percent = int(done / total * 100)
+            # Segment terakhir job yang dihentikan tidak mengubah status lagi
+            if percent != last_percent and not stop.is_set():
+                last_percent = percent
+                self._set_status(video, TTS_GENERATING, percent)
+
+        job = asyncio.ensure_future(self.tts_model.pregenerate_tts(
+            video.srt_path, tts_dir, video.voice_type, self.max_workers,
+            before_segment=partial(self._wait_turn, stop), on_progress=on_progress,
+            should_stop=stop.is_set
+        ))
+        self._job = (video, job, stop)
+        try:
+            # Runner yang dibatalkan tidak ikut membatalkan job: job dihentikan
+            # lewat ``stop`` supaya segment yang sedang ditulis selesai dulu
+            segments = await asyncio.shield(job)
+        finally:
+            if self._job is not None and self._job[1] is job:
+                self._job = None
+        index = self.video_model.index_of(video)
+        if index >= 0:
+            self.video_model.set_tts_ready(index, tts_dir, segments)
+
+    def _set_status(self, video: VideoData, status: str, progress: int = 0):
+        index = self.video_model.index_of(video)
+        if index >= 0:
+            self.video_model.set_tts_status(index, status, progress)
+
+    def on_model_updated(self, event_type: str = "update", data=None):
+        """Observer VideoModel: antrian mengikuti posisi video aktif"""
+        if event_type in ("current_changed", "inserted", "removed", "reset"):
+            self.schedule()
+
+    def on_tts_update(self, event_type: str, data=None):
+        """Observer TTSModel: tahan background selama video aktif digenerate"""
+        if event_type == "generation_started":
+            self._foreground_idle.clear()
+        elif event_type in ("generation_complete", "generation_error", "generation_cancelled"):
+            self._foreground_idle.set()
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "active": int(self._active is not None),
+        }
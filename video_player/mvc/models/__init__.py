@@ -1,5 +1,16 @@
-from .video_model import VideoModel
-from .tts_model import TTSModel
-from .player_model import PlayerModel
+import importlib
+
+# Model diimport saat pertama kali diakses, supaya import satu modul
+# (misalnya mvc.models.video_model) tidak ikut memuat backend berat
+_MODELS = {
+    'VideoModel': '.video_model',
+    'TTSModel': '.tts_model',
+    'PlayerModel': '.player_model',
+}
 
 __all__ = ['VideoModel', 'TTSModel', 'PlayerModel']
+
+def __getattr__(name):
+    if name in _MODELS:
+        return getattr(importlib.import_module(_MODELS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,124 @@
+import io
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+from .audio_render import load_segment_audio, SAMPLE_RATE, SAMPLE_WIDTH, CHANNELS
+
+FRAME_MS = 40          # Panjang frame OLA
+MAX_SPEEDUP = 1.6      # Kompresi maksimal sebelum suara terdengar tidak natural
+TOLERANCE_MS = 50      # Overrun sekecil ini dibiarkan
+
+def audio_to_array(audio: AudioSegment) -> np.ndarray:
+    """PCM 16-bit mono -> float32 (-1..1)"""
+    return np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+
+def array_to_audio(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> AudioSegment:
+    """float32 (-1..1) -> AudioSegment PCM 16-bit mono"""
+    pcm = np.clip(samples * 32768.0, -32768, 32767).astype(np.int16)
+    return AudioSegment(pcm.tobytes(), frame_rate=sample_rate,
+                        sample_width=SAMPLE_WIDTH, channels=CHANNELS)
+
+def time_stretch(samples: np.ndarray, factor: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Time-stretch tanpa mengubah pitch (overlap-add, Hann 50%)
+
+    ``factor`` adalah rasio panjang output / input, < 1 berarti dipercepat.
+    Semua frame diambil dan dijumlahkan sekaligus dengan operasi array.
+    """
+    frame = int(sample_rate * FRAME_MS / 1000) // 2 * 2
+    hop_out = frame // 2
+    hop_in = hop_out / factor
+    if len(samples) < frame or factor == 1.0:
+        return samples.copy()
+
+    count = int((len(samples) - frame) // hop_in) + 1
+    starts = np.round(np.arange(count) * hop_in).astype(np.int64)
+    window = np.hanning(frame + 1)[:frame].astype(np.float32)  # Hann periodik
+    frames = samples[starts[:, None] + np.arange(frame)[None, :]] * window
+
+    # Dengan hop = frame/2, paruh pertama dan kedua tiap frame bisa dijumlah via reshape
+    output = np.zeros((count + 1) * hop_out, dtype=np.float32)
+    output[:count * hop_out].reshape(count, hop_out)[:] += frames[:, :hop_out]
+    output[hop_out:].reshape(count, hop_out)[:] += frames[:, hop_out:]
+    return output[:int(round(len(samples) * factor))]
+
+def _stretch_to_window(audio: AudioSegment, window_ms: int, max_speedup: float,
+                       tolerance_ms: int) -> Optional[AudioSegment]:
+    """Audio yang sudah dikompres, None jika audio sudah muat di window"""
+    before = len(audio)
+    if window_ms <= 0 or before <= window_ms + tolerance_ms:
+        return None
+    factor = max(window_ms / before, 1.0 / max_speedup)
+    return array_to_audio(time_stretch(audio_to_array(audio), factor))
+
+def fit_segment(file_path: str, window_ms: int, max_speedup: float = MAX_SPEEDUP,
+                tolerance_ms: int = TOLERANCE_MS) -> Tuple[int, int]:
+    """Kompres segment yang melebihi durasi cue, tanpa sintesis ulang
+
+    Mengembalikan (durasi sebelum, durasi sesudah) dalam ms. File ditulis
+    ulang secara atomik (file baru lalu rename), jadi hard link ke cache
+    TTS tidak ikut berubah.
+    """
+    audio = load_segment_audio(file_path)
+    before = len(audio)
+    stretched = _stretch_to_window(audio, window_ms, max_speedup, tolerance_ms)
+    if stretched is None:
+        return before, before
+
+    audio_format = os.path.splitext(file_path)[1].lstrip(".") or "mp3"
+    temp_file = f"{file_path}.fit.part"
+    stretched.export(temp_file, format=audio_format)
+    os.replace(temp_file, file_path)
+    return before, len(stretched)
+
+def fit_segment_data(data: bytes, window_ms: int, audio_format: str = "mp3",
+                     max_speedup: float = MAX_SPEEDUP,
+                     tolerance_ms: int = TOLERANCE_MS) -> Tuple[bytes, int, int]:
+    """Seperti fit_segment untuk audio di memori (segment yang ditulis ke pack)
+
+    Mengembalikan (data, durasi sebelum, durasi sesudah); data dikembalikan
+    apa adanya jika tidak perlu dikompres.
+    """
+    audio = load_segment_audio(io.BytesIO(data))
+    before = len(audio)
+    stretched = _stretch_to_window(audio, window_ms, max_speedup, tolerance_ms)
+    if stretched is None:
+        return data, before, before
+    output = io.BytesIO()
+    stretched.export(output, format=audio_format)
+    return output.getvalue(), before, len(stretched)
+
+@dataclass
+class FitReport:
+    """Statistik overrun per cue sebelum dan sesudah fitting"""
+    cues: int = 0
+    stretched: int = 0
+    overruns_before: List[int] = field(default_factory=list)
+    overruns_after: List[int] = field(default_factory=list)
+
+    def add(self, window_ms: int, before_ms: int, after_ms: int):
+        self.cues += 1
+        if after_ms != before_ms:
+            self.stretched += 1
+        self.overruns_before.append(max(before_ms - window_ms, 0))
+        self.overruns_after.append(max(after_ms - window_ms, 0))
+
+    def summary(self) -> Dict[str, float]:
+        result = {"cues": self.cues, "stretched": self.stretched}
+        for name, values in (("before", self.overruns_before), ("after", self.overruns_after)):
+            overrun = [v for v in values if v > TOLERANCE_MS]
+            result[f"overrun_cues_{name}"] = len(overrun)
+            result[f"overrun_total_ms_{name}"] = sum(values)
+            result[f"overrun_max_ms_{name}"] = max(values) if values else 0
+            result[f"overrun_mean_ms_{name}"] = sum(overrun) / len(overrun) if overrun else 0.0
+        return result
+
+    def format(self) -> str:
+        s = self.summary()
+        return (f"Fitting {s['cues']} cue ({s['stretched']} dikompres): "
+                f"overrun {s['overrun_cues_before']} -> {s['overrun_cues_after']} cue, "
+                f"total {s['overrun_total_ms_before']} -> {s['overrun_total_ms_after']} ms, "
+                f"max {s['overrun_max_ms_before']} -> {s['overrun_max_ms_after']} ms")
@@ -0,0 +1,98 @@
+"""Post-processing segment TTS: buang hening di awal/akhir dan normalisasi loudness
+
+Analisis dilakukan per frame 10 ms dengan operasi array NumPy (tanpa loop
+per sampel). Decode/encode dan analisis berjalan di pool proses, hasilnya
+disimpan di cache TTS dengan key turunan sehingga tidak pernah diulang.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+ANALYSIS_FRAME_MS = 10
+SILENCE_THRESHOLD_DB = -45.0   # Frame di bawah level ini dianggap hening (dBFS RMS)
+KEEP_SILENCE_MS = 50           # Hening yang disisakan agar awal/akhir kata tidak terpotong
+TARGET_LOUDNESS_DB = -20.0     # Level rata-rata bagian bersuara setelah normalisasi
+MAX_GAIN_DB = 15.0
+PEAK_CEILING_DB = -1.0
+# Bagian dari key cache; ubah jika parameter di atas berubah
+POST_PROCESS_TAG = "post:v1:trim-45:keep50:rms-20"
+
+def frame_levels_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    """Level RMS (dBFS) setiap frame, frame terakhir di-pad nol"""
+    padded = np.pad(samples, (0, -len(samples) % frame))
+    power = np.mean(np.square(padded.reshape(-1, frame), dtype=np.float64), axis=1)
+    return 10 * np.log10(np.maximum(power, 1e-12))
+
+def process_samples(samples: np.ndarray, sample_rate: int,
+                    threshold_db: float = SILENCE_THRESHOLD_DB,
+                    keep_ms: int = KEEP_SILENCE_MS,
+                    target_db: float = TARGET_LOUDNESS_DB) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Trim hening + normalisasi gain untuk PCM float32 mono (-1..1)
+
+    Loudness diukur hanya dari frame bersuara (gated), jadi panjang jeda
+    tidak mempengaruhi gain. Gain dibatasi supaya puncak tidak melewati
+    ``PEAK_CEILING_DB``. Segment yang seluruhnya hening dikembalikan apa adanya.
+    """
+    frame = max(int(sample_rate * ANALYSIS_FRAME_MS / 1000), 1)
+    levels = frame_levels_db(samples, frame)
+    voiced = np.flatnonzero(levels > threshold_db)
+    if len(samples) == 0 or len(voiced) == 0:
+        return samples, {"trimmed_ms": 0.0, "gain_db": 0.0}
+
+    keep = int(sample_rate * keep_ms / 1000)
+    start = max(int(voiced[0]) * frame - keep, 0)
+    end = min((int(voiced[-1]) + 1) * frame + keep, len(samples))
+    trimmed = samples[start:end]
+
+    loudness_db = 10 * np.log10(np.mean(np.power(10.0, levels[voiced] / 10)))
+    gain_db = float(np.clip(target_db - loudness_db, -MAX_GAIN_DB, MAX_GAIN_DB))
+    peak = float(np.max(np.abs(trimmed)))
+    if peak > 0:
+        gain_db = min(gain_db, PEAK_CEILING_DB - 20 * np.log10(peak))
+    output = trimmed * np.float32(10 ** (gain_db / 20))
+    return output, {"trimmed_ms": (len(samples) - len(trimmed)) * 1000 / sample_rate,
+                    "gain_db": gain_db}
+
+def post_process_file(source: str, output_file: str, audio_format: str = "mp3") -> Dict[str, float]:
+    """Decode, proses dan encode satu segment (dijalankan di proses worker)"""
+    from .audio_fit import audio_to_array, array_to_audio
+    from .audio_render import load_segment_audio, SAMPLE_RATE
+
+    samples, info = process_samples(audio_to_array(load_segment_audio(source)), SAMPLE_RATE)
+    temp_file = f"{output_file}.{os.getpid()}.part"
+    array_to_audio(samples).export(temp_file, format=audio_format)
+    os.replace(temp_file, output_file)
+    return info
+
+class PostProcessor:
+    """Pool proses untuk post_process_file, dibuat saat pertama kali dipakai"""
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: proses worker tidak mewarisi state Qt/VLC dari proses utama
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def process(self, source: str, output_file: str,
+                      audio_format: str = "mp3") -> Dict[str, float]:
+        """Proses satu segment di pool tanpa memblokir event loop"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor(), post_process_file, source, output_file, audio_format
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
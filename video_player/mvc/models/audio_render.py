@@ -0,0 +1,117 @@
+import io
+import os
+import subprocess
+from typing import Iterable
+
+from pydub import AudioSegment
+from pydub.utils import get_encoder_name
+
+from .segment_store import read_segment, segment_exists
+
+SAMPLE_RATE = 24000  # Sama dengan output default Edge TTS
+CHANNELS = 1
+SAMPLE_WIDTH = 2     # 16-bit PCM
+SILENCE_CHUNK_MS = 1000
+
+class PCMStreamWriter:
+    """Menulis PCM mentah ke ffmpeg yang meng-encode langsung ke file output"""
+
+    def __init__(self, output_file: str, sample_rate: int = SAMPLE_RATE,
+                 bitrate: str = "64k"):
+        self.output_file = output_file
+        self.sample_rate = sample_rate
+        self.frames_written = 0
+        self._temp_file = f"{output_file}.part"
+        audio_format = os.path.splitext(output_file)[1].lstrip(".") or "mp3"
+        self._process = subprocess.Popen(
+            [get_encoder_name(), "-y", "-loglevel", "error",
+             "-f", "s16le", "-ar", str(sample_rate), "-ac", str(CHANNELS), "-i", "pipe:0",
+             "-b:a", bitrate, "-f", audio_format, self._temp_file],
+            stdin=subprocess.PIPE
+        )
+        self._silence = b"\0" * (sample_rate * SAMPLE_WIDTH * CHANNELS * SILENCE_CHUNK_MS // 1000)
+
+    def write(self, audio: AudioSegment):
+        """Menulis potongan audio (sudah dalam format target)"""
+        self._process.stdin.write(audio.raw_data)
+        self.frames_written += int(audio.frame_count())
+
+    def write_silence_until(self, frame: int):
+        """Mengisi hening sampai posisi frame tertentu"""
+        remaining = (frame - self.frames_written) * SAMPLE_WIDTH * CHANNELS
+        while remaining > 0:
+            chunk = self._silence[:remaining]
+            self._process.stdin.write(chunk)
+            remaining -= len(chunk)
+        self.frames_written = max(self.frames_written, frame)
+
+    def close(self):
+        """Selesaikan encoding dan pindahkan file ke lokasi akhir"""
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg gagal membuat {self.output_file}")
+        os.replace(self._temp_file, self.output_file)
+
+    def abort(self):
+        self._process.kill()
+        self._process.wait()
+        if os.path.exists(self._temp_file):
+            os.remove(self._temp_file)
+
+def load_segment_audio(source, sample_rate: int = SAMPLE_RATE) -> AudioSegment:
+    """Decode satu segment (path file/segment di pack, atau file-like) ke PCM mono 16-bit"""
+    if isinstance(source, str):
+        data = read_segment(source)
+        if data is not None:
+            source = io.BytesIO(data)
+    audio = AudioSegment.from_file(source)
+    return (audio.set_frame_rate(sample_rate)
+                 .set_channels(CHANNELS)
+                 .set_sample_width(SAMPLE_WIDTH))
+
+def render_timeline(segments: Iterable, output_file: str,
+                    sample_rate: int = SAMPLE_RATE, bitrate: str = "64k") -> str:
+    """Mix semua segment menjadi satu track, tiap segment di start_time-nya
+
+    Segment di-decode satu per satu dan langsung di-stream ke encoder, jadi
+    memori yang dipakai hanya sebesar segment (plus bagian yang overlap).
+    """
+    def to_frame(ms: int) -> int:
+        return ms * sample_rate // 1000
+
+    writer = PCMStreamWriter(output_file, sample_rate, bitrate)
+    try:
+        tail = None        # Audio yang belum ditulis, mulai di writer.frames_written
+        for segment in sorted(segments, key=lambda s: s.start_time):
+            if not getattr(segment, "ready", True) or not segment_exists(segment.file_path):
+                continue
+            audio = load_segment_audio(segment.file_path, sample_rate)
+            start = to_frame(segment.start_time)
+            tail_end = writer.frames_written + (int(tail.frame_count()) if tail else 0)
+
+            if tail is not None and start < tail_end:
+                # Segment overlap dengan segment sebelumnya, mix ke bagian tail
+                offset_ms = max(start - writer.frames_written, 0) * 1000 // sample_rate
+                if offset_ms > 0:
+                    # Bagian tail sebelum segment ini sudah final: tulis lalu lepas,
+                    # jadi cue overlap berantai tidak membuat tail terus membesar
+                    writer.write(tail[:offset_ms])
+                    tail = tail[offset_ms:]
+                    offset_ms = 0
+                needed_ms = offset_ms + len(audio)
+                if needed_ms > len(tail):
+                    tail += AudioSegment.silent(needed_ms - len(tail), frame_rate=sample_rate)
+                tail = tail.overlay(audio, position=offset_ms)
+            else:
+                if tail is not None:
+                    writer.write(tail)
+                writer.write_silence_until(start)
+                tail = audio
+
+        if tail is not None:
+            writer.write(tail)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    return output_file
@@ -0,0 +1,180 @@
+"""Menggabungkan cue pendek yang berdekatan menjadi satu request TTS
+
+Subtitle kursus sering memecah satu kalimat menjadi 3-5 cue kecil. Dalam
+mode coalesce cue-cue itu disintesis sebagai satu teks (prosodi utuh, satu
+request), lalu audionya dipotong kembali per cue memakai event WordBoundary
+dari Edge TTS. Setiap potongan tetap diputar di ``start_time`` cue aslinya,
+jadi sinkronisasi playback tidak berubah.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+COALESCE_MAX_CHARS = 60     # Cue lebih panjang dari ini disintesis sendiri
+COALESCE_MAX_GAP_MS = 500   # Jeda maksimal antar cue dalam satu grup
+COALESCE_MAX_CUES = 5
+COALESCE_MAX_GROUP_CHARS = 250
+SENTENCE_END = re.compile(r"[.!?…][\"')\]]*$")
+GROUP_SEPARATOR = " "
+TICKS_PER_MS = 10000        # Offset/durasi WordBoundary dalam satuan 100 ns
+
+@dataclass
+class WordBoundary:
+    offset: float    # milliseconds dari awal audio
+    duration: float  # milliseconds
+    text: str
+
+def plan_groups(segments: Sequence) -> List[List[int]]:
+    """Index cue yang digabung per grup (hanya grup berisi >= 2 cue)
+
+    Cue digabung selama semuanya pendek, jedanya kecil, dan cue sebelumnya
+    belum mengakhiri kalimat.
+    """
+    groups, current, chars = [], [], 0
+    for i, segment in enumerate(segments):
+        text = segment.text.strip()
+        short = 0 < len(text) <= COALESCE_MAX_CHARS
+        if current:
+            previous = segments[current[-1]]
+            gap = segment.start_time - previous.end_time
+            if (short and -COALESCE_MAX_GAP_MS <= gap <= COALESCE_MAX_GAP_MS
+                    and len(current) < COALESCE_MAX_CUES
+                    and chars + len(text) + 1 <= COALESCE_MAX_GROUP_CHARS
+                    and not SENTENCE_END.search(previous.text.strip())):
+                current.append(i)
+                chars += len(text) + 1
+                continue
+            if len(current) > 1:
+                groups.append(current)
+            current = []
+        if short:
+            current, chars = [i], len(text)
+    if len(current) > 1:
+        groups.append(current)
+    return groups
+
+def join_texts(texts: Sequence[str]) -> str:
+    """Teks satu request untuk sebuah grup"""
+    return GROUP_SEPARATOR.join(text.strip() for text in texts)
+
+def cut_times(texts: Sequence[str], words: Sequence[WordBoundary]) -> Optional[List[float]]:
+    """Titik potong (ms) audio grup di antara cue yang berurutan
+
+    Setiap kata dipetakan ke cue lewat posisinya di teks gabungan. Titik
+    potong berada di tengah jeda antara kata terakhir cue sebelumnya dan kata
+    pertama cue berikutnya. None jika ada cue tanpa kata (fallback per cue).
+    """
+    texts = [text.strip() for text in texts]
+    joined = join_texts(texts)
+    starts, position = [], 0
+    for text in texts:
+        starts.append(position)
+        position += len(text) + len(GROUP_SEPARATOR)
+
+    first: List[Optional[WordBoundary]] = [None] * len(texts)
+    last: List[Optional[WordBoundary]] = [None] * len(texts)
+    cursor = 0
+    for word in words:
+        found = joined.find(word.text, cursor) if word.text else -1
+        if found < 0:
+            continue  # Teks dinormalisasi backend, kata ini dilewati saja
+        cursor = found + len(word.text)
+        cue = bisect_right(starts, found) - 1
+        if first[cue] is None:
+            first[cue] = word
+        last[cue] = word
+    if any(word is None for word in first):
+        return None
+
+    cuts = []
+    for k in range(1, len(texts)):
+        end = last[k - 1].offset + last[k - 1].duration
+        cut = (end + first[k].offset) / 2
+        if cuts and cut <= cuts[-1]:
+            return None
+        cuts.append(cut)
+    return cuts
+
+async def synthesize_with_boundaries(text: str, voice: str,
+                                     rate: str) -> Tuple[bytes, List[WordBoundary]]:
+    """Sintesis lewat Edge TTS sambil mengumpulkan event WordBoundary"""
+    import edge_tts
+
+    try:
+        communicate = edge_tts.Communicate(text, voice, rate=rate, boundary="WordBoundary")
+    except TypeError:
+        # edge-tts < 7 tidak punya parameter boundary dan selalu mengirim WordBoundary
+        communicate = edge_tts.Communicate(text, voice, rate=rate)
+
+    audio, words = bytearray(), []
+    async for message in communicate.stream():
+        if message["type"] == "audio":
+            audio.extend(message["data"])
+        elif message["type"] == "WordBoundary":
+            words.append(WordBoundary(message["offset"] / TICKS_PER_MS,
+                                      message["duration"] / TICKS_PER_MS,
+                                      message["text"]))
+    return bytes(audio), words
+
+# --- pemotongan MP3 per frame -------------------------------------------------
+
+_MP3_BITRATES = {  # kbps Layer III, per versi MPEG (1 atau 2/2.5)
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def _frame_info(data: bytes, offset: int) -> Optional[Tuple[int, float]]:
+    """(ukuran byte, durasi ms) frame MP3 Layer III di ``offset``, None jika bukan frame"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x3
+    layer = (data[offset + 1] >> 1) & 0x3
+    bitrate_index = data[offset + 2] >> 4
+    rate_index = (data[offset + 2] >> 2) & 0x3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    padding = (data[offset + 2] >> 1) & 0x1
+    size = samples // 8 * bitrate // sample_rate + padding
+    return size, samples * 1000 / sample_rate
+
+def mp3_frames(data: bytes) -> Optional[List[Tuple[int, int, float]]]:
+    """Daftar (offset, ukuran, durasi ms) semua frame, None jika bukan MP3 CBR/VBR biasa"""
+    offset = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        offset = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    frames = []
+    while offset < len(data):
+        info = _frame_info(data, offset)
+        if info is None:
+            if frames and (data[offset:offset + 3] == b"TAG" or len(data) - offset < 4):
+                break  # Tag ID3v1 / sisa byte di akhir file
+            return None
+        size, duration = info
+        frames.append((offset, size, duration))
+        offset += size
+    return frames or None
+
+def split_mp3(data: bytes, cuts_ms: Sequence[float]) -> Optional[List[bytes]]:
+    """Potong MP3 di batas frame terdekat dengan ``cuts_ms`` tanpa decode ulang
+
+    Mengembalikan ``len(cuts_ms) + 1`` potongan, None jika data tidak bisa
+    di-parse atau ada potongan yang kosong.
+    """
+    frames = mp3_frames(data)
+    if frames is None:
+        return None
+    pieces = [bytearray() for _ in range(len(cuts_ms) + 1)]
+    position = 0.0
+    for offset, size, duration in frames:
+        # Frame masuk ke cue tempat titik tengahnya berada
+        piece = bisect_right(cuts_ms, position + duration / 2)
+        pieces[piece].extend(data[offset:offset + size])
+        position += duration
+    if not all(pieces):
+        return None
+    return [bytes(piece) for piece in pieces]
@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+DEFAULT_DB_FILE = "library.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    video_path TEXT NOT NULL,
+    srt_path TEXT NOT NULL,
+    tts_dir TEXT,
+    voice_type TEXT NOT NULL DEFAULT 'pria',
+    is_tts_ready INTEGER NOT NULL DEFAULT 0,
+    playback_position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_videos_position ON videos(position);
+CREATE TABLE IF NOT EXISTS segments (
+    video_id INTEGER NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    rate TEXT NOT NULL,
+    PRIMARY KEY (video_id, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+VIDEO_COLUMNS = ("video_path", "srt_path", "tts_dir", "voice_type",
+                 "is_tts_ready", "playback_position")
+
+class LibraryStore:
+    """Penyimpanan library video di SQLite
+
+    Menggantikan playlist.json: setiap perubahan VideoModel langsung ditulis
+    per baris (incremental), manifest segment TTS dibaca saat dibutuhkan.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_FILE):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._ids: List[int] = []  # id baris sesuai urutan playlist
+        self._saved_segments = {}  # id video -> segments_version yang sudah disimpan
+        self._video_model = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Koneksi dibuka saat pertama kali dipakai"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def load(self) -> dict:
+        """Membaca library dalam format yang sama dengan VideoModel.to_dict()"""
+        rows = self.connection.execute(
+            f"SELECT id, {', '.join(VIDEO_COLUMNS)} FROM videos ORDER BY position"
+        ).fetchall()
+        self._ids = [row[0] for row in rows]
+        videos = []
+        for row in rows:
+            video = dict(zip(VIDEO_COLUMNS, row[1:]))
+            video['is_tts_ready'] = bool(video['is_tts_ready'])
+            videos.append(video)
+        current = self.get_meta('current_index')
+        return {'videos': videos, 'current_index': int(current) if current else -1}
+
+    def attach(self, video_model):
+        """Load library ke VideoModel lalu simpan setiap perubahan berikutnya"""
+        video_model.load_from_dict(self.load())
+        video_model.set_segment_loader(self.load_segments)
+        video_model.add_observer(self)
+        self._video_model = video_model
+
+    def import_playlist_json(self, json_path: str) -> bool:
+        """Import playlist.json lama satu kali (jika library masih kosong)"""
+        if self.get_meta('playlist_json_imported') or not os.path.exists(json_path):
+            return False
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        conn = self.connection
+        with conn:
+            conn.execute("BEGIN")
+            if not conn.execute("SELECT 1 FROM videos LIMIT 1").fetchone():
+                self._write_all(data.get('videos', []))
+                self.set_meta('current_index', data.get('current_index', -1))
+            self.set_meta('playlist_json_imported', json_path)
+        return True
+
+    def on_model_updated(self, event_type: str = "update", data=None):
+        """Observer VideoModel: tulis perubahan per baris"""
+        model = self._video_model
+        conn = self.connection
+        if event_type == "inserted":
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute("UPDATE videos SET position = position + 1 WHERE position >= ?", (data,))
+                self._ids.insert(data, self._insert(data, self._video_row(model.video_at(data))))
+        elif event_type == "removed":
+            video_id = self._ids.pop(data)
+            self._saved_segments.pop(video_id, None)
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM videos WHERE id = ?", (video_id,))
+                conn.execute("UPDATE videos SET position = position - 1 WHERE position > ?", (data,))
+        elif event_type == "updated":
+            video = model.video_at(data)
+            assignments = ", ".join(f"{column} = ?" for column in VIDEO_COLUMNS)
+            conn.execute(f"UPDATE videos SET {assignments} WHERE id = ?",
+                         self._video_row(video) + (self._ids[data],))
+            if video.segments is not None and video.is_tts_ready \
+                    and self._saved_segments.get(self._ids[data]) != video.segments_version:
+                self.save_segments(data, video.segments)
+                self._saved_segments[self._ids[data]] = video.segments_version
+        elif event_type == "playback_position":
+            self.set_playback_position(data, model.video_at(data).playback_position)
+        elif event_type == "current_changed":
+            self.set_meta('current_index', data[1])
+        elif event_type == "reset":
+            # Semua baris ditulis ulang dengan id baru; manifest segment lama
+            # dipindahkan ke baris baru dengan direktori TTS yang sama
+            self._saved_segments.clear()
+            with conn:
+                conn.execute("BEGIN")
+                manifests: Dict[str, list] = {}
+                for row in conn.execute(
+                        "SELECT v.tts_dir, s.idx, s.file_path, s.start_time, s.end_time, s.text, s.rate "
+                        "FROM segments s JOIN videos v ON v.id = s.video_id "
+                        "WHERE v.tts_dir IS NOT NULL ORDER BY s.video_id, s.idx"):
+                    manifests.setdefault(row[0], []).append(row[1:])
+                conn.execute("DELETE FROM videos")
+                self._write_all(model.to_dict()['videos'])
+                for video_id, video in zip(self._ids, model.videos):
+                    rows = manifests.pop(video.tts_dir, None) if video.is_tts_ready else None
+                    if rows:
+                        conn.executemany(
+                            "INSERT INTO segments (video_id, idx, file_path, start_time, end_time, text, rate) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(video_id,) + row for row in rows]
+                        )
+                self.set_meta('current_index', model.current_index)
+
+    def save_segments(self, index: int, segments):
+        """Simpan manifest segment TTS untuk video di posisi ``index``"""
+        video_id = self._ids[index]
+        conn = self.connection
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+            conn.executemany(
+                "INSERT INTO segments (video_id, idx, file_path, start_time, end_time, text, rate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(video_id, i, s.file_path, s.start_time, s.end_time, s.text, s.rate)
+                 for i, s in enumerate(segments)]
+            )
+
+    def load_segments(self, index: int) -> Optional[list]:
+        """Baca manifest segment TTS untuk video di posisi ``index``"""
+        from .tts_model import TTSSegment
+
+        if not 0 <= index < len(self._ids):
+            return None
+        rows = self.connection.execute(
+            "SELECT file_path, start_time, end_time, text, rate FROM segments "
+            "WHERE video_id = ? ORDER BY idx", (self._ids[index],)
+        ).fetchall()
+        if not rows:
+            return None
+        segments = [TTSSegment(*row) for row in rows]
+        video = self._video_model.video_at(index) if self._video_model is not None else None
+        if video is not None:
+            # Manifest yang dibaca sama dengan isi database, tidak perlu ditulis ulang
+            self._saved_segments[self._ids[index]] = video.segments_version
+        return segments
+
+    def set_playback_position(self, index: int, position: int):
+        self.connection.execute("UPDATE videos SET playback_position = ? WHERE id = ?",
+                                (position, self._ids[index]))
+
+    def _video_row(self, video) -> tuple:
+        return (video.video_path, video.srt_path, video.tts_dir, video.voice_type,
+                int(video.is_tts_ready), video.playback_position)
+
+    def _insert(self, position: int, row: tuple) -> int:
+        cursor = self.connection.execute(
+            f"INSERT INTO videos (position, {', '.join(VIDEO_COLUMNS)}) "
+            f"VALUES (?, {', '.join('?' * len(VIDEO_COLUMNS))})",
+            (position,) + row
+        )
+        return cursor.lastrowid
+
+    def _write_all(self, videos: List[dict]):
+        self._ids = [
+            self._insert(position, (
+                video['video_path'], video['srt_path'], video.get('tts_dir'),
+                video.get('voice_type', 'pria'), int(video.get('is_tts_ready', False)),
+                video.get('playback_position', 0)
+            ))
+            for position, video in enumerate(videos)
+        ]
@@ -0,0 +1,240 @@
+"""Metrik playback dan sintesis (counter + histogram), nonaktif secara default
+
+Instrumentasi di hot path cukup memeriksa ``metrics.enabled`` sebelum
+mengukur, jadi saat nonaktif biayanya hanya satu lookup atribut. Hasil bisa
+dibaca sebagai teks Prometheus atau JSON, lewat file atau endpoint HTTP lokal.
+
+Aktifkan lewat environment ``VIDEO_PLAYER_METRICS``:
+    1 / on            aktif, baca lewat snapshot()/to_prometheus()
+    http:9464         aktif + endpoint http://127.0.0.1:9464/metrics (dan /metrics.json)
+    metrics.prom      aktif + tulis file saat aplikasi keluar (.json untuk JSON)
+"""
+import atexit
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence, Tuple
+
+METRICS_ENV = "VIDEO_PLAYER_METRICS"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TICK_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+enabled = False
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str):
+        if not enabled:
+            return
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = [{"labels": dict(zip(self.labels, key)), "value": value}
+                      for key, value in self._values.items()]
+        return {"type": self.kind, "help": self.help, "values": values}
+
+    def merge(self, data: Dict):
+        with self._lock:
+            for item in data["values"]:
+                key = tuple(item["labels"].get(label, "") for label in self.labels)
+                self._values[key] = self._values.get(key, 0) + item["value"]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def prometheus_lines(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(zip(self.labels, key))} {_format_number(value)}"
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Per bucket (bukan kumulatif) + +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        if not enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"type": self.kind, "help": self.help, "buckets": list(self.buckets),
+                    "counts": list(self._counts), "sum": self._sum, "count": self._count}
+
+    def merge(self, data: Dict):
+        if tuple(data["buckets"]) != self.buckets:
+            raise ValueError(f"Bucket histogram {self.name} berbeda")
+        with self._lock:
+            self._counts = [a + b for a, b in zip(self._counts, data["counts"])]
+            self._sum += data["sum"]
+            self._count += data["count"]
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def prometheus_lines(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_number(bound)
+            yield f'{self.name}_bucket{{le="{le}"}} {cumulative}'
+        yield f"{self.name}_sum {_format_number(self._sum)}"
+        yield f"{self.name}_count {self._count}"
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _format_labels(pairs) -> str:
+    pairs = [f'{name}="{value}"' for name, value in pairs]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+_registry: Dict[str, object] = {}
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    if name not in _registry:
+        _registry[name] = Counter(name, help, labels)
+    return _registry[name]
+
+def histogram(name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    if name not in _registry:
+        _registry[name] = Histogram(name, help, buckets)
+    return _registry[name]
+
+# Metrik hot path aplikasi
+SYNTHESIS_SECONDS = histogram("tts_synthesis_seconds",
+                              "Latency sintesis per segment (hanya cache miss)")
+QUEUE_WAIT_SECONDS = histogram("tts_queue_wait_seconds",
+                               "Waktu segment menunggu di antrian sampai diambil worker")
+POST_PROCESS_SECONDS = histogram("tts_post_process_seconds",
+                                 "Durasi trim hening + normalisasi loudness per segment (cache miss)")
+BYTES_WRITTEN = counter("tts_bytes_written_total", "Byte audio segment yang ditulis")
+CACHE_LOOKUPS = counter("tts_cache_lookups_total", "Lookup cache TTS per hasil",
+                        labels=("outcome",))
+UPDATE_TICK_SECONDS = histogram("player_update_tick_seconds",
+                                "Durasi satu PlayerModel.update()", TICK_BUCKETS)
+CUE_SWITCH_SECONDS = histogram("player_cue_switch_seconds",
+                               "Waktu dari perintah play cue sampai VLC memutar audio")
+TTS_DRIFT_SECONDS = histogram("player_tts_drift_seconds",
+                              "Selisih absolut posisi audio TTS terhadap posisi video",
+                              (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+def enable(flag: bool = True):
+    global enabled
+    enabled = flag
+
+def reset():
+    for metric in _registry.values():
+        metric.reset()
+
+def snapshot() -> Dict[str, Dict]:
+    """Semua metrik sebagai dict yang bisa di-JSON-kan (dan digabung dengan merge)"""
+    return {name: metric.snapshot() for name, metric in _registry.items()}
+
+def merge(data: Dict[str, Dict]):
+    """Gabungkan snapshot dari proses lain (mis. worker srt_to_audio)"""
+    for name, values in data.items():
+        metric = _registry.get(name)
+        if metric is not None:
+            metric.merge(values)
+
+def to_json() -> str:
+    return json.dumps(snapshot(), indent=2)
+
+def to_prometheus() -> str:
+    lines = []
+    for name, metric in _registry.items():
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(metric.prometheus_lines())
+    return "\n".join(lines) + "\n"
+
+def write(path: str):
+    """Tulis metrik ke file: JSON jika berakhiran .json, selain itu teks Prometheus"""
+    content = to_json() if path.endswith(".json") else to_prometheus()
+    temp_file = path + ".part"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_file, path)
+
+def serve(port: int, host: str = "127.0.0.1"):
+    """Endpoint HTTP lokal: /metrics (Prometheus) dan /metrics.json, di thread daemon"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+def configure_from_env(value: Optional[str] = None):
+    """Aktifkan metrik sesuai ``VIDEO_PLAYER_METRICS`` (lihat docstring modul)"""
+    value = (os.environ.get(METRICS_ENV, "") if value is None else value).strip()
+    if value.lower() in ("", "0", "off", "false"):
+        return None
+    enable()
+    if value.lower() in ("1", "on", "true"):
+        return None
+    if value.lower().startswith("http:"):
+        try:
+            return serve(int(value[5:]))
+        except (ValueError, OSError) as e:
+            print(f"Endpoint metrik tidak bisa dibuka ({value}): {e}")
+            return None
+    atexit.register(write, value)
+    return None
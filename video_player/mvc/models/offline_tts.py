@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, Tuple
+
+OFFLINE_AUDIO_FORMAT = "wav"       # pyttsx3/espeak menulis WAV
+DEFAULT_RATE_WPM = 170             # Kecepatan dasar engine untuk rate "+0%"
+DEFAULT_VOICE_HINT = "id"          # Voice espeak-ng bahasa Indonesia
+RATE_RE = re.compile(r"^\s*([+-]?\d+)\s*%\s*$")
+
+# Engine pyttsx3 per proses worker, dibuat oleh _init_worker
+_engine = None
+
+def rate_to_wpm(rate: str, base_wpm: int = DEFAULT_RATE_WPM) -> int:
+    """Ubah rate gaya edge-tts ("+15%") menjadi words per minute pyttsx3"""
+    match = RATE_RE.match(rate or "")
+    percent = int(match.group(1)) if match else 0
+    return max(int(round(base_wpm * (1 + percent / 100))), 40)
+
+def _find_voice(engine, hint: str) -> Optional[str]:
+    """Cari voice yang id/nama/bahasanya cocok dengan ``hint``"""
+    hint = hint.lower()
+    for voice in engine.getProperty('voices'):
+        languages = [
+            (lang.decode(errors="ignore") if isinstance(lang, bytes) else str(lang)).lower()
+            for lang in (getattr(voice, 'languages', None) or [])
+        ]
+        names = (str(voice.id).lower(), str(voice.name).lower())
+        if any(lang.lstrip("\x05").startswith(hint) for lang in languages) or \
+                any(name == hint or name.endswith("/" + hint) for name in names):
+            return voice.id
+    return None
+
+def _init_worker(voice_hint: str):
+    """Initializer proses worker: satu engine pyttsx3 per proses"""
+    global _engine
+    import pyttsx3
+
+    _engine = pyttsx3.init()
+    voice = _find_voice(_engine, voice_hint)
+    if voice is not None:
+        _engine.setProperty('voice', voice)
+
+def synthesize_to_file(text: str, output_file: str, rate_wpm: int) -> int:
+    """Sintesis satu cue ke file (dijalankan di proses worker), kembalikan ukuran file"""
+    temp_file = f"{output_file}.{os.getpid()}.part"
+    _engine.setProperty('rate', rate_wpm)
+    _engine.save_to_file(text, temp_file)
+    _engine.runAndWait()
+    if not os.path.exists(temp_file) or os.path.getsize(temp_file) == 0:
+        raise RuntimeError(f"pyttsx3 tidak menghasilkan audio untuk {output_file}")
+    os.replace(temp_file, output_file)
+    return os.path.getsize(output_file)
+
+class OfflineSynthesizer:
+    """Sintesis offline dengan pool proses pyttsx3 (espeak-ng di Linux)
+
+    Setiap proses worker punya engine sendiri, jadi cue disintesis paralel
+    tanpa memblokir thread Qt dan tanpa jaringan. Pool dibuat saat pertama
+    kali dipakai dan dipakai ulang sampai ``shutdown``.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, voice_hint: str = DEFAULT_VOICE_HINT,
+                 base_wpm: int = DEFAULT_RATE_WPM):
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self.voice_hint = voice_hint
+        self.base_wpm = base_wpm
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def voice(self) -> str:
+        """Nama voice untuk key cache (berbeda dari voice edge-tts)"""
+        return f"pyttsx3:{self.voice_hint}"
+
+    def set_pool_size(self, pool_size: int):
+        pool_size = max(1, int(pool_size))
+        if pool_size != self.pool_size:
+            self.shutdown()
+            self.pool_size = pool_size
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: proses worker tidak mewarisi state Qt/VLC dari proses utama
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.voice_hint,)
+            )
+        return self._pool
+
+    async def synthesize(self, text: str, output_file: str, rate: str) -> int:
+        """Sintesis satu cue di pool tanpa memblokir event loop"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor(), synthesize_to_file, text, output_file,
+            rate_to_wpm(rate, self.base_wpm)
+        )
+
+    def synthesize_many(self, jobs: Sequence[Tuple[str, str, str]],
+                        on_done: Optional[Callable[[int], None]] = None,
+                        should_stop: Optional[Callable[[], bool]] = None) -> List[int]:
+        """Sintesis banyak cue (teks, file output, rate) secara paralel dan tunggu hasilnya
+
+        ``on_done(index)`` dipanggil di thread pemanggil setiap cue selesai.
+        Jika ``should_stop()`` bernilai True, cue yang belum mulai dibatalkan
+        dan ``CancelledError`` dilempar.
+        """
+        pool = self._executor()
+        futures = {
+            pool.submit(synthesize_to_file, text, output_file, rate_to_wpm(rate, self.base_wpm)): i
+            for i, (text, output_file, rate) in enumerate(jobs)
+        }
+        sizes = [0] * len(jobs)
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                sizes[index] = future.result()
+                if on_done:
+                    on_done(index)
+                if should_stop and should_stop():
+                    raise CancelledError()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return sizes
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,7 +1,12 @@
-import vlc
+import ctypes
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Dict
 from .tts_model import TTSSegment
+from .segment_timeline import SegmentTimeline
+from .segment_store import read_segment
+from . import metrics
 
 @dataclass
 class PlayerState:
@@ -12,15 +17,118 @@ class PlayerState:
     is_using_tts: bool = False
     tts_volume: int = 100
 
+CUE_SWITCH_HISTORY = 200  # Jumlah sampel latency pergantian cue yang disimpan
+MEMORY_MEDIA_REFS = 8     # Sumber media memori yang ditahan (player aktif, idle, transisi)
+DRIFT_THRESHOLD_MS = 200  # Posisi audio TTS dikoreksi jika selisihnya dengan video melebihi ini
+DRIFT_HOLD_MS = 500       # Jeda (waktu video) setelah play/koreksi sebelum drift diukur lagi
+SEEK_INTO_CUE_MS = 200    # Cue diputar dari offset (:start-time) hanya jika offset melebihi ini
+
+vlc = None  # python-vlc diimport saat player pertama kali dipakai (lihat _import_vlc)
+
+def _import_vlc():
+    global vlc
+    if vlc is None:
+        import vlc as module
+        vlc = module
+    return vlc
+
+class MemoryMedia:
+    """Sumber media VLC dari byte di memori (segment di pack), lewat media_new_callbacks
+
+    Callback ctypes harus tetap hidup selama VLC memakai media, jadi objek ini
+    disimpan oleh PlayerModel.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+        callbacks = vlc.CallbackDecorators
+        self._open_cb = callbacks.MediaOpenCb(self._open)
+        self._read_cb = callbacks.MediaReadCb(self._read)
+        self._seek_cb = callbacks.MediaSeekCb(self._seek)
+        self._close_cb = callbacks.MediaCloseCb(self._close)
+
+    def media(self, instance):
+        return instance.media_new_callbacks(self._open_cb, self._read_cb, self._seek_cb,
+                                            self._close_cb, None)
+
+    def _open(self, opaque, datap, sizep):
+        self.position = 0
+        sizep.contents.value = len(self.data)
+        return 0
+
+    def _read(self, opaque, buffer, length):
+        chunk = self.data[self.position:self.position + length]
+        ctypes.memmove(buffer, chunk, len(chunk))
+        self.position += len(chunk)
+        return len(chunk)
+
+    def _seek(self, opaque, offset):
+        self.position = offset
+        return 0
+
+    def _close(self, opaque):
+        pass
+
 class PlayerModel:
     def __init__(self):
         self._observers = []
-        self._instance = vlc.Instance()
-        self._video_player = self._instance.media_player_new()
-        self._audio_player = self._instance.media_player_new()
+        # Instance VLC dan player dibuat saat pertama kali dipakai (lihat _init_backend)
+        self._vlc_instance = None
+        self._vlc_video_player = None
+        self._vlc_audio_players: List = []
+        self._active_audio = 0
+        self._preloaded_index: int = -1
+        self._switch_started: List[Optional[float]] = [None, None]
+        self._switch_latencies = deque(maxlen=CUE_SWITCH_HISTORY)
+        self._memory_media = deque(maxlen=MEMORY_MEDIA_REFS)
+        self._boundary_lags = deque(maxlen=CUE_SWITCH_HISTORY)
         self._state = PlayerState()
         self._current_segments: List[TTSSegment] = []
         self._current_segment_index: int = -1
+        self._timeline = SegmentTimeline([])
+        self._tts_track: Optional[str] = None  # Track TTS hasil render (satu file)
+        self._track_needs_seek = False
+        self._needs_resync = False     # Seek: cue aktif diputar ulang dari offset posisi video
+        self._resync_time: Optional[int] = None  # Posisi tujuan seek terakhir (ms)
+        self._drift_threshold = DRIFT_THRESHOLD_MS
+        self._drift_hold_until = 0     # Waktu video (ms)
+        self._drift_corrections = 0
+        self._last_drift: Optional[int] = None
+
+    def _init_backend(self):
+        """Import python-vlc dan buat instance serta player-nya"""
+        _import_vlc()
+        self._vlc_instance = vlc.Instance()
+        self._vlc_video_player = self._vlc_instance.media_player_new()
+        # Dua audio player bergantian: satu aktif, satu menyiapkan cue berikutnya
+        self._vlc_audio_players = [self._vlc_instance.media_player_new() for _ in range(2)]
+        for i, player in enumerate(self._vlc_audio_players):
+            player.event_manager().event_attach(
+                vlc.EventType.MediaPlayerPlaying, self._on_audio_playing, i
+            )
+
+    @property
+    def backend_loaded(self) -> bool:
+        return self._vlc_instance is not None
+
+    @property
+    def _instance(self):
+        if self._vlc_instance is None:
+            self._init_backend()
+        return self._vlc_instance
+
+    @property
+    def _video_player(self):
+        if self._vlc_instance is None:
+            self._init_backend()
+        return self._vlc_video_player
+
+    @property
+    def _audio_players(self):
+        if self._vlc_instance is None:
+            self._init_backend()
+        return self._vlc_audio_players
 
     def add_observer(self, observer):
         self._observers.append(observer)
@@ -33,13 +141,50 @@ class PlayerModel:
     def state(self) -> PlayerState:
         return self._state
 
-    def load_video(self, video_path: str, hwnd) -> bool:
-        """Load video file"""
+    @property
+    def _audio_player(self):
+        return self._audio_players[self._active_audio]
+
+    @property
+    def _idle_audio_player(self):
+        return self._audio_players[1 - self._active_audio]
+
+    @property
+    def cue_switch_stats(self) -> Dict[str, float]:
+        """Statistik pergantian cue (ms)
+
+        ``latency`` adalah waktu dari perintah play sampai VLC benar-benar
+        memutar audio, ``boundary_lag`` adalah keterlambatan terhadap
+        start_time cue saat pergantian dilakukan.
+        """
+        stats = {"count": len(self._switch_latencies)}
+        for name, samples in (("latency", self._switch_latencies),
+                              ("boundary_lag", self._boundary_lags)):
+            values = list(samples)
+            stats[f"{name}_last_ms"] = values[-1] if values else 0.0
+            stats[f"{name}_mean_ms"] = sum(values) / len(values) if values else 0.0
+            stats[f"{name}_max_ms"] = max(values) if values else 0.0
+        return stats
+
+    @property
+    def drift_stats(self) -> Dict[str, float]:
+        """Drift audio TTS terakhir (ms, positif = audio di depan) dan jumlah koreksi"""
+        return {"last_drift_ms": self._last_drift or 0, "corrections": self._drift_corrections,
+                "threshold_ms": self._drift_threshold}
+
+    def set_drift_threshold(self, threshold_ms: int):
+        """Batas koreksi drift (ms); 0 mematikan koreksi"""
+        self._drift_threshold = max(int(threshold_ms), 0)
+
+    def load_video(self, video_path: str, hwnd, start_time: int = 0) -> bool:
+        """Load video file, opsional mulai dari start_time (ms)"""
         try:
             media = self._instance.media_new(video_path)
+            if start_time > 0:
+                media.add_option(f":start-time={start_time / 1000:.3f}")
             self._video_player.set_media(media)
             self._video_player.set_hwnd(hwnd)  # Set video window
-            self._state.current_time = 0
+            self._state.current_time = start_time
             self.notify_observers("video_loaded")
             return True
         except Exception as e:
@@ -50,6 +195,18 @@ class PlayerModel:
         """Load TTS segments"""
         self._current_segments = segments
         self._current_segment_index = -1
+        self._timeline = SegmentTimeline(segments)
+        self._tts_track = None
+        self._reset_preload()
+        self.notify_observers("tts_loaded")
+
+    def load_tts_track(self, track_path: str):
+        """Load track TTS hasil render, menggantikan pemutaran per segment"""
+        self._audio_player.stop()
+        self._reset_preload()
+        self._audio_player.set_media(self._instance.media_new(track_path))
+        self._tts_track = track_path
+        self._track_needs_seek = True
         self.notify_observers("tts_loaded")
 
     def play(self):
@@ -57,6 +214,8 @@ class PlayerModel:
         if not self._state.is_playing:
             self._video_player.play()
             self._state.is_playing = True
+            # Audio cue yang di-pause dilanjutkan dari posisi video saat ini
+            self._needs_resync = True
             self.notify_observers("playback_started")
 
     def pause(self):
@@ -73,14 +232,28 @@ class PlayerModel:
         self._video_player.stop()
         if self._state.is_using_tts:
             self._audio_player.stop()
+            self._reset_preload()
         self._state.is_playing = False
         self._state.current_time = 0
+        self._resync_time = None
         self.notify_observers("playback_stopped")
 
     def seek(self, position: float):
-        """Seek to position (0-1)"""
+        """Seek to position (0-1)
+
+        Cue TTS di posisi baru diputar dari offset ``video_time - start_time``,
+        bukan dari awal cue; saat pause, resync dilakukan begitu play.
+        """
         self._video_player.set_position(position)
-        self._sync_tts_with_video()
+        self._state.current_time = int(position * self._video_player.get_length())
+        # update() setelah play menimpa current_time dengan get_time() VLC yang
+        # bisa belum mengikuti seek saat pause; tujuan seek disimpan terpisah
+        self._resync_time = self._state.current_time
+        self._track_needs_seek = True
+        self._needs_resync = True
+        self._drift_hold_until = 0
+        if self._state.is_playing:
+            self._sync_tts_with_video()
         self.notify_observers("position_changed")
 
     def set_volume(self, volume: int):
@@ -88,7 +261,8 @@ class PlayerModel:
         if 0 <= volume <= 100:
             if self._state.is_using_tts:
                 self._state.tts_volume = volume
-                self._audio_player.audio_set_volume(volume)
+                for player in self._audio_players:
+                    player.audio_set_volume(volume)
             else:
                 self._state.volume = volume
                 self._video_player.audio_set_volume(volume)
@@ -99,40 +273,180 @@ class PlayerModel:
         self._state.is_using_tts = enabled
         if enabled:
             self._video_player.audio_set_volume(0)
-            self._audio_player.audio_set_volume(self._state.tts_volume)
+            for player in self._audio_players:
+                player.audio_set_volume(self._state.tts_volume)
         else:
             self._video_player.audio_set_volume(self._state.volume)
             self._audio_player.stop()
+            self._reset_preload()
         self.notify_observers("tts_toggled")
 
     def _sync_tts_with_video(self):
         """Sync TTS audio with video position"""
-        if not self._state.is_using_tts or not self._current_segments:
+        if self._resync_time is not None:
+            # Sinkronisasi pertama setelah seek memakai posisi tujuan seek
+            self._state.current_time = self._resync_time
+            self._resync_time = None
+        if not self._state.is_using_tts:
+            return
+        if self._tts_track:
+            self._sync_tts_track()
+            return
+        if not self._current_segments:
             return
 
-        current_time = self._video_player.get_time()
-        self._state.current_time = current_time
+        resync = self._needs_resync
+        self._needs_resync = False
+        if resync:
+            # get_time() VLC bisa belum mengikuti set_position, pakai posisi hasil seek
+            current_time = self._state.current_time
+        else:
+            current_time = self._video_player.get_time()
+            self._state.current_time = current_time
 
         # Find appropriate segment
-        for i, segment in enumerate(self._current_segments):
-            if segment.start_time <= current_time < segment.end_time:
-                if i != self._current_segment_index:
-                    self._current_segment_index = i
-                    # Load and play segment
-                    media = self._instance.media_new(segment.file_path)
-                    self._audio_player.set_media(media)
-                    self._audio_player.play()
-                return
+        i = self._timeline.find(current_time)
+        if i >= 0:
+            if i != self._current_segment_index or resync:
+                segment = self._current_segments[i]
+                if not segment.ready:
+                    # Audio belum selesai disintesis (streaming), anggap hening. Index
+                    # tidak dicatat, jadi begitu siap cue diputar dari offset posisi video
+                    self._current_segment_index = -1
+                    if self._audio_player.is_playing():
+                        self._audio_player.stop()
+                    return
+                self._current_segment_index = i
+                self._switch_to_segment(i, current_time)
+            else:
+                self._check_drift(current_time - self._current_segments[i].start_time, current_time)
+            self._preload_segment(self._timeline.upcoming(current_time))
+            return
+
+        self._preload_segment(self._timeline.upcoming(current_time))
 
         # Stop audio if no matching segment
-        if self._audio_player.is_playing():
+        if resync or self._audio_player.is_playing():
             self._audio_player.stop()
             self._current_segment_index = -1
 
+    def _switch_to_segment(self, index: int, current_time: int):
+        """Putar segment dari offset posisi video, memakai player idle jika sudah di-preload"""
+        segment = self._current_segments[index]
+        offset = max(current_time - segment.start_time, 0)
+        # Offset kecil (pergantian cue biasa) diputar dari awal; koreksi drift menyusul
+        seek_into = offset > SEEK_INTO_CUE_MS
+        self._drift_hold_until = current_time + DRIFT_HOLD_MS
+        if index == self._preloaded_index and not seek_into:
+            # Swap: player idle sudah membuka file dan menunggu di posisi awal
+            previous = self._audio_player
+            self._active_audio = 1 - self._active_audio
+            self._preloaded_index = -1
+            self._switch_started[self._active_audio] = time.perf_counter()
+            if self._audio_player.get_state() == vlc.State.Paused:
+                self._audio_player.set_pause(0)
+            else:
+                # Preload belum selesai dibuka, putar ulang tanpa start-paused
+                self._audio_player.stop()
+                self._audio_player.set_media(self._segment_media(segment.file_path))
+                self._audio_player.play()
+            previous.stop()
+        else:
+            # Load and play segment
+            media = self._segment_media(segment.file_path)
+            if seek_into:
+                media.add_option(f":start-time={offset / 1000:.3f}")
+            self._audio_player.set_media(media)
+            self._switch_started[self._active_audio] = time.perf_counter()
+            self._audio_player.play()
+            if index == self._preloaded_index:
+                self._reset_preload()
+        self._boundary_lags.append(float(offset))
+
+    def _preload_segment(self, index: int):
+        """Buka dan parse cue berikutnya di player idle, berhenti di posisi awal"""
+        if index < 0 or index == self._preloaded_index:
+            return
+        segment = self._current_segments[index]
+        if not segment.ready:
+            return
+        media = self._segment_media(segment.file_path)
+        media.add_option(":start-paused")
+        media.parse_with_options(vlc.MediaParseFlag.local, 0)
+        idle = self._idle_audio_player
+        idle.stop()
+        idle.set_media(media)
+        idle.play()
+        self._preloaded_index = index
+
+    def _segment_media(self, file_path: str):
+        """Media VLC untuk satu segment: dari pack lewat callback memori, atau file biasa"""
+        instance = self._instance
+        data = read_segment(file_path)
+        if data is None:
+            return instance.media_new(file_path)
+        source = MemoryMedia(data)
+        self._memory_media.append(source)
+        return source.media(instance)
+
+    def _reset_preload(self):
+        if self._preloaded_index >= 0:
+            self._idle_audio_player.stop()
+        self._preloaded_index = -1
+
+    def _on_audio_playing(self, event, player_index: int):
+        """Callback VLC (thread VLC): catat latency pergantian cue"""
+        started = self._switch_started[player_index]
+        if started is not None:
+            self._switch_started[player_index] = None
+            elapsed = time.perf_counter() - started
+            self._switch_latencies.append(elapsed * 1000)
+            metrics.CUE_SWITCH_SECONDS.observe(elapsed)
+
+    def _check_drift(self, expected: int, current_time: int):
+        """Ukur selisih posisi audio TTS terhadap ``expected`` (ms), koreksi jika melewati batas"""
+        if not self._drift_threshold and not metrics.enabled:
+            return
+        player = self._audio_player
+        if current_time < self._drift_hold_until or not player.is_playing():
+            return
+        drift = player.get_time() - expected
+        self._last_drift = drift
+        metrics.TTS_DRIFT_SECONDS.observe(abs(drift) / 1000)
+        if self._drift_threshold and abs(drift) > self._drift_threshold:
+            length = player.get_length()
+            if length <= 0 or expected < length:
+                player.set_time(max(expected, 0))
+                self._drift_corrections += 1
+                self._drift_hold_until = current_time + DRIFT_HOLD_MS
+
+    def _sync_tts_track(self):
+        """Sync track TTS tunggal, hanya seek saat video di-seek atau baru mulai"""
+        state = self._audio_player.get_state()
+        if state not in (vlc.State.Opening, vlc.State.Buffering, vlc.State.Playing):
+            length = self._audio_player.get_length()
+            if not self._state.is_playing or 0 < length <= self._state.current_time:
+                return
+            if state == vlc.State.Ended:
+                self._audio_player.stop()
+            self._audio_player.play()
+            self._track_needs_seek = True
+        elif self._track_needs_seek and state == vlc.State.Playing:
+            self._audio_player.set_time(max(self._state.current_time, 0))
+            self._track_needs_seek = False
+            self._drift_hold_until = self._state.current_time + DRIFT_HOLD_MS
+        elif state == vlc.State.Playing:
+            self._check_drift(self._state.current_time, self._state.current_time)
+
     def update(self):
         """Update player state"""
         if self._state.is_playing:
+            started = time.perf_counter() if metrics.enabled else None
+            previous = (self._state.current_time, self._state.duration)
             self._state.current_time = self._video_player.get_time()
             self._state.duration = self._video_player.get_length()
             self._sync_tts_with_video()
-            self.notify_observers("time_updated")
+            if (self._state.current_time, self._state.duration) != previous:
+                self.notify_observers("time_updated")
+            if started is not None:
+                metrics.UPDATE_TICK_SECONDS.observe(time.perf_counter() - started)
@@ -0,0 +1,232 @@
+"""Penyimpanan segment TTS terpaket: satu file data append-only per video
+
+Alih-alih ribuan ``segment_N.mp3``, audio semua cue ditulis berurutan ke
+``segments.pack`` dan posisinya dicatat di ``segments.idx`` (satu baris
+``nama<TAB>offset<TAB>panjang`` per segment, hanya ditambah). Data dibaca
+lewat mmap. ``TTSSegment.file_path`` tetap
+berupa path logis ``<dir>/segment_N.mp3``; nama file-nya menjadi key di
+index, jadi checkpoint, library dan player cukup menanyakan store untuk
+direktori tersebut (lihat ``store_for`` / ``read_segment``).
+"""
+import mmap
+import os
+import subprocess
+import threading
+from typing import Dict, Optional, Tuple
+
+PACK_NAME = "segments.pack"
+INDEX_NAME = "segments.idx"
+PARTIAL_SUFFIX = ".part"
+CODEC_COPY = "copy"
+# Codec ringkas: nama encoder ffmpeg, format container, bitrate default
+PACK_CODECS = {
+    CODEC_COPY: None,
+    "opus": ("libopus", "ogg", "24k"),
+    "mp3": ("libmp3lame", "mp3", "32k"),
+}
+COMPACT_GARBAGE_RATIO = 0.5  # Compact jika lebih dari separuh pack berisi data lama
+
+def transcode(data: bytes, codec: str, bitrate: Optional[str] = None) -> bytes:
+    """Encode ulang audio ke codec ringkas lewat ffmpeg (stdin -> stdout)"""
+    from pydub.utils import get_encoder_name
+
+    encoder, container, default_bitrate = PACK_CODECS[codec]
+    result = subprocess.run(
+        [get_encoder_name(), "-loglevel", "error", "-i", "pipe:0", "-vn", "-ac", "1",
+         "-c:a", encoder, "-b:a", bitrate or default_bitrate, "-f", container, "pipe:1"],
+        input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"ffmpeg gagal encode segment ke {codec}: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+class SegmentStore:
+    """File data append-only + index offset untuk semua segment satu video
+
+    Aman dipakai dari beberapa thread. Menulis ulang segment yang sama
+    menambah data baru di akhir pack; data lama dibuang oleh ``compact``.
+    """
+
+    def __init__(self, directory: str, codec: str = CODEC_COPY, bitrate: Optional[str] = None):
+        if codec not in PACK_CODECS:
+            raise ValueError(f"Codec pack tidak dikenal: {codec}")
+        self.directory = directory
+        self.codec = codec
+        self.bitrate = bitrate
+        self.pack_path = os.path.join(directory, PACK_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[int, int]] = {}  # nama -> (offset, panjang)
+        self._size = 0          # Ukuran pack yang valid (akhir entri terakhir)
+        self._writer = None
+        self._index_writer = None
+        self._map: Optional[mmap.mmap] = None
+        self._load()
+
+    def _load(self):
+        """Baca index; entri yang menunjuk ke luar pack (tulisan terputus) diabaikan"""
+        pack_size = os.path.getsize(self.pack_path) if os.path.exists(self.pack_path) else 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        name, offset, length = line.rstrip("\n").split("\t")
+                        offset, length = int(offset), int(length)
+                    except ValueError:
+                        continue  # Baris terakhir bisa terpotong jika aplikasi crash
+                    if offset + length <= pack_size:
+                        self._entries[name] = (offset, length)
+                        self._size = max(self._size, offset + length)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def size(self, name: str) -> int:
+        """Ukuran data segment (0 jika tidak ada)"""
+        entry = self._entries.get(name)
+        return entry[1] if entry else 0
+
+    @property
+    def garbage_bytes(self) -> int:
+        """Byte di pack yang tidak lagi dirujuk index"""
+        return self._size - sum(length for _, length in self._entries.values())
+
+    def put(self, name: str, data: bytes) -> int:
+        """Tambahkan audio segment ke pack, kembalikan ukuran yang ditulis"""
+        if self.codec != CODEC_COPY:
+            data = transcode(data, self.codec, self.bitrate)
+        with self._lock:
+            if self._writer is None:
+                os.makedirs(self.directory, exist_ok=True)
+                # Tanpa buffer: setiap write langsung terlihat oleh mmap pembaca
+                mode = 'r+b' if os.path.exists(self.pack_path) else 'w+b'
+                self._writer = open(self.pack_path, mode, buffering=0)
+                # Buang sisa tulisan yang terputus di akhir pack
+                self._writer.truncate(self._size)
+                self._writer.seek(self._size)
+                self._index_writer = open(self.index_path, 'ab', buffering=0)
+            self._writer.write(data)
+            # Index ditulis setelah data, jadi entri di index selalu menunjuk data utuh
+            self._index_writer.write(f"{name}\t{self._size}\t{len(data)}\n".encode("utf-8"))
+            self._entries[name] = (self._size, len(data))
+            self._size += len(data)
+        return len(data)
+
+    def put_file(self, name: str, path: str) -> int:
+        with open(path, 'rb') as f:
+            return self.put(name, f.read())
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Data segment dibaca lewat mmap, None jika tidak ada"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            offset, length = entry
+            if self._map is None or len(self._map) < offset + length:
+                self._remap()
+            return self._map[offset:offset + length]
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        with open(self.pack_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def compact(self) -> int:
+        """Tulis ulang pack hanya dengan data yang masih dirujuk, kembalikan byte yang dibuang"""
+        with self._lock:
+            garbage = self.garbage_bytes
+            if not garbage:
+                return 0
+            entries = sorted(self._entries.items(), key=lambda item: item[1][0])
+            data = {name: self.get(name) for name, _ in entries}
+            self._close_files()
+            new_entries, offset = {}, 0
+            with open(self.pack_path + PARTIAL_SUFFIX, 'wb') as pack, \
+                    open(self.index_path + PARTIAL_SUFFIX, 'w', encoding='utf-8') as index:
+                for name, _ in entries:
+                    pack.write(data[name])
+                    index.write(f"{name}\t{offset}\t{len(data[name])}\n")
+                    new_entries[name] = (offset, len(data[name]))
+                    offset += len(data[name])
+            # Tanpa index pack diabaikan: jika terputus di sini, segment disintesis
+            # ulang (dari cache), tidak pernah membaca offset lama di pack baru
+            os.remove(self.index_path)
+            os.replace(self.pack_path + PARTIAL_SUFFIX, self.pack_path)
+            os.replace(self.index_path + PARTIAL_SUFFIX, self.index_path)
+            self._entries = new_entries
+            self._size = offset
+            return garbage
+
+    def compact_if_needed(self) -> int:
+        if self._size and self.garbage_bytes > self._size * COMPACT_GARBAGE_RATIO:
+            return self.compact()
+        return 0
+
+    def _close_files(self):
+        for handle in (self._writer, self._index_writer, self._map):
+            if handle is not None:
+                handle.close()
+        self._writer = self._index_writer = self._map = None
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+    def delete(self):
+        """Hapus pack dan index (dua file, berapa pun jumlah segment-nya)"""
+        with self._lock:
+            self._close_files()
+            for path in (self.pack_path, self.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._entries.clear()
+            self._size = 0
+
+# --- store per direktori ------------------------------------------------------
+
+_stores: Dict[str, SegmentStore] = {}
+_stores_lock = threading.Lock()
+
+def store_for(directory: str, create: bool = False, codec: str = CODEC_COPY,
+              bitrate: Optional[str] = None) -> Optional[SegmentStore]:
+    """Store untuk direktori output TTS; None jika belum ada pack dan ``create`` False"""
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is not None and not os.path.exists(store.index_path) and not create:
+            # Pack dihapus dari luar (mis. video dihapus dari playlist)
+            store.close()
+            del _stores[key]
+            store = None
+        if store is None:
+            if not create and not os.path.exists(os.path.join(directory, INDEX_NAME)):
+                return None
+            store = _stores[key] = SegmentStore(directory, codec, bitrate)
+        elif create:
+            store.codec, store.bitrate = codec, bitrate
+        return store
+
+def close_store(directory: str):
+    """Tutup store direktori (sebelum direktori dihapus)"""
+    with _stores_lock:
+        store = _stores.pop(os.path.abspath(directory), None)
+    if store is not None:
+        store.close()
+
+def read_segment(file_path: str) -> Optional[bytes]:
+    """Audio segment dari pack di direktorinya, None jika segment bukan bagian pack"""
+    store = store_for(os.path.dirname(file_path))
+    return store.get(os.path.basename(file_path)) if store is not None else None
+
+def segment_exists(file_path: str) -> bool:
+    """True jika segment ada, baik sebagai file biasa maupun di pack"""
+    store = store_for(os.path.dirname(file_path))
+    if store is not None and os.path.basename(file_path) in store:
+        return True
+    return os.path.exists(file_path)
@@ -0,0 +1,113 @@
+from bisect import bisect_right
+from typing import List, Sequence
+
+MIN_CUE_MS = 100        # Cue dengan durasi nol tetap aktif minimal 2 tick update
+FORWARD_SCAN_LIMIT = 8  # Batas langkah cursor sebelum kembali ke binary search
+
+class SegmentTimeline:
+    """Index cue terurut untuk mencari segment aktif pada waktu tertentu
+
+    Cue diurutkan berdasarkan start_time. Pencarian memakai binary search,
+    dengan jalur cepat O(1) untuk playback maju yang hanya menggeser cursor.
+    Untuk cue yang overlap, cue aktif dengan start_time terbaru yang dipilih;
+    cue tersebut dicari lewat segment tree max end_time, jadi ``find`` tetap
+    O(log n) walaupun satu cue panjang menutupi banyak cue pendek.
+    """
+
+    def __init__(self, segments: Sequence):
+        order = sorted(range(len(segments)),
+                       key=lambda i: (segments[i].start_time, i))
+        self._order: List[int] = order
+        self._starts: List[int] = [segments[i].start_time for i in order]
+        self._ends: List[int] = [
+            max(segments[i].end_time, segments[i].start_time + MIN_CUE_MS)
+            for i in order
+        ]
+
+        # Max end_time kumulatif untuk menangani cue yang overlap
+        self._max_ends: List[int] = []
+        max_end = None
+        for end in self._ends:
+            max_end = end if max_end is None else max(max_end, end)
+            self._max_ends.append(max_end)
+
+        # Segment tree max end_time (daun di [size, 2*size)), untuk cue aktif terakhir
+        size = 1
+        while size < len(self._ends):
+            size *= 2
+        tree = [-1] * (2 * size)
+        tree[size:size + len(self._ends)] = self._ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree_size = size
+        self._tree = tree
+
+        self._cursor = -1
+        self._last_time = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def find(self, time_ms: int) -> int:
+        """Mengembalikan index segment (urutan asli) yang aktif, atau -1"""
+        pos = self._locate(time_ms)
+        self._cursor = pos
+        self._last_time = time_ms
+
+        if pos < 0 or self._max_ends[pos] <= time_ms:
+            return -1
+
+        # Cue terakhir yang dimulai belum tentu masih aktif jika ada overlap
+        if self._ends[pos] <= time_ms:
+            pos = self._last_active(pos, time_ms)
+        return self._order[pos]
+
+    def upcoming(self, time_ms: int) -> int:
+        """Index segment pertama yang dimulai setelah ``time_ms``, atau -1"""
+        pos = bisect_right(self._starts, time_ms)
+        if pos < len(self._order):
+            return self._order[pos]
+        return -1
+
+    def reset(self):
+        """Reset cursor, misalnya setelah seek"""
+        self._cursor = -1
+        self._last_time = None
+
+    def _last_active(self, pos: int, time_ms: int) -> int:
+        """Posisi terbesar <= ``pos`` dengan end_time > time_ms, O(log n)
+
+        Dipanggil hanya jika ``_max_ends[pos] > time_ms``, jadi selalu ada hasil.
+        """
+        tree, size = self._tree, self._tree_size
+        # Node penyusun rentang [0, pos], dikunjungi dari kanan ke kiri
+        lo, hi = size, size + pos + 1
+        right, left = [], []
+        while lo < hi:
+            if hi & 1:
+                hi -= 1
+                right.append(hi)
+            if lo & 1:
+                left.append(lo)
+                lo += 1
+            lo //= 2
+            hi //= 2
+        for node in right + left[::-1]:
+            if tree[node] > time_ms:
+                # Turun ke daun paling kanan yang masih aktif
+                while node < size:
+                    node = 2 * node + 1 if tree[2 * node + 1] > time_ms else 2 * node
+                return node - size
+        return -1
+
+    def _locate(self, time_ms: int) -> int:
+        """Posisi cue terakhir dengan start_time <= time_ms"""
+        if self._last_time is not None and time_ms >= self._last_time:
+            cursor = self._cursor
+            starts = self._starts
+            limit = min(len(starts), cursor + 1 + FORWARD_SCAN_LIMIT)
+            while cursor + 1 < limit and starts[cursor + 1] <= time_ms:
+                cursor += 1
+            if cursor + 1 >= len(starts) or starts[cursor + 1] > time_ms:
+                return cursor
+        return bisect_right(self._starts, time_ms) - 1
@@ -0,0 +1,162 @@
+import codecs
+import re
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Urutan encoding yang dicoba jika file tidak punya BOM. latin-1 tidak
+# pernah gagal, jadi selalu ada hasil (paling buruk karakternya salah).
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# "00:01:02,345 --> 00:01:04,000" (SRT) atau "01:02.345 --> 01:04.000 align:start" (WebVTT)
+TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*"
+    r"(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+TAG_RE = re.compile(r"<[^>]*>|\{\\[^}]*\}")  # Tag <i>, <v Nama>, <c.x> dan {\an8}
+
+class Cue(NamedTuple):
+    start_time: int  # milliseconds
+    end_time: int    # milliseconds
+    text: str
+
+    @property
+    def duration(self) -> int:
+        return self.end_time - self.start_time
+
+class CueTimeline:
+    """Hasil parse subtitle dalam bentuk ringkas
+
+    Waktu mulai/selesai disimpan di ``array('q')`` dan seluruh teks di satu
+    string bersama dengan offset per cue, bukan satu objek per cue.
+    """
+
+    def __init__(self, starts: array, ends: array, buffer: str, offsets: array):
+        self.starts = starts
+        self.ends = ends
+        self._buffer = buffer
+        self._offsets = offsets  # len(cue) + 1 offset ke dalam buffer
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Cue:
+        if index < 0:
+            index += len(self)
+        return Cue(self.starts[index], self.ends[index], self.text(index))
+
+    def __iter__(self) -> Iterator[Cue]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def text(self, index: int) -> str:
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]]
+
+    def texts(self) -> List[str]:
+        offsets = self._offsets
+        return [self._buffer[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def duration(self, index: int) -> int:
+        return self.ends[index] - self.starts[index]
+
+def detect_encoding(head: bytes) -> Optional[str]:
+    """Encoding dari BOM di awal file, None jika tidak ada BOM"""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+def _parse_timing(line: str) -> Optional[Tuple[int, int]]:
+    match = TIMING_RE.search(line)
+    if match is None:
+        return None
+    h1, m1, s1, f1, h2, m2, s2, f2 = match.groups()
+    start = ((int(h1 or 0) * 60 + int(m1)) * 60 + int(s1)) * 1000 + int(f1.ljust(3, "0"))
+    end = ((int(h2 or 0) * 60 + int(m2)) * 60 + int(s2)) * 1000 + int(f2.ljust(3, "0"))
+    return start, end
+
+def iter_cues(lines: Iterable[str], strip_tags: bool = True) -> Iterator[Tuple[int, int, str]]:
+    """Parse baris SRT/WebVTT secara streaming, menghasilkan (start, end, teks)
+
+    Toleran terhadap nomor cue yang hilang, baris kosong yang hilang di antara
+    cue, header/blok NOTE WebVTT dan whitespace berlebih.
+    """
+    timing = None
+    text_lines: List[str] = []
+
+    def flush():
+        text = "\n".join(text_lines).strip()
+        if strip_tags and ("<" in text or "{\\" in text):
+            text = TAG_RE.sub("", text).strip()
+        return timing[0], timing[1], text
+
+    for line in lines:
+        line = line.strip()
+        if "-->" in line:
+            parsed = _parse_timing(line)
+            if parsed is not None:
+                if timing is not None:
+                    # Baris kosong hilang: baris terakhir berupa angka adalah nomor cue berikutnya
+                    if text_lines and text_lines[-1].isdigit():
+                        text_lines.pop()
+                    yield flush()
+                timing = parsed
+                text_lines = []
+                continue
+        if timing is None:
+            continue  # Nomor cue, header WEBVTT, blok NOTE/STYLE
+        if line:
+            text_lines.append(line)
+        elif text_lines:
+            yield flush()
+            timing = None
+            text_lines = []
+    if timing is not None:
+        yield flush()
+
+def build_timeline(cues: Iterable[Tuple[int, int, str]]) -> CueTimeline:
+    """Kumpulkan cue ke dalam CueTimeline"""
+    starts = array("q")
+    ends = array("q")
+    offsets = array("q", [0])
+    parts = []
+    position = 0
+    for start, end, text in cues:
+        starts.append(start)
+        ends.append(end)
+        parts.append(text)
+        position += len(text)
+        offsets.append(position)
+    return CueTimeline(starts, ends, "".join(parts), offsets)
+
+def _parse_with(path: str, encoding: str, strip_tags: bool) -> CueTimeline:
+    with open(path, "r", encoding=encoding, errors="strict", newline=None) as f:
+        return build_timeline(iter_cues(f, strip_tags))
+
+def parse_subtitle_file(path: str, strip_tags: bool = True) -> CueTimeline:
+    """Parse file .srt/.vtt menjadi CueTimeline
+
+    Dibaca baris per baris. Tanpa BOM dicoba UTF-8 dulu; jika di tengah file
+    ada byte yang tidak valid, parse diulang dengan encoding berikutnya.
+    """
+    with open(path, "rb") as f:
+        bom_encoding = detect_encoding(f.read(4))
+    encodings = [bom_encoding] if bom_encoding else list(FALLBACK_ENCODINGS)
+
+    for encoding in encodings[:-1]:
+        try:
+            return _parse_with(path, encoding, strip_tags)
+        except UnicodeDecodeError:
+            continue
+    return _parse_with(path, encodings[-1], strip_tags)
+
+def parse_subtitle_text(text: str, strip_tags: bool = True) -> CueTimeline:
+    """Parse isi subtitle yang sudah berupa string"""
+    return build_timeline(iter_cues(text.lstrip("\ufeff").splitlines(), strip_tags))
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .tts_cache import normalize_text
+
+DEFAULT_MEMORY_FILE = "translation_memory.jsonl"
+DEFAULT_BATCH_SIZE = 50
+
+class TranslationMemory:
+    """Memori terjemahan di disk dengan key (bahasa sumber, bahasa target, teks)
+
+    Disimpan sebagai JSON lines yang hanya ditambah (append), dibaca saat
+    pertama kali dipakai.
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMORY_FILE):
+        self.path = path
+        self._entries: Optional[Dict[Tuple[str, str, str], str]] = None
+
+    def _load(self) -> Dict[Tuple[str, str, str], str]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # Baris terakhir bisa terpotong jika aplikasi crash
+                        self._entries[(entry['src'], entry['dest'], entry['text'])] = entry['translation']
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def get(self, src: str, dest: str, text: str) -> Optional[str]:
+        return self._load().get((src, dest, normalize_text(text)))
+
+    def put_many(self, src: str, dest: str, pairs: Sequence[Tuple[str, str]]):
+        """Simpan beberapa terjemahan sekaligus"""
+        entries = self._load()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for text, translation in pairs:
+                text = normalize_text(text)
+                entries[(src, dest, text)] = translation
+                f.write(json.dumps({'src': src, 'dest': dest, 'text': text,
+                                    'translation': translation}, ensure_ascii=False) + "\n")
+
+class BatchTranslator:
+    """Menerjemahkan teks cue secara batch dengan memori terjemahan
+
+    ``translator`` bisa objek apa saja dengan method
+    ``translate(texts, src=..., dest=...)`` yang menerima list dan
+    mengembalikan list hasil (objek dengan atribut ``text`` atau string),
+    misalnya ``googletrans.Translator``.
+    """
+
+    def __init__(self, translator, memory: Optional[TranslationMemory] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.translator = translator
+        self.memory = memory if memory is not None else TranslationMemory()
+        self.batch_size = batch_size
+        self.memory_hits = 0
+        self.translated = 0
+        self.requests = 0
+
+    def translate(self, texts: Sequence[str], src: str, dest: str) -> List[str]:
+        if src == dest:
+            return list(texts)
+
+        results: List[Optional[str]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}  # Teks unik -> posisi, urutan tetap
+        for i, text in enumerate(texts):
+            if not text.strip():
+                results[i] = text
+                continue
+            cached = self.memory.get(src, dest, text)
+            if cached is not None:
+                results[i] = cached
+                self.memory_hits += 1
+            else:
+                missing.setdefault(normalize_text(text), []).append(i)
+
+        unique = list(missing)
+        for start in range(0, len(unique), self.batch_size):
+            batch = unique[start:start + self.batch_size]
+            translations = self._translate_batch(batch, src, dest)
+            self.memory.put_many(src, dest, list(zip(batch, translations)))
+            for text, translation in zip(batch, translations):
+                for i in missing[text]:
+                    results[i] = translation
+            self.translated += len(batch)
+
+        return results
+
+    def _translate_batch(self, batch: List[str], src: str, dest: str) -> List[str]:
+        self.requests += 1
+        translated = self.translator.translate(batch, src=src, dest=dest)
+        if not isinstance(translated, list):
+            translated = [translated]
+        if len(translated) != len(batch):
+            # Hasil terpotong tidak boleh masuk memory dengan pasangan yang salah
+            raise ValueError(f"Penerjemah mengembalikan {len(translated)} hasil "
+                             f"untuk {len(batch)} teks")
+        return [getattr(t, 'text', t) for t in translated]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "translated": self.translated,
+            "requests": self.requests
+        }
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import shutil
+import unicodedata
+import uuid
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = "tts_cache"
+
+def normalize_text(text: str) -> str:
+    """Normalisasi teks cue supaya spasi/unicode berbeda tetap satu key"""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+class TTSCache:
+    """Cache audio TTS di disk dengan key hash (teks, suara, rate, format)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, text: str, voice: str, rate: str, audio_format: str = "mp3") -> str:
+        """Menghitung key cache untuk satu request TTS"""
+        payload = "\x1f".join([normalize_text(text), voice, rate, audio_format])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def derived_key(self, key: str, stage: str) -> str:
+        """Key untuk hasil olahan (mis. post-processing) dari audio dengan ``key``"""
+        return hashlib.sha256(f"{key}\x1f{stage}".encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, audio_format: str = "mp3") -> str:
+        """Lokasi file cache, dibagi per dua karakter awal key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{audio_format}")
+
+    def lookup(self, key: str, audio_format: str = "mp3") -> Optional[str]:
+        """Mengembalikan path file cache jika ada, sekaligus mencatat hit/miss"""
+        path = self.path_for(key, audio_format)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def temp_path(self, key: str, audio_format: str = "mp3") -> str:
+        """Path sementara untuk sintesis sebelum file masuk ke cache"""
+        path = self.path_for(key, audio_format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return f"{path}.{uuid.uuid4().hex}.part"
+
+    def commit(self, key: str, temp_file: str, audio_format: str = "mp3") -> str:
+        """Memindahkan hasil sintesis ke cache secara atomik"""
+        path = self.path_for(key, audio_format)
+        os.replace(temp_file, path)
+        return path
+
+    def materialize(self, cached_file: str, output_file: str):
+        """Menyalin file cache ke direktori output (hard link jika bisa)
+
+        Ditulis ke file sementara lalu di-rename, jadi ``output_file`` tidak
+        pernah berisi file setengah jadi.
+        """
+        temp_file = f"{output_file}.{uuid.uuid4().hex}.part"
+        try:
+            os.link(cached_file, temp_file)
+        except OSError:
+            shutil.copyfile(cached_file, temp_file)
+        os.replace(temp_file, output_file)
+
+    def stats(self) -> Dict[str, float]:
+        """Statistik hit/miss cache"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
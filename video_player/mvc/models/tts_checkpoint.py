@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+from typing import Dict
+
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_SAVE_EVERY = 20  # Tulis checkpoint setiap N segment selesai
+PARTIAL_SUFFIX = ".part"
+
+def segment_fingerprint(text: str, rate: str) -> str:
+    """Sidik teks + rate segment; segment disintesis ulang jika berubah"""
+    return hashlib.sha1(f"{rate}\x00{text}".encode("utf-8")).hexdigest()[:16]
+
+class TTSCheckpoint:
+    """Manifest segment yang sudah selesai di direktori output TTS
+
+    Setiap entri menyimpan nama file, ukuran dan sidik teks/rate. Segment
+    dianggap selesai hanya jika file ada dengan ukuran yang sama, jadi file
+    yang terpotong saat aplikasi ditutup tidak ikut dipakai. Checkpoint
+    diabaikan jika ``settings`` (SRT, suara, fitting, ...) berbeda. Dengan
+    ``store`` (SegmentStore), ukuran segment dibaca dari index pack.
+    """
+
+    def __init__(self, output_dir: str, settings: Dict, name: str = CHECKPOINT_NAME,
+                 save_every: int = CHECKPOINT_SAVE_EVERY, store=None):
+        self.output_dir = output_dir
+        self.store = store
+        self.path = os.path.join(output_dir, name)
+        self.settings = settings
+        self.save_every = save_every
+        self._unsaved = 0
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not data or data.get("settings") != self.settings:
+            data = {"settings": self.settings, "segments": {}, "complete": False}
+        return data
+
+    @property
+    def complete(self) -> bool:
+        return self._data["complete"]
+
+    @complete.setter
+    def complete(self, value: bool):
+        self._data["complete"] = value
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self._data["segments"])
+
+    def is_done(self, file_path: str, text: str, rate: str) -> bool:
+        entry = self._data["segments"].get(os.path.basename(file_path))
+        if not entry or entry.get("fingerprint") != segment_fingerprint(text, rate):
+            return False
+        try:
+            return self._size(file_path) == entry["bytes"] > 0
+        except OSError:
+            return False
+
+    def _size(self, file_path: str) -> int:
+        if self.store is not None:
+            return self.store.size(os.path.basename(file_path))
+        return os.path.getsize(file_path)
+
+    def mark_done(self, file_path: str, text: str, rate: str) -> int:
+        """Catat segment selesai, kembalikan ukuran file"""
+        size = self._size(file_path)
+        self._data["segments"][os.path.basename(file_path)] = {
+            "bytes": size,
+            "fingerprint": segment_fingerprint(text, rate)
+        }
+        self._data["complete"] = False
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+        return size
+
+    def save(self):
+        """Tulis checkpoint secara atomik (file sementara lalu rename)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_file = self.path + PARTIAL_SUFFIX
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f)
+        os.replace(temp_file, self.path)
+        self._unsaved = 0
+
+    def remove_partial_files(self) -> int:
+        """Hapus file sementara sisa proses yang terputus"""
+        removed = 0
+        if os.path.isdir(self.output_dir):
+            for name in os.listdir(self.output_dir):
+                if name.endswith(PARTIAL_SUFFIX):
+                    os.remove(os.path.join(self.output_dir, name))
+                    removed += 1
+        return removed
@@ -1,15 +1,22 @@
 import asyncio
-import edge_tts
-import pysrt
 import os
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import CancelledError
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict, Optional
-import pyttsx3
+from typing import Callable, List, Dict, Optional, Tuple
 import json
 from PyQt5.QtCore import QObject, pyqtSignal
-import speech_recognition as sr
-from googletrans import Translator
+from .tts_cache import TTSCache
+from .translation_memory import BatchTranslator, TranslationMemory
+from .subtitle_parser import parse_subtitle_file
+from .tts_checkpoint import TTSCheckpoint
+from .offline_tts import OfflineSynthesizer, OFFLINE_AUDIO_FORMAT
+from .cue_coalesce import plan_groups
+from .segment_store import CODEC_COPY, SegmentStore, close_store, store_for
+from . import metrics
 
 @dataclass
 class TTSSegment:
@@ -18,20 +25,74 @@ class TTSSegment:
     end_time: int    # milliseconds
     text: str
     rate: str
+    ready: bool = True  # False selama audio masih disintesis (mode streaming)
 
 VOICE_LIST = {
     "pria": "id-ID-ArdiNeural",
     "wanita": "id-ID-GadisNeural"
 }
 
+# Backend sintesis: edge-tts (online, mp3) atau pyttsx3 di pool proses (offline, wav)
+BACKEND_EDGE = "edge"
+BACKEND_OFFLINE = "offline"
+
+TIMELINE_TRACK_NAME = "timeline.mp3"
+STREAM_PRELOAD_MS = 5000  # Durasi cue yang harus siap sebelum video mulai (streaming)
+
+class SynthesisQueue:
+    """Antrian cue yang belum disintesis, diurutkan mulai dari posisi playhead"""
+
+    def __init__(self, segments: List[TTSSegment], position: int = 0):
+        self._order = sorted(range(len(segments)), key=lambda i: segments[i].start_time)
+        self._starts = [segments[i].start_time for i in self._order]
+        # Posisi dalam _order; segment yang sudah ready (checkpoint) dilewati
+        self._pending = [p for p, i in enumerate(self._order) if not segments[i].ready]
+        self._next = 0
+        self.set_position(position)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def set_position(self, position: int):
+        """Cue yang aktif pada ``position`` (ms) dan sesudahnya diproses lebih dulu"""
+        self._next = max(bisect_right(self._starts, position) - 1, 0)
+
+    def window(self, position: int, duration: int) -> List[int]:
+        """Posisi cue yang dimulai dalam ``duration`` ms setelah cue di ``position``"""
+        first = max(bisect_right(self._starts, position) - 1, 0)
+        if first >= len(self._starts):
+            return []
+        last = bisect_right(self._starts, self._starts[first] + duration)
+        return [self._order[p] for p in range(first, max(last, first + 1))]
+
+    def pop(self) -> Optional[int]:
+        """Index segment berikutnya yang harus disintesis, atau None jika habis"""
+        if not self._pending:
+            return None
+        k = bisect_right(self._pending, self._next - 1)
+        if k >= len(self._pending):
+            k = 0  # Cue sesudah playhead sudah habis, lanjut ke cue sebelumnya
+        position = self._pending.pop(k)
+        self._next = position + 1
+        return self._order[position]
+
 class TTSModel(QObject):
     conversion_progress = pyqtSignal(int)  # Signal untuk progress konversi
     conversion_complete = pyqtSignal()      # Signal ketika konversi selesai
     
     def __init__(self):
         super().__init__()
-        self.engine = pyttsx3.init()
-        self.translator = Translator()
+        # Backend berat (googletrans, edge_tts, pool pyttsx3) baru diimport
+        # dan diinisialisasi saat pertama kali dipakai
+        self._backend = BACKEND_EDGE
+        self._offline: Optional[OfflineSynthesizer] = None
+        self._offline_lock = threading.Lock()
+        self._translator = None
+        self.translation = BatchTranslator(None, TranslationMemory())
+        # Terjemahan dipanggil dari thread executor dan job konversi sekaligus;
+        # memori terjemahan dan klien googletrans tidak thread-safe
+        self._translation_lock = threading.Lock()
+        self._translation_failed = False    # Kegagalan penerjemah sudah dilaporkan
         self.available_languages = self._get_available_languages()
         self.current_source_lang = 'en'     # Bahasa default source
         self.current_target_lang = 'id'     # Bahasa default target
@@ -41,6 +102,18 @@ class TTSModel(QObject):
         self._progress = 0
         self._voice_type = "pria"
         self._global_speed = 1.15
+        self._max_workers = 4               # Jumlah request TTS paralel
+        self.cache = TTSCache()
+        self._stream_task: Optional[asyncio.Task] = None
+        self._stream_queue: Optional[SynthesisQueue] = None
+        self._time_to_first_audio: Optional[int] = None
+        self._fit_to_cue = True             # Kompres segment yang melebihi durasi cue
+        self._fit_report = None
+        self._coalesce_cues = False         # Gabungkan cue pendek jadi satu request
+        self._packed = False                # Simpan segment di satu pack per video
+        self._pack_codec = CODEC_COPY
+        self._pack_bitrate: Optional[str] = None
+        self._post = None                   # PostProcessor (trim hening + loudness), None = mati
 
     def _get_available_languages(self):
         """Mendapatkan daftar bahasa yang tersedia"""
@@ -52,6 +125,46 @@ class TTSModel(QObject):
             'ko': {'name': 'Korean', 'models': ['ko']}
         }
     
+    @property
+    def offline(self) -> OfflineSynthesizer:
+        """Pool proses pyttsx3, dibuat saat pertama kali dipakai (dari thread mana pun)"""
+        if self._offline is None:
+            with self._offline_lock:
+                if self._offline is None:
+                    self._offline = OfflineSynthesizer()
+        return self._offline
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def set_backend(self, backend: str):
+        """Pilih backend sintesis: BACKEND_EDGE atau BACKEND_OFFLINE"""
+        if backend in (BACKEND_EDGE, BACKEND_OFFLINE):
+            self._backend = backend
+
+    def set_offline_pool_size(self, pool_size: int):
+        """Jumlah proses pyttsx3 untuk backend offline"""
+        self.offline.set_pool_size(pool_size)
+
+    @property
+    def audio_format(self) -> str:
+        return OFFLINE_AUDIO_FORMAT if self._backend == BACKEND_OFFLINE else "mp3"
+
+    def voice_for(self, voice_type: str) -> str:
+        """Nama voice backend aktif (dipakai juga sebagai bagian key cache)"""
+        if self._backend == BACKEND_OFFLINE:
+            return self.offline.voice
+        return VOICE_LIST[voice_type]
+
+    @property
+    def translator(self):
+        """googletrans.Translator, dibuat saat pertama kali dipakai"""
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator
+
     def set_language(self, source_lang, target_lang):
         """Mengatur bahasa source dan target"""
         if source_lang in self.available_languages and target_lang in self.available_languages:
@@ -60,59 +173,113 @@ class TTSModel(QObject):
             return True
         return False
     
-    def convert_srt_to_audio(self, srt_path, output_path):
-        """Mengkonversi file SRT ke audio dengan loading progress"""
+    def convert_srt_to_audio(self, srt_path, output_dir):
+        """Mengkonversi file SRT ke audio per cue secara offline dengan loading progress
+
+        Cue disintesis paralel oleh pool proses pyttsx3 ke ``segment_N.wav``;
+        hasilnya (TTSSegment) tersedia di ``current_segments``. Memblokir
+        sampai selesai; dari UI jalankan lewat job background di controller.
+        """
         try:
-            with open(srt_path, 'r', encoding='utf-8') as file:
-                subtitles = file.readlines()
-            
-            total_lines = len(subtitles)
-            current_line = 0
-            
-            # Proses tiap line subtitle
-            for line in subtitles:
-                if line.strip():  # Skip baris kosong
-                    # Translate text jika bahasa berbeda
-                    if self.current_source_lang != self.current_target_lang:
-                        translated = self.translator.translate(
-                            line.strip(),
-                            src=self.current_source_lang,
-                            dest=self.current_target_lang
-                        )
-                        text = translated.text
-                    else:
-                        text = line.strip()
-                    
-                    self.engine.save_to_file(text, output_path)
-                
-                current_line += 1
-                progress = int((current_line / total_lines) * 100)
-                self.conversion_progress.emit(progress)
-            
+            self._current_segments = self.synthesize_offline(
+                srt_path, output_dir, self.conversion_progress.emit
+            )
             self.conversion_complete.emit()
             return True
             
         except Exception as e:
             print(f"Error dalam konversi SRT ke audio: {str(e)}")
             return False
+
+    def synthesize_offline(self, srt_path: str, output_dir: str,
+                           on_progress: Optional[Callable[[int], None]] = None,
+                           should_stop: Optional[Callable[[], bool]] = None) -> List[TTSSegment]:
+        """Terjemahkan dan sintesis semua cue dengan pool offline, kembalikan segment-nya
+
+        Aman dijalankan di thread worker: tidak mengubah segment/progress model
+        dan tidak mengirim signal. State bersama yang dibuat saat pertama kali
+        dipakai (pool offline, penerjemah) dijaga lock, jadi boleh berjalan
+        bersamaan dengan streaming dan pregen. ``on_progress(persen)``
+        dipanggil di thread pemanggil; jika ``should_stop()`` True,
+        ``CancelledError`` dilempar.
+        """
+        cues = parse_subtitle_file(srt_path)
+        texts = self._translate_or_keep(cues.texts())
+        if should_stop and should_stop():
+            raise CancelledError()
+        os.makedirs(output_dir, exist_ok=True)
+        segments = [
+            TTSSegment(
+                file_path=os.path.join(output_dir, f"segment_{i+1}.{OFFLINE_AUDIO_FORMAT}"),
+                start_time=cues.starts[i],
+                end_time=cues.ends[i],
+                text=text,
+                rate=self.calculate_speech_rate(len(text), cues.duration(i)),
+                ready=False
+            )
+            for i, text in enumerate(texts)
+        ]
+        total_cues = len(segments)
+        completed = 0
+
+        def on_done(index):
+            nonlocal completed
+            completed += 1
+            segments[index].ready = True
+            if on_progress:
+                on_progress(int(completed / total_cues * 100))
+
+        self.offline.synthesize_many(
+            [(s.text, s.file_path, s.rate) for s in segments], on_done, should_stop
+        )
+        return segments
     
+    def set_translator(self, translator):
+        """Ganti backend penerjemah (objek dengan method translate(list, src, dest))"""
+        with self._translation_lock:
+            self._translator = translator
+            self.translation.translator = translator
+
+    def _translate_or_keep(self, texts: List[str]) -> List[str]:
+        """Terjemahkan; teks asli dipakai jika penerjemah gagal atau tidak bisa dihubungi
+
+        Generate TTS tidak boleh gagal hanya karena layanan terjemahan bermasalah.
+        Kegagalan dilaporkan sekali sampai terjemahan berhasil lagi.
+        """
+        try:
+            translated = self.translate_texts(texts)
+        except Exception as e:
+            if not self._translation_failed:
+                self._translation_failed = True
+                print(f"Terjemahan tidak tersedia, memakai teks asli: {str(e)}")
+            return list(texts)
+        self._translation_failed = False
+        return translated
+
+    def translate_texts(self, texts: List[str]) -> List[str]:
+        """Terjemahkan teks cue secara batch sesuai bahasa sumber/target aktif
+
+        Panggilan dari beberapa thread diserialkan (lihat ``_translation_lock``).
+        """
+        source, target = self.current_source_lang, self.current_target_lang
+        with self._translation_lock:
+            if self.translation.translator is None and source != target:
+                self.translation.translator = self.translator
+            return self.translation.translate(texts, source, target)
+
     def merge_video_and_audio(self, video_path, audio_path, output_path):
-        """Menggabungkan video dengan audio TTS"""
+        """Menggabungkan video dengan audio TTS
+
+        ``audio_path`` adalah track TTS yang sudah sejajar dengan waktu video
+        (lihat ``render_timeline``), jadi stream video cukup disalin.
+        """
         try:
             import ffmpeg
             
-            # Dapatkan durasi video
-            probe = ffmpeg.probe(video_path)
-            video_duration = float(probe['streams'][0]['duration'])
-            
-            # Sesuaikan audio dengan durasi video
-            stream = ffmpeg.input(audio_path)
-            stream = ffmpeg.filter(stream, 'atempo', video_duration/float(probe['streams'][1]['duration']))
-            
-            # Gabungkan video dengan audio yang sudah disesuaikan
-            stream = ffmpeg.input(video_path)
-            stream = ffmpeg.output(stream['v'], stream['a'], output_path)
-            ffmpeg.run(stream, overwrite_output=True)
+            video = ffmpeg.input(video_path)
+            audio = ffmpeg.input(audio_path)
+            stream = ffmpeg.output(video['v'], audio['a'], output_path, vcodec='copy')
+            ffmpeg.run(stream, overwrite_output=True, quiet=True)
             
             return True
         except Exception as e:
@@ -140,10 +307,63 @@ class TTSModel(QObject):
     def progress(self) -> int:
         return self._progress
 
+    @property
+    def current_segments(self) -> List[TTSSegment]:
+        return self._current_segments
+
     def set_voice_type(self, voice_type: str):
         if voice_type in VOICE_LIST:
             self._voice_type = voice_type
 
+    def set_fit_to_cue(self, enabled: bool):
+        """Aktifkan/nonaktifkan fitting durasi segment ke durasi cue"""
+        self._fit_to_cue = enabled
+
+    def set_coalesce_cues(self, enabled: bool):
+        """Aktifkan/nonaktifkan penggabungan cue pendek yang berdekatan (hanya Edge TTS)"""
+        self._coalesce_cues = enabled
+
+    @property
+    def coalesce_active(self) -> bool:
+        # Pemotongan audio butuh WordBoundary, yang hanya dikirim Edge TTS
+        return self._coalesce_cues and self._backend == BACKEND_EDGE
+
+    def set_packed_segments(self, enabled: bool, codec: str = CODEC_COPY,
+                            bitrate: Optional[str] = None):
+        """Simpan segment di pack per video (lihat segment_store), opsional dengan codec ringkas"""
+        self._packed = enabled
+        self._pack_codec = codec
+        self._pack_bitrate = bitrate
+
+    def set_post_process(self, enabled: bool, pool_size: Optional[int] = None):
+        """Aktifkan trim hening + normalisasi loudness setelah sintesis (lihat audio_post)"""
+        if self._post is not None:
+            self._post.shutdown()
+            self._post = None
+        if enabled:
+            from .audio_post import PostProcessor
+            self._post = PostProcessor(pool_size)
+
+    @property
+    def packed_active(self) -> bool:
+        # Backend offline menulis file langsung dari proses pool
+        return self._packed and self._backend == BACKEND_EDGE
+
+    def _segment_store(self, output_dir: str) -> Optional[SegmentStore]:
+        if not self.packed_active:
+            return None
+        return store_for(output_dir, create=True, codec=self._pack_codec,
+                         bitrate=self._pack_bitrate)
+
+    @property
+    def fit_report(self):
+        """FitReport dari generate terakhir (None jika fitting tidak aktif)"""
+        return self._fit_report
+
+    def base_speech_rate(self) -> str:
+        """Rate tetap dari kecepatan global, dipakai saat fitting aktif"""
+        return f"{int(round((self._global_speed - 1) * 100)):+d}%"
+
     def calculate_speech_rate(self, text_length: int, duration_ms: int) -> str:
         """Menghitung rate berdasarkan panjang teks dan durasi"""
         duration_ms = max(duration_ms, 1000)  # Minimal 1 detik
@@ -155,75 +375,520 @@ class TTSModel(QObject):
         rate_change = min(max(rate_change, -30), 150)
         return f"{rate_change:+d}%"
 
-    async def text_to_speech(self, text: str, output_file: str, rate: str):
+    async def text_to_speech(self, text: str, output_file: str, rate: str,
+                             voice: Optional[str] = None):
         """Mengkonversi teks ke audio"""
+        if self._backend == BACKEND_OFFLINE:
+            await self.offline.synthesize(text, output_file, rate)
+            return
+
+        import edge_tts
+
         communicate = edge_tts.Communicate(
             text, 
-            VOICE_LIST[self._voice_type], 
+            voice or VOICE_LIST[self._voice_type], 
             rate=rate
         )
         await communicate.save(output_file)
 
-    async def generate_tts(self, srt_path: str, output_dir: str) -> List[TTSSegment]:
-        """Generate TTS untuk file SRT"""
+    def set_max_workers(self, max_workers: int):
+        """Mengatur jumlah request TTS yang berjalan bersamaan"""
+        self._max_workers = max(1, int(max_workers))
+
+    @property
+    def time_to_first_audio(self) -> Optional[int]:
+        """Waktu (ms) dari mulai streaming sampai audio pertama siap diputar"""
+        return self._time_to_first_audio
+
+    async def generate_tts(self, srt_path: str, output_dir: str,
+                           max_workers: Optional[int] = None) -> List[TTSSegment]:
+        """Generate TTS untuk file SRT
+
+        Segment disintesis secara paralel oleh maksimal ``max_workers`` worker,
+        hasil tetap berurutan sesuai cue.
+        """
         self._is_generating = True
         self._progress = 0
+        self._fit_report = None
         self.notify_observers("generation_started")
 
         try:
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-
-            subs = pysrt.open(srt_path)
-            total_subs = len(subs)
-            segments = []
-
-            for i, sub in enumerate(subs):
-                output_file = os.path.join(output_dir, f"segment_{i+1}.mp3")
-                
-                # Calculate timing
-                start_time = (sub.start.hours * 3600000 + 
-                            sub.start.minutes * 60000 + 
-                            sub.start.seconds * 1000 + 
-                            sub.start.milliseconds)
-                
-                end_time = (sub.end.hours * 3600000 + 
-                          sub.end.minutes * 60000 + 
-                          sub.end.seconds * 1000 + 
-                          sub.end.milliseconds)
-                
-                duration = end_time - start_time
-
-                # Skip if already exists
-                if not os.path.exists(output_file):
-                    rate = self.calculate_speech_rate(len(sub.text), duration)
-                    await self.text_to_speech(sub.text, output_file, rate)
-                else:
-                    rate = "cached"
-
-                segment = TTSSegment(
-                    file_path=output_file,
-                    start_time=start_time,
-                    end_time=end_time,
-                    text=sub.text,
-                    rate=rate
-                )
-                segments.append(segment)
-
-                # Update progress
-                self._progress = int((i + 1) / total_subs * 100)
-                self.notify_observers("progress", self._progress)
+            segments, checkpoint = await self._prepare_segments(srt_path, output_dir)
+            await self._run_synthesis(segments, SynthesisQueue(segments), max_workers,
+                                      checkpoint=checkpoint)
+            self._finish_generation(segments, checkpoint)
+            return segments
 
-            self._current_segments = segments
+        except Exception as e:
             self._is_generating = False
-            self.notify_observers("generation_complete", segments)
-            return segments
+            self.notify_observers("generation_error", str(e))
+            raise e
+
+    async def start_tts_stream(self, srt_path: str, output_dir: str,
+                               position: int = 0, preload_ms: int = STREAM_PRELOAD_MS,
+                               max_workers: Optional[int] = None) -> List[TTSSegment]:
+        """Mulai generate TTS di background dan kembali setelah cue awal siap
 
+        Segment yang dikembalikan awalnya ``ready=False`` dan diisi oleh
+        worker sesuai urutan playhead (lihat ``set_playback_position``).
+        """
+        self.cancel_tts_stream()
+        self._is_generating = True
+        self._progress = 0
+        self._time_to_first_audio = None
+        self._fit_report = None
+        self.notify_observers("generation_started")
+        started = time.perf_counter()
+
+        try:
+            segments, checkpoint = await self._prepare_segments(srt_path, output_dir)
         except Exception as e:
             self._is_generating = False
             self.notify_observers("generation_error", str(e))
             raise e
 
+        queue = SynthesisQueue(segments, position)
+        window = [segments[i] for i in queue.window(position, preload_ms)]
+        first_audio = asyncio.Event()
+
+        def on_segment_ready(segment: TTSSegment):
+            if not first_audio.is_set() and all(s.ready for s in window):
+                first_audio.set()
+
+        async def run():
+            try:
+                await self._run_synthesis(segments, queue, max_workers, on_segment_ready,
+                                          checkpoint)
+                self._finish_generation(segments, checkpoint)
+                return True
+            except Exception as e:
+                self._is_generating = False
+                self.notify_observers("generation_error", str(e))
+                return False
+            finally:
+                first_audio.set()
+
+        task = asyncio.ensure_future(run())
+        self._stream_queue = queue
+        self._stream_task = task
+        on_segment_ready(None)
+        await first_audio.wait()
+
+        if task.cancelled():
+            raise asyncio.CancelledError()
+        if task.done() and not task.result():
+            raise RuntimeError("TTS streaming gagal")
+
+        self._time_to_first_audio = int((time.perf_counter() - started) * 1000)
+        self.notify_observers("first_audio_ready", self._time_to_first_audio)
+        return segments
+
+    async def pregenerate_tts(self, srt_path: str, output_dir: str, voice_type: str,
+                              max_workers: int = 1, before_segment=None,
+                              on_progress=None,
+                              should_stop: Optional[Callable[[], bool]] = None) -> List[TTSSegment]:
+        """Generate TTS di background untuk video yang belum diputar
+
+        Tidak mengubah state generate aktif (progress, segment, fit report) dan
+        tidak mengirim event ke observer. ``before_segment`` (coroutine function)
+        ditunggu sebelum setiap segment, dipakai scheduler untuk memberi
+        prioritas ke generate video aktif. ``on_progress(done, total)``
+        dipanggil setiap segment selesai. Jika ``should_stop()`` True, worker
+        berhenti setelah segment yang sedang dikerjakan (tidak ada tulisan
+        yang tertinggal di thread executor) lalu ``CancelledError`` dilempar.
+        """
+        from .audio_fit import FitReport
+
+        voice = self.voice_for(voice_type)
+        segments, checkpoint = await self._prepare_segments(srt_path, output_dir, voice)
+        report = FitReport()
+        queue = SynthesisQueue(segments)
+        total = len(segments)
+        completed = sum(segment.ready for segment in segments)
+        groups = self._coalesce_groups(segments)
+        claimed = set()
+
+        async def worker():
+            nonlocal completed
+            while True:
+                if before_segment is not None:
+                    await before_segment()
+                if should_stop is not None and should_stop():
+                    return
+                index = queue.pop()
+                if index is None:
+                    return
+                done = await self._synthesize_next(segments, index, groups, claimed,
+                                                   voice, report)
+                for segment in done:
+                    checkpoint.mark_done(segment.file_path, segment.text, segment.rate)
+                    completed += 1
+                    if on_progress:
+                        on_progress(completed, total)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(min(max(1, max_workers), total))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            checkpoint.save()
+        if should_stop is not None and should_stop():
+            raise asyncio.CancelledError()
+        checkpoint.complete = True
+        self._compact_store(segments)
+        return segments
+
+    def set_playback_position(self, position: int):
+        """Pindahkan prioritas sintesis ke posisi playhead (ms), misalnya setelah seek"""
+        if self._stream_queue is not None:
+            self._stream_queue.set_position(position)
+
+    async def wait_tts_stream(self) -> bool:
+        """Tunggu streaming TTS selesai, True jika semua segment berhasil"""
+        if self._stream_task is None:
+            return False
+        try:
+            return await asyncio.shield(self._stream_task)
+        except asyncio.CancelledError:
+            return False
+
+    def cancel_tts_stream(self):
+        """Batalkan streaming TTS yang sedang berjalan"""
+        if self._stream_task is not None and not self._stream_task.done():
+            self._stream_task.cancel()
+            self._is_generating = False
+            self.notify_observers("generation_cancelled")
+        self._stream_task = None
+        self._stream_queue = None
+
+    async def _prepare_segments(self, srt_path: str, output_dir: str,
+                                voice: Optional[str] = None) -> Tuple[List[TTSSegment], TTSCheckpoint]:
+        """Membaca SRT dan membuat TTSSegment beserta checkpoint direktori output
+
+        Segment yang menurut checkpoint sudah selesai (file ada dengan ukuran
+        yang sama, teks dan rate tidak berubah) langsung ditandai ``ready``.
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        cues = parse_subtitle_file(srt_path)
+
+        # Terjemahkan teks cue (batch + memori terjemahan) di thread terpisah
+        loop = asyncio.get_event_loop()
+        texts = await loop.run_in_executor(None, self._translate_or_keep, cues.texts())
+
+        segments = []
+        for i, text in enumerate(texts):
+            start_time = cues.starts[i]
+            end_time = cues.ends[i]
+            duration = end_time - start_time
+
+            segments.append(TTSSegment(
+                file_path=os.path.join(output_dir, f"segment_{i+1}.{self.audio_format}"),
+                start_time=start_time,
+                end_time=end_time,
+                text=text,
+                rate=(self.base_speech_rate() if self._fit_to_cue
+                      else self.calculate_speech_rate(len(text), duration)),
+                ready=False
+            ))
+
+        if self.coalesce_active and not self._fit_to_cue:
+            # Satu request = satu rate, dihitung dari teks dan rentang seluruh grup
+            for group in plan_groups(segments):
+                members = [segments[i] for i in group]
+                rate = self.calculate_speech_rate(
+                    sum(len(s.text) for s in members),
+                    members[-1].end_time - members[0].start_time
+                )
+                for segment in members:
+                    segment.rate = rate
+
+        settings = {
+            "srt": os.path.abspath(srt_path),
+            "srt_mtime": os.path.getmtime(srt_path),
+            "voice": voice or self.voice_for(self._voice_type),
+            "fit": self._fit_to_cue
+        }
+        if self.coalesce_active:
+            settings["coalesce"] = True
+        if self.packed_active:
+            settings["packed"] = [self._pack_codec, self._pack_bitrate]
+        if self._post is not None:
+            from .audio_post import POST_PROCESS_TAG
+            settings["post"] = POST_PROCESS_TAG
+        checkpoint = await loop.run_in_executor(
+            None, self._verify_checkpoint, output_dir, settings, segments,
+            self._segment_store(output_dir)
+        )
+        return segments, checkpoint
+
+    @staticmethod
+    def _verify_checkpoint(output_dir: str, settings: Dict, segments: List[TTSSegment],
+                           store: Optional[SegmentStore] = None) -> TTSCheckpoint:
+        """Muat checkpoint dan tandai segment yang benar-benar sudah selesai"""
+        if store is None:
+            # Pack lama dari mode pack tidak boleh menutupi file segment baru
+            old_store = store_for(output_dir)
+            if old_store is not None:
+                old_store.delete()
+                close_store(output_dir)
+        checkpoint = TTSCheckpoint(output_dir, settings, store=store)
+        checkpoint.remove_partial_files()
+        for segment in segments:
+            segment.ready = checkpoint.is_done(segment.file_path, segment.text, segment.rate)
+        return checkpoint
+
+    async def _run_synthesis(self, segments: List[TTSSegment], queue: "SynthesisQueue",
+                             max_workers: Optional[int] = None, on_segment_ready=None,
+                             checkpoint: Optional[TTSCheckpoint] = None):
+        """Menjalankan worker sintesis sampai antrian habis"""
+        total = len(segments)
+        completed = sum(segment.ready for segment in segments)
+        queued_at = time.perf_counter()
+        groups = self._coalesce_groups(segments)
+        claimed = set()
+
+        async def worker():
+            nonlocal completed
+            while True:
+                index = queue.pop()
+                if index is None:
+                    return
+                if metrics.enabled:
+                    metrics.QUEUE_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+                for segment in await self._synthesize_next(segments, index, groups, claimed):
+                    if checkpoint is not None:
+                        checkpoint.mark_done(segment.file_path, segment.text, segment.rate)
+
+                    # Update progress
+                    completed += 1
+                    self._progress = int(completed / total * 100)
+                    self.notify_observers("progress", self._progress)
+                    if on_segment_ready:
+                        on_segment_ready(segment)
+
+        if max_workers is None:
+            max_workers = (self.offline.pool_size if self._backend == BACKEND_OFFLINE
+                           else self._max_workers)
+        workers = max(1, min(max_workers, total))
+        tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if checkpoint is not None:
+                checkpoint.save()
+
+    def _coalesce_groups(self, segments: List[TTSSegment]) -> Dict[int, List[int]]:
+        """Index segment -> index semua anggota grupnya (hanya grup yang belum ready)"""
+        if not self.coalesce_active:
+            return {}
+        groups = {}
+        for group in plan_groups(segments):
+            if not any(segments[i].ready for i in group):
+                for i in group:
+                    groups[i] = group
+        return groups
+
+    async def _synthesize_next(self, segments: List[TTSSegment], index: int,
+                               groups: Dict[int, List[int]], claimed: set,
+                               voice: Optional[str] = None, fit_report=None) -> List[TTSSegment]:
+        """Sintesis segment ``index`` atau seluruh grupnya, kembalikan segment yang selesai
+
+        Anggota grup yang sudah diambil worker lain (``claimed``) dilewati.
+        """
+        group = groups.get(index)
+        if group is None:
+            await self._synthesize_segment(segments[index], voice, fit_report)
+            return [segments[index]]
+        if index in claimed:
+            return []
+        claimed.update(group)
+        members = [segments[i] for i in group]
+        if not await self._synthesize_group(members, voice, fit_report):
+            # Word boundary tidak bisa dipetakan: sintesis per cue seperti biasa
+            for segment in members:
+                await self._synthesize_segment(segment, voice, fit_report)
+        return members
+
+    async def _synthesize_group(self, members: List[TTSSegment], voice: Optional[str] = None,
+                                fit_report=None) -> bool:
+        """Sintesis beberapa cue sebagai satu request lalu potong audionya per cue
+
+        Potongan disimpan di cache per cue. False jika audio tidak bisa
+        dipotong (tidak ada word boundary untuk salah satu cue, atau bukan MP3).
+        """
+        from .cue_coalesce import cut_times, join_texts, split_mp3, synthesize_with_boundaries
+
+        voice = voice or self.voice_for(self._voice_type)
+        audio_format = self.audio_format
+        rate = members[0].rate
+        texts = [segment.text for segment in members]
+        group_text = join_texts(texts)
+        keys = [self.cache.key_for(f"{group_text}\x00{i}", voice, rate, audio_format)
+                for i in range(len(members))]
+        cached_files = [self.cache.lookup(key, audio_format) for key in keys]
+        if metrics.enabled:
+            for cached_file in cached_files:
+                metrics.CACHE_LOOKUPS.inc(1, "miss" if cached_file is None else "hit")
+
+        if any(cached_file is None for cached_file in cached_files):
+            started = time.perf_counter() if metrics.enabled else None
+            audio, words = await synthesize_with_boundaries(group_text, voice, rate)
+            if started is not None:
+                metrics.SYNTHESIS_SECONDS.observe(time.perf_counter() - started)
+            cuts = cut_times(texts, words)
+            pieces = split_mp3(audio, cuts) if cuts is not None else None
+            if pieces is None:
+                return False
+            loop = asyncio.get_event_loop()
+            cached_files = await loop.run_in_executor(
+                None, self._cache_pieces, keys, pieces, audio_format)
+
+        if self._post is not None:
+            cached_files = await asyncio.gather(*(
+                self._post_process(key, cached_file) for key, cached_file in zip(keys, cached_files)
+            ))
+        for segment, cached_file in zip(members, cached_files):
+            await self._write_segment(segment, cached_file, fit_report)
+        return True
+
+    def _cache_pieces(self, keys: List[str], pieces: List[bytes], audio_format: str) -> List[str]:
+        """Tulis potongan audio grup ke cache (di executor, bukan di event loop)"""
+        cached_files = []
+        for key, piece in zip(keys, pieces):
+            temp_file = self.cache.temp_path(key, audio_format)
+            with open(temp_file, "wb") as f:
+                f.write(piece)
+            cached_files.append(self.cache.commit(key, temp_file, audio_format))
+        return cached_files
+
+    async def _synthesize_segment(self, segment: TTSSegment, voice: Optional[str] = None,
+                                  fit_report=None):
+        """Sintesis satu segment, memakai cache jika teks, suara dan rate sama"""
+        voice = voice or self.voice_for(self._voice_type)
+        audio_format = self.audio_format
+        key = self.cache.key_for(segment.text, voice, segment.rate, audio_format)
+        cached_file = self.cache.lookup(key, audio_format)
+        metrics.CACHE_LOOKUPS.inc(1, "miss" if cached_file is None else "hit")
+        if cached_file is None:
+            temp_file = self.cache.temp_path(key, audio_format)
+            started = time.perf_counter()
+            try:
+                await self.text_to_speech(segment.text, temp_file, segment.rate, voice)
+            except BaseException:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+            metrics.SYNTHESIS_SECONDS.observe(time.perf_counter() - started)
+            cached_file = self.cache.commit(key, temp_file, audio_format)
+        if self._post is not None:
+            cached_file = await self._post_process(key, cached_file)
+        await self._write_segment(segment, cached_file, fit_report)
+
+    async def _post_process(self, key: str, cached_file: str) -> str:
+        """Versi audio cache yang sudah di-trim dan dinormalisasi, diproses sekali saja"""
+        from .audio_post import POST_PROCESS_TAG
+
+        audio_format = self.audio_format
+        post_key = self.cache.derived_key(key, POST_PROCESS_TAG)
+        processed = self.cache.path_for(post_key, audio_format)
+        if os.path.exists(processed) and os.path.getsize(processed) > 0:
+            return processed
+        temp_file = self.cache.temp_path(post_key, audio_format)
+        started = time.perf_counter()
+        try:
+            await self._post.process(cached_file, temp_file, audio_format)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        metrics.POST_PROCESS_SECONDS.observe(time.perf_counter() - started)
+        return self.cache.commit(post_key, temp_file, audio_format)
+
+    async def _write_segment(self, segment: TTSSegment, cached_file: str, fit_report=None):
+        """Salin audio dari cache ke output (file segment atau pack) lalu fitting"""
+        store = self._segment_store(os.path.dirname(segment.file_path))
+        if store is None:
+            self.cache.materialize(cached_file, segment.file_path)
+            if self._fit_to_cue:
+                await self._fit_segment(segment, fit_report)
+            if metrics.enabled:
+                metrics.BYTES_WRITTEN.inc(os.path.getsize(segment.file_path))
+        else:
+            with open(cached_file, "rb") as f:
+                data = f.read()
+            if self._fit_to_cue:
+                data = await self._fit_segment(segment, fit_report, data)
+            name = os.path.basename(segment.file_path)
+            if store.codec == CODEC_COPY:
+                size = store.put(name, data)
+            else:
+                loop = asyncio.get_event_loop()
+                size = await loop.run_in_executor(None, store.put, name, data)
+            metrics.BYTES_WRITTEN.inc(size)
+        segment.ready = True
+
+    async def _fit_segment(self, segment: TTSSegment, report=None,
+                           data: Optional[bytes] = None) -> Optional[bytes]:
+        """Ukur durasi asli segment dan kompres jika melebihi durasi cue
+
+        Dengan ``data`` (segment untuk pack) fitting dilakukan di memori dan
+        hasilnya dikembalikan.
+        """
+        from .audio_fit import fit_segment, fit_segment_data, FitReport
+
+        if report is None:
+            if self._fit_report is None:
+                self._fit_report = FitReport()
+            report = self._fit_report
+        window = segment.end_time - segment.start_time
+        loop = asyncio.get_event_loop()
+        if data is None:
+            before, after = await loop.run_in_executor(None, fit_segment, segment.file_path, window)
+        else:
+            data, before, after = await loop.run_in_executor(
+                None, fit_segment_data, data, window, self.audio_format
+            )
+        report.add(window, before, after)
+        return data
+
+    def _compact_store(self, segments: List[TTSSegment]):
+        """Buang data segment lama dari pack setelah generate selesai"""
+        store = self._segment_store(os.path.dirname(segments[0].file_path)) if segments else None
+        if store is not None:
+            store.compact_if_needed()
+
+    def _finish_generation(self, segments: List[TTSSegment],
+                           checkpoint: Optional[TTSCheckpoint] = None):
+        if checkpoint is not None:
+            checkpoint.complete = True
+        self._compact_store(segments)
+        self._current_segments = segments
+        self._is_generating = False
+        self.notify_observers("cache_stats", self.cache.stats())
+        if self._fit_report is not None:
+            self.notify_observers("fit_report", self._fit_report.summary())
+        self.notify_observers("generation_complete", segments)
+
+    async def render_timeline(self, segments: List[TTSSegment], output_dir: str) -> str:
+        """Render semua segment menjadi satu track audio (timeline.mp3)"""
+        from .audio_render import render_timeline
+
+        output_file = os.path.join(output_dir, TIMELINE_TRACK_NAME)
+        self.notify_observers("render_started")
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, render_timeline, list(segments), output_file)
+        except Exception as e:
+            self.notify_observers("render_error", str(e))
+            raise e
+        self.notify_observers("render_complete", output_file)
+        return output_file
+
     def clear_segments(self):
         """Clear current segments"""
         self._current_segments.clear()
@@ -1,6 +1,16 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 import os
+from .segment_store import close_store
+
+TTS_OUTPUT_ROOT = "tts_output"
+
+# Status kesiapan TTS per video (ditampilkan di playlist, tidak disimpan)
+TTS_NONE = "none"
+TTS_QUEUED = "queued"
+TTS_GENERATING = "generating"
+TTS_READY = "ready"
+TTS_FAILED = "failed"
 
 @dataclass
 class VideoData:
@@ -9,19 +19,50 @@ class VideoData:
     tts_dir: Optional[str] = None
     voice_type: str = "pria"
     is_tts_ready: bool = False
+    playback_position: int = 0  # milliseconds
+    # Manifest segment TTS, dibaca dari library saat dibutuhkan
+    segments: Optional[list] = field(default=None, repr=False, compare=False)
+    segments_version: int = field(default=0, repr=False, compare=False)  # naik setiap manifest diganti
+    tts_status: str = field(default=TTS_NONE, compare=False)
+    tts_progress: int = field(default=0, compare=False)  # persen, saat generating
+
+    def __post_init__(self):
+        if self.is_tts_ready:
+            self.tts_status = TTS_READY
 
 class VideoModel:
     def __init__(self):
         self._videos: list[VideoData] = []
         self._current_index: int = -1
         self._observers = []
+        self._segment_loader: Optional[Callable[[int], Optional[list]]] = None
 
     def add_observer(self, observer):
         self._observers.append(observer)
 
-    def notify_observers(self):
+    def notify_observers(self, event_type="update", data=None):
+        """Kirim event perubahan playlist
+
+        Event: "inserted" (index), "removed" (index), "updated" (index),
+        "playback_position" (index), "tts_status" (index),
+        "current_changed" ((index lama, index baru)) dan "reset".
+        Sebelum list berubah dikirim "about_to_insert" (index),
+        "about_to_remove" (index) dan "about_to_reset" (untuk item model Qt).
+        """
         for observer in self._observers:
-            observer.on_model_updated()
+            observer.on_model_updated(event_type, data)
+
+    def __len__(self) -> int:
+        return len(self._videos)
+
+    @property
+    def videos(self) -> list[VideoData]:
+        return self._videos
+
+    def video_at(self, index: int) -> Optional[VideoData]:
+        if 0 <= index < len(self._videos):
+            return self._videos[index]
+        return None
 
     @property
     def current_video(self) -> Optional[VideoData]:
@@ -39,40 +80,103 @@ class VideoModel:
             srt_path=srt_path,
             voice_type=voice_type
         )
+        self.notify_observers("about_to_insert", len(self._videos))
         self._videos.append(video)
-        self.notify_observers()
+        self.notify_observers("inserted", len(self._videos) - 1)
         return video
 
     def remove_video(self, index: int):
         if 0 <= index < len(self._videos):
+            self.notify_observers("about_to_remove", index)
             video = self._videos.pop(index)
+            self.notify_observers("removed", index)
             if video.tts_dir and os.path.exists(video.tts_dir):
-                # Cleanup TTS files
+                # Cleanup TTS files (pack segment ditutup dulu, mmap-nya masih terbuka)
+                close_store(video.tts_dir)
                 for file in os.listdir(video.tts_dir):
                     os.remove(os.path.join(video.tts_dir, file))
                 os.rmdir(video.tts_dir)
-            self.notify_observers()
+
+            # Geser index video aktif supaya tetap menunjuk video yang sama
+            previous = self._current_index
+            if index < self._current_index:
+                self._current_index -= 1
+            elif index == self._current_index:
+                self._current_index = -1
+            if self._current_index != previous:
+                self.notify_observers("current_changed", (previous, self._current_index))
 
     def set_current(self, index: int):
-        if 0 <= index < len(self._videos):
-            self._current_index = index
-            self.notify_observers()
+        if 0 <= index < len(self._videos) and index != self._current_index:
+            self._change_current(index)
 
     def next_video(self):
         if self._current_index < len(self._videos) - 1:
-            self._current_index += 1
-            self.notify_observers()
+            self._change_current(self._current_index + 1)
 
     def previous_video(self):
         if self._current_index > 0:
-            self._current_index -= 1
-            self.notify_observers()
+            self._change_current(self._current_index - 1)
+
+    def _change_current(self, index: int):
+        previous = self._current_index
+        self._current_index = index
+        self.notify_observers("current_changed", (previous, index))
+
+    @staticmethod
+    def default_tts_dir(index: int) -> str:
+        return f"{TTS_OUTPUT_ROOT}/video_{index}"
 
-    def set_tts_ready(self, index: int, tts_dir: str):
+    def index_of(self, video: VideoData) -> int:
+        """Posisi video (dibandingkan per objek), -1 jika sudah dihapus"""
+        for index, item in enumerate(self._videos):
+            if item is video:
+                return index
+        return -1
+
+    def set_tts_ready(self, index: int, tts_dir: str, segments: Optional[list] = None):
         if 0 <= index < len(self._videos):
             self._videos[index].tts_dir = tts_dir
             self._videos[index].is_tts_ready = True
-            self.notify_observers()
+            self._videos[index].tts_status = TTS_READY
+            if segments is not None:
+                self._videos[index].segments = segments
+                self._videos[index].segments_version += 1
+            self.notify_observers("updated", index)
+
+    def clear_tts_ready(self, index: int):
+        """TTS video harus di-generate ulang (mis. manifest segment hilang)"""
+        if 0 <= index < len(self._videos):
+            self._videos[index].is_tts_ready = False
+            self._videos[index].tts_status = TTS_NONE
+            self._videos[index].segments = None
+            self.notify_observers("updated", index)
+
+    def set_tts_status(self, index: int, status: str, progress: int = 0):
+        """Update status kesiapan TTS (queued/generating/failed) untuk tampilan"""
+        video = self.video_at(index)
+        if video is not None and (video.tts_status, video.tts_progress) != (status, progress):
+            video.tts_status = status
+            video.tts_progress = progress
+            self.notify_observers("tts_status", index)
+
+    def set_playback_position(self, index: int, position: int):
+        if 0 <= index < len(self._videos):
+            self._videos[index].playback_position = position
+            self.notify_observers("playback_position", index)
+
+    def set_segment_loader(self, loader: Callable[[int], Optional[list]]):
+        """Fungsi untuk membaca manifest segment TTS secara lazy"""
+        self._segment_loader = loader
+
+    def get_segments(self, index: int) -> Optional[list]:
+        """Segment TTS video, dibaca dari loader jika belum ada di memori"""
+        video = self.video_at(index)
+        if video is None:
+            return None
+        if video.segments is None and video.is_tts_ready and self._segment_loader:
+            video.segments = self._segment_loader(index)
+        return video.segments
 
     def to_dict(self):
         return {
@@ -82,7 +186,8 @@ class VideoModel:
                     'srt_path': v.srt_path,
                     'tts_dir': v.tts_dir,
                     'voice_type': v.voice_type,
-                    'is_tts_ready': v.is_tts_ready
+                    'is_tts_ready': v.is_tts_ready,
+                    'playback_position': v.playback_position
                 }
                 for v in self._videos
             ],
@@ -90,9 +195,10 @@ class VideoModel:
         }
 
     def load_from_dict(self, data: dict):
+        self.notify_observers("about_to_reset")
         self._videos = [
             VideoData(**video_data)
             for video_data in data.get('videos', [])
         ]
         self._current_index = data.get('current_index', -1)
-        self.notify_observers()
+        self.notify_observers("reset")
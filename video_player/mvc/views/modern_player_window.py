@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QListWidget, QLabel, QFileDialog,
+    QPushButton, QListView, QLabel, QFileDialog,
     QSlider, QComboBox, QProgressBar, QFrame,
     QStackedWidget, QStyle
 )
@@ -54,7 +54,7 @@ class ModernPlayerWindow(QMainWindow):
                 margin: -4px 0;
                 border-radius: 6px;
             }
-            QListWidget {
+            QListView {
                 background-color: #2d2d2d;
                 border: 1px solid #3d3d3d;
                 border-radius: 4px;
@@ -184,8 +184,11 @@ class ModernPlayerWindow(QMainWindow):
 
         right_layout.addLayout(language_layout)
 
-        # Playlist
-        self.playlist = QListWidget()
+        # Playlist (model diset oleh PlayerView), baris di-layout bertahap
+        self.playlist = QListView()
+        self.playlist.setUniformItemSizes(True)
+        self.playlist.setLayoutMode(QListView.LayoutMode.Batched)
+        self.playlist.setBatchSize(100)
         right_layout.addWidget(self.playlist)
 
         # Add panels to main layout
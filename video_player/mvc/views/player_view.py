@@ -1,24 +1,46 @@
-import os
+import time
 import asyncio
 from typing import Optional, Callable, Any
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import QTimer
 from .modern_player_window import ModernPlayerWindow
+from .playlist_model import PlaylistItemModel
+
+TICK_INTERVAL_MS = 50     # Interval update model (sync TTS) selama video diputar
+DEFAULT_REFRESH_HZ = 60   # Dipakai jika refresh rate layar tidak diketahui
 
 class PlayerView:
     def __init__(self, controller: Any):
         self.controller = controller
         self.window = ModernPlayerWindow()
+        self._syncing_selection = False
+        self.playlist_model = PlaylistItemModel(self.controller.video_model)
+        self.window.playlist.setModel(self.playlist_model)
         self.setup_connections()
         
         # Setup event loop
         self.loop = asyncio.get_event_loop()
         
-        # Setup update timer
+        # Timer tick model, hanya berjalan selama video diputar
         self.update_timer = QTimer()
-        self.update_timer.setInterval(50)  # 50ms for smooth updates
-        self.update_timer.timeout.connect(self.update_ui)
-        self.update_timer.start()
+        self.update_timer.setInterval(TICK_INTERVAL_MS)
+        self.update_timer.timeout.connect(self._tick)
+
+        # Render UI digabung (coalesce) per frame layar
+        self._render_timer = QTimer()
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(self._frame_interval())
+        self._render_timer.timeout.connect(self._render)
+
+        # Nilai widget terakhir, widget hanya di-update jika nilainya berubah
+        self._rendered = {}
+        self.refresh_stats = {
+            "ticks": 0,
+            "tick_time_s": 0.0,
+            "renders": 0,
+            "render_time_s": 0.0,
+            "widget_updates": 0
+        }
 
         # TTS observer registration
         if hasattr(self.controller, 'tts_model'):
@@ -99,8 +121,8 @@ class PlayerView:
         # Playlist controls
         self.window.add_button.clicked.connect(self.add_video)
         self.window.remove_button.clicked.connect(self.remove_video)
-        self.window.playlist.currentRowChanged.connect(
-            lambda idx: self.loop.create_task(self.playlist_item_changed(idx))
+        self.window.playlist.selectionModel().currentRowChanged.connect(
+            self._on_playlist_row_changed
         )
         
         # Media controls
@@ -162,36 +184,87 @@ class PlayerView:
 
     def remove_video(self):
         """Remove video from playlist"""
-        current = self.window.playlist.currentRow()
+        current = self.window.playlist.currentIndex().row()
         if current >= 0:
             self.controller.remove_video(current)
-            self.window.playlist.takeItem(current)
+
+    def _on_playlist_row_changed(self, current, previous):
+        """Seleksi playlist diubah user (bukan sinkronisasi dari model)"""
+        if not self._syncing_selection:
+            self.loop.create_task(self.playlist_item_changed(current.row()))
 
     async def playlist_item_changed(self, index: int):
         """Handle playlist item selection"""
         if index >= 0:
+            self.controller.video_model.set_current(index)
             await self.controller.play_video(self.window.get_video_frame().winId())
 
     def update_ui(self):
         """Update status UI berdasarkan state player"""
+        self._rendered.clear()
+        self._render()
+
+    def _frame_interval(self) -> int:
+        """Interval render (ms) sesuai refresh rate layar"""
+        screen = self.window.screen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / (refresh_rate or DEFAULT_REFRESH_HZ)))
+
+    def _tick(self):
+        """Tick model selama playback: sync TTS dan update waktu"""
+        started = time.perf_counter()
+        self.controller.player_model.update()
+        self.refresh_stats["ticks"] += 1
+        self.refresh_stats["tick_time_s"] += time.perf_counter() - started
+
+    def _schedule_render(self):
+        """Gabungkan beberapa perubahan state menjadi satu render per frame"""
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def _set_if_changed(self, key, value, setter) -> bool:
+        if self._rendered.get(key) == value:
+            return False
+        self._rendered[key] = value
+        setter(value)
+        self.refresh_stats["widget_updates"] += 1
+        return True
+
+    def _render(self):
+        """Render widget yang nilainya berubah sejak render terakhir"""
         if not self.controller:
             return
-            
+
         state = self.controller.player_model.state
-        if state:
-            # Update time display
-            self.update_time_label(state.current_time, state.duration)
-            
-            # Update progress bar
-            if state.duration > 0:
-                progress = int((state.current_time / state.duration) * 1000)
-                self.window.progress_bar.setValue(progress)
-            
-            # Update play button
-            self.set_playing(state.is_playing)
-            
-            # Update TTS button
-            self.set_tts_enabled(state.is_using_tts)
+        if not state:
+            return
+        started = time.perf_counter()
+
+        # Update time display (resolusi detik)
+        self._set_if_changed(
+            "time", (state.current_time // 1000, state.duration // 1000),
+            lambda _: self.update_time_label(state.current_time, state.duration)
+        )
+
+        # Update progress bar
+        if state.duration > 0:
+            progress = int((state.current_time / state.duration) * 1000)
+            self._set_if_changed("progress", progress, self.window.progress_bar.setValue)
+
+        # Update play button
+        self._set_if_changed("playing", state.is_playing, self.set_playing)
+
+        # Update TTS button
+        self._set_if_changed("tts", state.is_using_tts, self.set_tts_enabled)
+
+        self.refresh_stats["renders"] += 1
+        self.refresh_stats["render_time_s"] += time.perf_counter() - started
+
+    def tick_cost_us(self) -> float:
+        """Rata-rata biaya per tick model + render (mikrodetik)"""
+        stats = self.refresh_stats
+        total = stats["tick_time_s"] + stats["render_time_s"]
+        return total / stats["ticks"] * 1e6 if stats["ticks"] else 0.0
 
     def on_tts_update(self, event_type: str, data=None):
         """Handle TTS events"""
@@ -200,7 +273,7 @@ class PlayerView:
             self.window.tts_progress.setValue(0)
         elif event_type == "progress":
             self.window.tts_progress.setValue(data)
-        elif event_type == "generation_complete":
+        elif event_type in ("generation_complete", "generation_cancelled"):
             self.window.tts_progress.setVisible(False)
         elif event_type == "generation_error":
             QMessageBox.critical(self.window, "Error", f"TTS Generation failed: {data}")
@@ -209,13 +282,40 @@ class PlayerView:
         """Handle player events"""
         if event_type == "error":
             QMessageBox.critical(self.window, "Error", str(data))
+            return
+
+        # Timer tick hanya aktif selama playback, tidak ada kerja saat idle
+        if event_type == "playback_started":
+            self.update_timer.start()
+        elif event_type in ("playback_paused", "playback_stopped"):
+            self.update_timer.stop()
+
+        if event_type in ("playback_started", "playback_paused", "playback_stopped",
+                          "time_updated", "position_changed", "video_loaded",
+                          "tts_toggled"):
+            self._schedule_render()
 
-    def on_model_updated(self):
+    def on_model_updated(self, event_type: str = "update", data=None):
         """Handle model updates"""
-        # Refresh playlist display
-        self.window.playlist.clear()
-        for video in self.controller.video_model._videos:
-            self.window.playlist.addItem(os.path.basename(video.video_path))
+        # Baris playlist diupdate oleh PlaylistItemModel, di sini hanya seleksi
+        if event_type in ("current_changed", "reset"):
+            self._select_row(self.controller.video_model.current_index)
+
+    def _select_row(self, row: int):
+        """Pilih baris playlist tanpa memicu playlist_item_changed"""
+        selection = self.window.playlist.selectionModel()
+        self._syncing_selection = True
+        try:
+            if row >= 0:
+                index = self.playlist_model.index(row)
+                selection.setCurrentIndex(
+                    index, selection.SelectionFlag.ClearAndSelect
+                )
+                self.window.playlist.scrollTo(index)
+            else:
+                selection.clearSelection()
+        finally:
+            self._syncing_selection = False
 
     def show(self):
         """Show the main window"""
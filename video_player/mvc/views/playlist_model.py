@@ -0,0 +1,79 @@
+import os
+from typing import Any
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from ..models.video_model import TTS_QUEUED, TTS_GENERATING, TTS_READY, TTS_FAILED
+
+# Penanda status TTS di belakang nama video
+STATUS_LABELS = {
+    TTS_QUEUED: "antri",
+    TTS_GENERATING: "TTS {progress}%",
+    TTS_READY: "TTS siap",
+    TTS_FAILED: "TTS gagal",
+}
+STATUS_COLORS = {
+    TTS_READY: QColor("#4caf50"),
+    TTS_FAILED: QColor("#f44336"),
+}
+
+class PlaylistItemModel(QAbstractListModel):
+    """Qt item model di atas VideoModel
+
+    Event perubahan dari VideoModel diterjemahkan menjadi sinyal baris
+    (insert/remove/dataChanged), jadi view hanya me-repaint baris yang berubah.
+    """
+
+    def __init__(self, video_model, parent=None):
+        super().__init__(parent)
+        self._video_model = video_model
+        self._bold = QFont()
+        self._bold.setBold(True)
+        video_model.add_observer(self)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._video_model)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        video = self._video_model.video_at(index.row()) if index.isValid() else None
+        if video is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            label = STATUS_LABELS.get(video.tts_status)
+            name = os.path.basename(video.video_path)
+            return f"{name}  [{label.format(progress=video.tts_progress)}]" if label else name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{video.video_path}\nTTS: {video.tts_status}"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return STATUS_COLORS.get(video.tts_status)
+        if role == Qt.ItemDataRole.FontRole and index.row() == self._video_model.current_index:
+            return self._bold
+        return None
+
+    def on_model_updated(self, event_type: str = "update", data=None):
+        """Observer VideoModel"""
+        # begin* dipanggil sebelum VideoModel mengubah list, end* sesudahnya
+        if event_type == "about_to_insert":
+            self.beginInsertRows(QModelIndex(), data, data)
+        elif event_type == "inserted":
+            self.endInsertRows()
+        elif event_type == "about_to_remove":
+            self.beginRemoveRows(QModelIndex(), data, data)
+        elif event_type == "removed":
+            self.endRemoveRows()
+        elif event_type in ("updated", "tts_status"):
+            self._row_changed(data)
+        elif event_type == "current_changed":
+            previous, current = data
+            self._row_changed(previous)
+            self._row_changed(current)
+        elif event_type == "about_to_reset":
+            self.beginResetModel()
+        elif event_type == "reset":
+            self.endResetModel()
+
+    def _row_changed(self, row: int):
+        if 0 <= row < self.rowCount():
+            index = self.index(row)
+            self.dataChanged.emit(index, index)